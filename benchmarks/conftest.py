@@ -0,0 +1,67 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_demand_mapper.toolkit import USE_CASE_KEYWORDS, MODEL_REGISTRY, load_pipeline, preprocess_job_batch
+from data_demand_mapper.training import FEATURE_COLUMNS, LABEL_COLUMN, build_pipeline
+from tests.mockapi import MockSearchServer, synthetic_search_items
+
+
+def pytest_addoption(parser):
+    parser.addoption('--postings', type=int, default=2000, help='synthetic postings per benchmark (default: 2000)')
+    parser.addoption('--ranking-rows', type=int, default=200_000, help='rows of the synthetic scored frame')
+
+
+@pytest.fixture(scope='session')
+def items(request):
+    return synthetic_search_items(request.config.getoption('--postings'), seed=0)
+
+
+@pytest.fixture(scope='session')
+def descriptors(items):
+    return [item['MatchedObjectDescriptor'] for item in items]
+
+
+@pytest.fixture(scope='session')
+def processed(descriptors):
+    return preprocess_job_batch(descriptors)
+
+
+@pytest.fixture(scope='session')
+def model_path(processed, tmp_path_factory):
+    """A pipeline fitted on the synthetic postings; the packaged model is not in the repository."""
+    path = str(tmp_path_factory.mktemp('model') / 'model.joblib')
+    joblib.dump(build_pipeline(smote=False).fit(processed[FEATURE_COLUMNS], processed[LABEL_COLUMN]), path)
+    return path
+
+
+@pytest.fixture(scope='session')
+def pipeline(model_path):
+    """The fitted pipeline, shared through ``load_pipeline`` like the packaged model."""
+    previous = MODEL_REGISTRY.model_path, MODEL_REGISTRY.mmap_mode
+    yield load_pipeline(model_path)
+    MODEL_REGISTRY.configure(*previous)
+
+
+@pytest.fixture(scope='session')
+def scored_frame(request):
+    """Scored-postings frame with random scores, industries and sparse use case flags."""
+    rows = request.config.getoption('--ranking-rows')
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({
+        'JobTitle': rng.choice(['Data Scientist', 'Program Analyst', 'Contract Specialist', 'Economist'], rows),
+        'Agency': rng.choice(['Department of Defense', 'Department of Veterans Affairs', 'NASA'], rows),
+        'Industry': rng.choice(['Finance', 'Marketing', 'Medical', 'Policy', 'Security/Tech', 'Other'], rows),
+        # Rounded so that ties are common, as with repeated postings
+        'data_buyer_score': rng.random(rows).round(3),
+    })
+    for use_case in USE_CASE_KEYWORDS:
+        frame[f'UseCase_{use_case}'] = (rng.random(rows) < 0.1).astype(int)
+    return frame
+
+
+@pytest.fixture(scope='session')
+def search_server(items):
+    with MockSearchServer(items) as server:
+        yield server
@@ -0,0 +1,70 @@
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from data_demand_mapper.compiled import CompiledScorer  # noqa: E402
+from data_demand_mapper.toolkit import (ModelRegistry, clear_title_cache, detect_use_case,  # noqa: E402
+                                        fuzzy_signal_match, harvest_and_score, preprocess_job_api_response,
+                                        preprocess_job_batch, score_frame, top_n_rows)
+from data_demand_mapper.usajobs import USAJobsClient, USAJobsHarvester  # noqa: E402
+from tests.mockapi import MockSearchServer  # noqa: E402
+
+
+def test_preprocess_batch(benchmark, descriptors):
+    result = benchmark.pedantic(preprocess_job_batch, args=(descriptors,), setup=clear_title_cache, rounds=3)
+    assert len(result) == len(descriptors)
+
+
+def test_preprocess_single(benchmark, descriptors):
+    assert len(benchmark(preprocess_job_api_response, descriptors[0])) == 1
+
+
+def test_fuzzy_signal_match(benchmark, processed):
+    texts = processed['CombinedText']
+    assert len(benchmark(fuzzy_signal_match, texts)) == len(texts)
+
+
+def test_model_load(benchmark, model_path):
+    assert benchmark.pedantic(lambda: ModelRegistry(model_path).get(), rounds=3) is not None
+
+
+def test_model_load_compiled(benchmark, pipeline, tmp_path):
+    path = str(tmp_path / 'compiled.npz')
+    CompiledScorer.from_pipeline(pipeline).save(path)
+    assert benchmark(CompiledScorer.load, path) is not None
+
+
+def test_score_pipeline(benchmark, pipeline, processed):
+    assert len(benchmark(score_frame, processed, pipeline)) == len(processed)
+
+
+def test_score_compiled(benchmark, pipeline, processed):
+    scorer = CompiledScorer.from_pipeline(pipeline)
+    assert len(benchmark(scorer.score, processed)) == len(processed)
+
+
+def test_ranking_sort_head(benchmark, scored_frame):
+    assert len(benchmark(lambda: scored_frame.sort_values('data_buyer_score', ascending=False).head(100))) == 100
+
+
+def test_ranking_top_n_rows(benchmark, scored_frame):
+    assert len(benchmark(top_n_rows, scored_frame, 100)) == 100
+
+
+def test_ranking_detect_use_case(benchmark, scored_frame):
+    assert len(benchmark(detect_use_case, scored_frame)) == len(scored_frame)
+
+
+def _harvest(url):
+    client = USAJobsClient('benchmark', 'benchmark@example.com', base_url=url, backoff_factor=0.01)
+    with client:
+        return harvest_and_score(None, None, harvester=USAJobsHarvester(client=client, requests_per_second=None))
+
+
+def test_harvest_end_to_end(benchmark, pipeline, search_server):
+    assert len(benchmark.pedantic(_harvest, args=(search_server.url,), rounds=3))
+
+
+def test_harvest_with_latency_and_errors(benchmark, pipeline, items):
+    with MockSearchServer(items, latency=0.02, error_rate=0.02) as server:
+        assert len(benchmark.pedantic(_harvest, args=(server.url,), rounds=1))
@@ -0,0 +1,71 @@
+# --- Suppress non-critical warnings globally for this package ---
+# (scikit-learn's InconsistentVersionWarning is a UserWarning, so it is covered
+# without importing scikit-learn here)
+import importlib
+import warnings
+
+warnings.filterwarnings("ignore", category=UserWarning)
+warnings.filterwarnings("ignore", category=FutureWarning)
+
+# --- Re-export main functions ---
+# Exports are resolved on first access, so ``import data_demand_mapper`` does not
+# import pandas, scikit-learn, rapidfuzz or the model until a function needs them.
+_EXPORTS = {
+    'toolkit': [
+        'load_pipeline',
+        'warmup',
+        'reload_pipeline',
+        'preprocess_job_api_response',
+        'preprocess_job_batch',
+        'register_use_case',
+        'fuzzy_signal_match',
+        'title_cache_info',
+        'set_title_cache_size',
+        'clear_title_cache',
+        'score_frame',
+        'top_n_rows',
+        'detect_use_case',
+        'harvest_and_score',
+        'fetch_and_score_job',
+        'search_job_ids_by_title',
+        'batch_fetch_and_score_jobs',
+        'fetch_and_score_top_by_use_case_auto',
+        'fetch_and_score_top_by_industry_auto',
+        'fetch_top_data_buyers_by_industry_auto',
+        'fetch_and_score_top_by_use_case_custom',
+        'fetch_top_data_buyers_by_industry_custom',
+    ],
+    'dedupe': ['duplicate_groups'],
+    'postings': ['ScoredCorpus', 'CompactPostings', 'compact_frame'],
+    'transform_cache': ['enable_transform_cache', 'disable_transform_cache', 'TransformCache'],
+    'usajobs': ['USAJobsClient', 'USAJobsHarvester', 'TokenBucket', 'ResponseCache', 'OfflineCacheMiss',
+                'HarvestIncomplete'],
+    'incremental': ['PostingStore'],
+    'bulk': ['score_dataframe', 'score_csv'],
+    'features': ['write_features', 'read_features', 'score_features', 'FeatureSchemaMismatch'],
+    'compiled': ['CompiledScorer', 'export_compiled_model'],
+    'streaming': ['iter_postings', 'iter_features', 'score_stream', 'stream_top_buyers', 'RunningTopN'],
+    'instrumentation': ['Stats', 'get_stats', 'set_stats', 'report', 'ProfileCapture'],
+    'service': ['ScoringService', 'MicroBatcher'],
+    'training': ['train_pipeline', 'build_pipeline'],
+    'sharding': ['plan_shards', 'run_shards', 'run_shards_parallel', 'shard_status', 'merge_shards'],
+}
+_SUBMODULES = set(_EXPORTS) | {'cli'}
+_EXPORT_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_EXPORT_MODULES)
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f'.{name}', __name__)
+    module = _EXPORT_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | _SUBMODULES)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .instrumentation import instrumented
+from .toolkit import (
+    MODEL_REGISTRY,
+    RAW_POSTING_COLUMNS,
+    USE_CASE_KEYWORDS,
+    _model_columns,
+    detect_use_case,
+    load_pipeline,
+    preprocess_job_batch,
+    register_use_case,
+    score_frame,
+)
+
+# ------------------------
+# Bulk Scoring of Local Datasets
+# ------------------------
+
+# Model input name -> column name in the dataset being scored
+DEFAULT_COLUMN_MAP = {col: col for col in RAW_POSTING_COLUMNS}
+
+
+def _raw_postings(df, columns=None):
+    """Select and rename the posting text columns of ``df`` to the names preprocessing expects."""
+    mapping = dict(DEFAULT_COLUMN_MAP)
+    mapping.update(columns or {})
+    missing = [source for target, source in mapping.items() if source not in df.columns and target != 'KeyDuties']
+    if missing:
+        raise ValueError(f"Missing posting columns: {missing}. Pass columns={{...}} to map them.")
+    return pd.DataFrame(
+        {target: df[source] if source in df.columns else '' for target, source in mapping.items()},
+        index=df.index
+    )
+
+
+def _score_chunk(raw):
+    """Preprocess and score one chunk of raw postings; runs inside the worker processes."""
+    df_processed = preprocess_job_batch(raw)
+    df_processed['data_buyer_score'] = score_frame(df_processed)
+    df_processed['DetectedUseCase'] = detect_use_case(df_processed)
+    return df_processed.drop(columns=['CombinedText'])
+
+
+def _init_worker(model_path, mmap_mode, use_cases):
+    # Forked workers inherit the parent's loaded pipeline; spawned ones load it once here
+    if not MODEL_REGISTRY.loaded or (MODEL_REGISTRY.model_path, MODEL_REGISTRY.mmap_mode) != (model_path, mmap_mode):
+        load_pipeline(model_path=model_path, mmap_mode=mmap_mode)
+    for use_case, keywords in use_cases.items():
+        if USE_CASE_KEYWORDS.get(use_case) != keywords:
+            register_use_case(use_case, keywords)
+
+
+def _with_scores(chunk, scored, keep_columns):
+    kept = chunk if keep_columns is None else chunk[list(keep_columns)]
+    return pd.concat([kept.drop(columns=scored.columns, errors='ignore'), scored], axis=1)
+
+
+def _score_chunks(chunks, columns=None, workers=1, keep_columns=None):
+    """
+    Yield each chunk of ``chunks`` with its engineered features and ``data_buyer_score`` added, in order.
+
+    With ``workers > 1`` chunks are scored in a process pool. Only the four posting text
+    columns are sent to the workers. At most ``2 * workers`` chunks are in flight, so
+    memory stays bounded however long the input is.
+    """
+    workers = workers or os.cpu_count() or 1
+    load_pipeline()
+    prepared = ((chunk, _raw_postings(chunk, columns)) for chunk in chunks)
+
+    if workers == 1:
+        for chunk, raw in prepared:
+            yield _with_scores(chunk, _score_chunk(raw), keep_columns)
+        return
+
+    initargs = (MODEL_REGISTRY.model_path, MODEL_REGISTRY.mmap_mode, dict(USE_CASE_KEYWORDS))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as executor:
+        pending = deque()
+        for chunk, raw in prepared:
+            pending.append((chunk, executor.submit(_score_chunk, raw)))
+            if len(pending) >= 2 * workers:
+                chunk, future = pending.popleft()
+                yield _with_scores(chunk, future.result(), keep_columns)
+        while pending:
+            chunk, future = pending.popleft()
+            yield _with_scores(chunk, future.result(), keep_columns)
+
+
+@instrumented
+def score_dataframe(df, columns=None, workers=1, chunksize=10_000, keep_columns=None):
+    """
+    Preprocess and score a DataFrame of postings that is already in memory.
+
+    Args:
+        df (pd.DataFrame): Postings with title, agency, description and (optionally) duties columns.
+        columns (dict, optional): Maps JobTitle, Agency, JobDescription and KeyDuties to the column
+            names used in ``df``, e.g. ``{"JobTitle": "title"}``. Unmapped names are used as-is.
+        workers (int): Processes to score with; ``None`` uses every core.
+        chunksize (int): Rows per chunk handed to a worker.
+        keep_columns (list[str], optional): Input columns to carry into the output; defaults to all.
+
+    Returns:
+        pd.DataFrame: The kept input columns plus the engineered features, ``DetectedUseCase`` and
+        ``data_buyer_score``, with ``df``'s index.
+    """
+    chunks = (df.iloc[start:start + chunksize] for start in range(0, len(df), chunksize))
+    scored = list(_score_chunks(chunks, columns, workers, keep_columns))
+    if not scored:
+        _raw_postings(df, columns)
+        features = [col for col in _model_columns() if col != 'CombinedText']
+        empty = pd.DataFrame(columns=features + ['data_buyer_score', 'DetectedUseCase'], index=df.index)
+        return _with_scores(df, empty, keep_columns)
+    return pd.concat(scored)
+
+
+@instrumented
+def score_csv(path, out_path, chunksize=10_000, workers=None, columns=None, keep_columns=None, **read_csv_kwargs):
+    """
+    Score a CSV of postings chunk by chunk and append each scored chunk to ``out_path``.
+
+    Neither the input nor the output is ever fully held in memory, so archives larger
+    than RAM can be scored.
+
+    Args:
+        path (str): CSV of postings.
+        out_path (str): CSV to write; overwritten if it exists.
+        chunksize (int): Rows read, scored and written at a time.
+        workers (int, optional): Processes to score with; defaults to every core.
+        columns (dict, optional): Column mapping, as for ``score_dataframe``.
+        keep_columns (list[str], optional): Input columns to carry into the output; defaults to all.
+        **read_csv_kwargs: Passed to ``pd.read_csv`` (e.g. ``sep``, ``encoding``).
+
+    Returns:
+        dict: rows, chunks, seconds and rows_per_second for the run.
+    """
+    start = time.perf_counter()
+    rows = chunks = 0
+    reader = pd.read_csv(path, chunksize=chunksize, **read_csv_kwargs)
+    with open(out_path, 'w', newline='', encoding='utf-8') as handle:
+        for scored in _score_chunks(reader, columns, workers, keep_columns):
+            scored.to_csv(handle, header=chunks == 0, index=False)
+            rows += len(scored)
+            chunks += 1
+    seconds = time.perf_counter() - start
+    return {'rows': rows, 'chunks': chunks, 'seconds': seconds, 'rows_per_second': rows / seconds if seconds else 0.0}
@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+Command line entry point, installed as ``data-demand-mapper``.
+
+    data-demand-mapper serve --port 8000 --max-batch-size 64 --max-wait-ms 5
+    data-demand-mapper train labeled_postings.csv --output-dir models --n-jobs -1
+    data-demand-mapper shard plan runs/weekly --ranking industry --keywords data contract analyst
+    data-demand-mapper shard run runs/weekly --processes 4
+    data-demand-mapper shard merge runs/weekly --industry Medical --top-n 100
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+
+# Subcommands import their modules when run, so ``--help`` stays fast.
+
+
+def _serve(args):
+    from .service import ScoringService
+
+    service = ScoringService(
+        model_path=args.model, compiled_path=args.compiled, max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms, api_key=args.api_key, email=args.email, host=args.host, port=args.port,
+    )
+    service.serve_forever()
+    return 0
+
+
+def _read_training_data(path):
+    """CSV or Parquet frames, or JSON / JSON-lines files of USAJobs descriptors."""
+    import pandas as pd
+
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    if path.endswith('.jsonl'):
+        with open(path) as handle:
+            return [json.loads(line) for line in handle if line.strip()]
+    if path.endswith('.json'):
+        with open(path) as handle:
+            return json.load(handle)
+    return pd.read_csv(path)
+
+
+def _train(args):
+    from .training import train_pipeline
+
+    _, report = train_pipeline(
+        _read_training_data(args.data), args.output_dir, label_column=args.label,
+        param_grid=json.loads(args.param_grid) if args.param_grid else None, cv=args.cv, n_jobs=args.n_jobs,
+        smote=not args.no_smote, cache_dir=args.cache_dir, version=args.version,
+    )
+    summary = {name: round(values['mean'], 4) for name, values in report['cv_metrics'].items()}
+    print(json.dumps({'artifact': report['artifact'], 'fingerprint': report['fingerprint'],
+                      'best_params': report['best_params'], 'cv_metrics': summary}, indent=2))
+    return 0
+
+
+def _shard_plan(args):
+    from .sharding import plan_shards
+
+    manifest = plan_shards(args.directory, args.api_key, args.email, search_keywords=args.keywords,
+                           ranking=args.ranking, pages_per_shard=args.pages_per_shard)
+    print(f"{len(manifest['shards'])} shards in {args.directory}")
+    return 0
+
+
+def _shard_run(args):
+    from .sharding import read_manifest, run_shards, run_shards_parallel, shard_status
+    from .usajobs import USAJobsHarvester
+
+    if args.processes > 1:
+        run_shards_parallel(args.directory, args.api_key, args.email, processes=args.processes,
+                            requests_per_second=args.requests_per_second, stale_after=args.stale_after)
+    else:
+        with USAJobsHarvester(args.api_key, args.email, requests_per_second=args.requests_per_second,
+                              results_per_page=read_manifest(args.directory)['results_per_page']) as harvester:
+            run_shards(args.directory, harvester=harvester, stale_after=args.stale_after)
+    status = shard_status(args.directory)
+    print(json.dumps({key: status[key] for key in ('shards', 'finished', 'running', 'pending')}))
+    return 0 if status['finished'] == status['shards'] else 1
+
+
+def _shard_status(args):
+    from .sharding import shard_status
+
+    print(json.dumps(shard_status(args.directory), indent=2))
+    return 0
+
+
+def _shard_merge(args):
+    from .sharding import merge_shards
+
+    corpus = merge_shards(args.directory)
+    if args.use_case:
+        ranked = corpus.top_by_use_case(args.use_case, args.top_n)
+    else:
+        ranked = corpus.top_by_industry(args.industry, args.top_n)
+    if args.output:
+        ranked.to_csv(args.output, index=False)
+    else:
+        print(ranked.to_string(index=False))
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='data-demand-mapper', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--log-level', default='INFO', help='logging level (default: INFO)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve = commands.add_parser('serve', help='run the HTTP/JSON scoring service')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8000)
+    serve.add_argument('--model', help='pipeline to serve (default: the packaged model)')
+    serve.add_argument('--compiled', help='serve a CompiledScorer .npz artifact instead of the pipeline')
+    serve.add_argument('--max-batch-size', type=int, default=64, help='postings scored per batch at most')
+    serve.add_argument('--max-wait-ms', type=float, default=5.0,
+                       help='how long a request waits for others to join its batch')
+    serve.add_argument('--api-key', default=os.environ.get('USAJOBS_API_KEY'),
+                       help='USAJobs API key for job_ids requests (default: $USAJOBS_API_KEY)')
+    serve.add_argument('--email', default=os.environ.get('USAJOBS_EMAIL'),
+                       help='USAJobs User-Agent email for job_ids requests (default: $USAJOBS_EMAIL)')
+    serve.set_defaults(run=_serve)
+
+    train = commands.add_parser('train', help='retrain the scoring pipeline and write a versioned artifact')
+    train.add_argument('data', help='labeled postings: .csv or .parquet frame, or .json/.jsonl USAJobs descriptors')
+    train.add_argument('--output-dir', default='models', help='where the artifact and metrics report go')
+    train.add_argument('--label', default='IsLikelyDataBuyer', help='0/1 label column (default: IsLikelyDataBuyer)')
+    train.add_argument('--param-grid', help='JSON GridSearchCV grid, e.g. \'{"classifier__C": [0.1, 1, 10]}\'')
+    train.add_argument('--cv', type=int, default=5, help='stratified cross-validation folds')
+    train.add_argument('--n-jobs', type=int, default=-1, help='processes for the search (default: every core)')
+    train.add_argument('--no-smote', action='store_true', help='train without SMOTE oversampling')
+    train.add_argument('--cache-dir', help='keep fitted preprocessing steps here to reuse them across runs')
+    train.add_argument('--version', help='artifact version (default: UTC timestamp)')
+    train.set_defaults(run=_train)
+
+    shard = commands.add_parser('shard', help='split a custom-keyword harvest into shards that workers run')
+    shard_commands = shard.add_subparsers(dest='shard_command', required=True)
+    credentials = argparse.ArgumentParser(add_help=False)
+    credentials.add_argument('--api-key', default=os.environ.get('USAJOBS_API_KEY'),
+                             help='USAJobs API key (default: $USAJOBS_API_KEY)')
+    credentials.add_argument('--email', default=os.environ.get('USAJOBS_EMAIL'),
+                             help='USAJobs User-Agent email (default: $USAJOBS_EMAIL)')
+
+    plan = shard_commands.add_parser('plan', parents=[credentials], help='write the shard manifest')
+    plan.add_argument('directory', help='run directory shared by every worker')
+    plan.add_argument('--keywords', nargs='+', help='search keywords (default: the built-in list)')
+    plan.add_argument('--ranking', choices=['industry', 'use_case'], default='industry',
+                      help='custom ranking to reproduce (default: industry)')
+    plan.add_argument('--pages-per-shard', type=int, default=4)
+    plan.set_defaults(run=_shard_plan)
+
+    run = shard_commands.add_parser('run', parents=[credentials], help='run unfinished shards')
+    run.add_argument('directory')
+    run.add_argument('--processes', type=int, default=1, help='local worker processes')
+    run.add_argument('--requests-per-second', type=float, default=10.0,
+                     help='USAJobs request limit for all processes together')
+    run.add_argument('--stale-after', type=float, default=3600,
+                     help="seconds after which a crashed worker's shard is retried")
+    run.set_defaults(run=_shard_run)
+
+    status = shard_commands.add_parser('status', help='show finished, running and pending shards')
+    status.add_argument('directory')
+    status.set_defaults(run=_shard_status)
+
+    merge = shard_commands.add_parser('merge', help='merge the shards and print or save a ranking')
+    merge.add_argument('directory')
+    ranking = merge.add_mutually_exclusive_group(required=True)
+    ranking.add_argument('--industry', help='rank postings in this industry')
+    ranking.add_argument('--use-case', help='rank postings flagged with this use case')
+    merge.add_argument('--top-n', type=int, default=100)
+    merge.add_argument('--output', help='write the ranking to this CSV instead of printing it')
+    merge.set_defaults(run=_shard_merge)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper(), format='%(asctime)s %(name)s %(levelname)s %(message)s')
+    return args.run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,277 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import json
+import re
+
+import numpy as np
+
+# ------------------------
+# Compiled Linear Scorer
+# ------------------------
+
+COMPILED_FORMAT = 1
+
+
+def _sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-z))
+
+
+def _plain(value):
+    return value.item() if hasattr(value, 'item') else value
+
+
+def _as_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _compile_block(name, transformer, columns, coef):
+    """Fold one fitted ColumnTransformer block and its slice of the coefficients into plain arrays."""
+    kind = type(transformer).__name__
+    columns = [columns] if isinstance(columns, str) else list(columns)
+
+    if kind == 'OneHotEncoder':
+        if getattr(transformer, 'drop_idx_', None) is not None or getattr(transformer, 'infrequent_categories_', None):
+            raise ValueError(f"{name}: OneHotEncoder with drop or infrequent categories is not supported.")
+        weights, offset = [], 0
+        for categories in transformer.categories_:
+            weights.append({
+                'categories': [_plain(category) for category in categories],
+                'weights': coef[offset:offset + len(categories)].tolist(),
+            })
+            offset += len(categories)
+        return {'kind': 'onehot', 'columns': columns, 'encoders': weights}, offset, {}
+
+    if kind == 'StandardScaler':
+        width = len(columns)
+        scale = transformer.scale_ if transformer.scale_ is not None else np.ones(width)
+        mean = transformer.mean_ if getattr(transformer, 'mean_', None) is not None and transformer.with_mean else np.zeros(width)
+        slope = coef[:width] / scale
+        return {'kind': 'linear', 'columns': columns, 'slope': slope.tolist(),
+                'bias': float(-(slope * mean).sum())}, width, {}
+
+    if kind == 'TfidfVectorizer':
+        params = transformer.get_params()
+        unsupported = [
+            key for key, value in (('analyzer', 'word'), ('tokenizer', None), ('preprocessor', None),
+                                   ('strip_accents', None), ('input', 'content'))
+            if params[key] != value
+        ]
+        if unsupported or params['norm'] not in ('l2', 'l1', None):
+            raise ValueError(f"{name}: TfidfVectorizer settings {unsupported or ['norm']} are not supported.")
+        terms = np.empty(len(transformer.vocabulary_), dtype=object)
+        for term, index in transformer.vocabulary_.items():
+            terms[index] = term
+        width = len(terms)
+        stop_words = transformer.get_stop_words()
+        block = {
+            'kind': 'tfidf', 'columns': columns[:1],
+            'lowercase': params['lowercase'], 'token_pattern': params['token_pattern'],
+            'ngram_range': list(params['ngram_range']), 'stop_words': sorted(stop_words or []),
+            'binary': params['binary'], 'sublinear_tf': params['sublinear_tf'], 'norm': params['norm'],
+        }
+        idf = transformer.idf_ if params['use_idf'] else np.ones(width)
+        arrays = {'terms': terms.astype(str), 'idf': np.asarray(idf, dtype=float), 'coef': coef[:width].copy()}
+        return block, width, arrays
+
+    if isinstance(transformer, str) and transformer == 'passthrough':
+        width = len(columns)
+        return {'kind': 'linear', 'columns': columns, 'slope': coef[:width].tolist(), 'bias': 0.0}, width, {}
+
+    raise ValueError(f"{name}: {kind} cannot be compiled; only OneHotEncoder, StandardScaler, "
+                     f"TfidfVectorizer and passthrough blocks are supported.")
+
+
+class CompiledScorer:
+    """
+    The scoring pipeline folded into plain NumPy arrays.
+
+    For a linear classifier the score is ``sigmoid(intercept + sum of block contributions)``.
+    One-hot blocks become a weight per category, scaler blocks a slope and offset, and
+    the TF-IDF block a vocabulary with one IDF weight and one coefficient per term. Scoring
+    needs neither pandas column selection nor scikit-learn, so the artifact loads and
+    scores a single posting in a fraction of the time the full pipeline takes.
+
+    Build one with ``CompiledScorer.from_pipeline(pipeline)`` or ``CompiledScorer.load(path)``.
+    """
+
+    def __init__(self, blocks, arrays, intercept):
+        self.blocks = blocks
+        self.arrays = arrays
+        self.intercept = float(intercept)
+        self._prepare()
+
+    def _prepare(self):
+        for position, block in enumerate(self.blocks):
+            if block['kind'] == 'onehot':
+                block['lookup'] = [
+                    dict(zip(encoder['categories'], encoder['weights'])) for encoder in block['encoders']
+                ]
+            elif block['kind'] == 'tfidf':
+                arrays = self.arrays[position]
+                block['index'] = {term: i for i, term in enumerate(arrays['terms'].tolist())}
+                block['regex'] = re.compile(block['token_pattern'])
+                block['stop'] = frozenset(block['stop_words'])
+
+    @classmethod
+    def from_pipeline(cls, pipeline):
+        """Compile a fitted ``preprocessor`` + linear binary ``classifier`` pipeline."""
+        preprocessor = pipeline.named_steps['preprocessor']
+        classifier = pipeline.named_steps['classifier']
+        if not hasattr(classifier, 'coef_') or len(getattr(classifier, 'classes_', [])) != 2:
+            raise ValueError("Only binary linear classifiers (coef_, intercept_) can be compiled.")
+        coef = np.asarray(classifier.coef_, dtype=float).ravel()
+
+        blocks, arrays, offset = [], [], 0
+        for name, transformer, columns in preprocessor.transformers_:
+            if isinstance(transformer, str) and transformer == 'drop':
+                continue
+            block, width, block_arrays = _compile_block(name, transformer, columns, coef[offset:])
+            blocks.append(block)
+            arrays.append(block_arrays)
+            offset += width
+        if offset != len(coef):
+            raise ValueError(f"Compiled {offset} features but the classifier has {len(coef)} coefficients.")
+        return cls(blocks, arrays, np.ravel(classifier.intercept_)[0])
+
+    # --- persistence ---
+
+    def save(self, path):
+        """Write the compiled model as a compressed ``.npz`` file (no pickles)."""
+        public = [{key: value for key, value in block.items() if key not in ('lookup', 'index', 'regex', 'stop')}
+                  for block in self.blocks]
+        meta = {'format': COMPILED_FORMAT, 'intercept': self.intercept, 'blocks': public}
+        payload = {'meta': np.array(json.dumps(meta))}
+        for position, block_arrays in enumerate(self.arrays):
+            for key, value in block_arrays.items():
+                payload[f'block{position}_{key}'] = value
+        with open(path, 'wb') as handle:
+            np.savez_compressed(handle, **payload)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            if meta['format'] != COMPILED_FORMAT:
+                raise ValueError(f"Unsupported compiled model format {meta['format']}.")
+            arrays = [
+                {key.split('_', 1)[1]: data[key] for key in data.files if key.startswith(f'block{position}_')}
+                for position in range(len(meta['blocks']))
+            ]
+        return cls(meta['blocks'], arrays, meta['intercept'])
+
+    # --- scoring ---
+
+    def _text_contributions(self, block, arrays, texts):
+        index, regex, stop = block['index'], block['regex'], block['stop']
+        min_n, max_n = block['ngram_range']
+        idf, coef = arrays['idf'], arrays['coef']
+        out = np.zeros(len(texts))
+        for row, text in enumerate(texts):
+            if not isinstance(text, str):
+                continue
+            if block['lowercase']:
+                text = text.lower()
+            tokens = [token for token in regex.findall(text) if token not in stop]
+            counts = {}
+            for n in range(min_n, max_n + 1):
+                for start in range(len(tokens) - n + 1):
+                    term = index.get(' '.join(tokens[start:start + n]))
+                    if term is not None:
+                        counts[term] = counts.get(term, 0) + 1
+            if not counts:
+                continue
+            terms = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+            tf = np.fromiter(counts.values(), dtype=float, count=len(counts))
+            if block['binary']:
+                tf = np.ones_like(tf)
+            elif block['sublinear_tf']:
+                tf = 1.0 + np.log(tf)
+            weights = tf * idf[terms]
+            if block['norm'] == 'l2':
+                weights /= np.sqrt(weights @ weights)
+            elif block['norm'] == 'l1':
+                weights /= np.abs(weights).sum()
+            out[row] = weights @ coef[terms]
+        return out
+
+    def decision_function(self, rows):
+        """
+        Linear score before the sigmoid.
+
+        Args:
+            rows (pd.DataFrame | dict | list[dict]): Preprocessed postings (model columns).
+        """
+        if isinstance(rows, dict):
+            rows = [rows]
+        if isinstance(rows, list):
+            column = lambda name: [row.get(name) for row in rows]
+            size = len(rows)
+        else:
+            column = lambda name: rows[name].tolist()
+            size = len(rows)
+
+        total = np.full(size, self.intercept)
+        for block, arrays in zip(self.blocks, self.arrays):
+            if block['kind'] == 'onehot':
+                for name, lookup in zip(block['columns'], block['lookup']):
+                    total += np.array([lookup.get(value, 0.0) for value in column(name)])
+            elif block['kind'] == 'linear':
+                for name, slope in zip(block['columns'], block['slope']):
+                    total += slope * np.array([_as_float(value) for value in column(name)])
+                total += block['bias']
+            else:
+                total += self._text_contributions(block, arrays, column(block['columns'][0]))
+        return total
+
+    def score(self, rows):
+        """``data_buyer_score`` for preprocessed postings, matching the full pipeline's ``predict_proba``."""
+        return _sigmoid(self.decision_function(rows))
+
+    def score_jobs(self, jobs):
+        """Preprocess raw USAJobs descriptors (or a raw postings DataFrame) and score them."""
+        from .toolkit import preprocess_job_batch
+        return self.score(preprocess_job_batch(jobs))
+
+    def check_parity(self, pipeline, df_processed, atol=1e-9):
+        """
+        Compare against the full pipeline on held-out preprocessed postings.
+
+        Returns:
+            float: Largest absolute score difference.
+
+        Raises:
+            AssertionError: If any score differs by more than ``atol``.
+        """
+        X = pipeline.named_steps['preprocessor'].transform(df_processed)
+        expected = pipeline.named_steps['classifier'].predict_proba(X)[:, 1]
+        difference = float(np.max(np.abs(expected - self.score(df_processed)))) if len(df_processed) else 0.0
+        if difference > atol:
+            raise AssertionError(f"Compiled scores differ from the pipeline by up to {difference:.3g} (atol={atol}).")
+        return difference
+
+
+def export_compiled_model(path, pipeline=None, validation_frame=None, atol=1e-9):
+    """
+    Compile the scoring pipeline and save it, optionally checking parity first.
+
+    Args:
+        path (str): ``.npz`` file to write.
+        pipeline (optional): Fitted pipeline; defaults to the shared ``load_pipeline()``.
+        validation_frame (pd.DataFrame, optional): Held-out preprocessed postings; the export fails
+            if any compiled score differs from the pipeline by more than ``atol``.
+
+    Returns:
+        CompiledScorer: The compiled model that was written.
+    """
+    if pipeline is None:
+        from .toolkit import load_pipeline
+        pipeline = load_pipeline()
+    scorer = CompiledScorer.from_pipeline(pipeline)
+    if validation_frame is not None:
+        scorer.check_parity(pipeline, validation_frame, atol)
+    scorer.save(path)
+    return scorer
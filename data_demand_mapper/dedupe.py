@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import zlib
+
+import numpy as np
+import pandas as pd
+
+# ------------------------
+# Duplicate Text Collapsing
+# ------------------------
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def _shingle_hashes(text, size):
+    tokens = text.split() if isinstance(text, str) else []
+    if len(tokens) <= size:
+        shingles = {' '.join(tokens)}
+    else:
+        shingles = {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+    return np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingles),
+                       dtype=np.uint64, count=len(shingles))
+
+
+def minhash_signatures(texts, num_perm=64, shingle_size=3, seed=0):
+    """
+    MinHash signature of each text's word shingles.
+
+    Returns:
+        np.ndarray: ``(len(texts), num_perm)`` uint64 array; the fraction of equal entries
+        between two rows estimates the Jaccard similarity of their shingle sets.
+    """
+    # a, b < 2**32 keep ``hash * a + b`` below 2**64 for 32-bit shingle hashes
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, _MAX_HASH, num_perm, dtype=np.uint64)
+    b = rng.integers(0, _MAX_HASH, num_perm, dtype=np.uint64)
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint64)
+    for row, text in enumerate(texts):
+        hashes = _shingle_hashes(text, shingle_size)
+        signatures[row] = ((np.outer(hashes, a) + b) % _MERSENNE_PRIME & _MAX_HASH).min(axis=0)
+    return signatures
+
+
+def _near_duplicate_roots(texts, threshold, num_perm, bands, shingle_size):
+    """Union texts whose LSH bands collide and whose signatures agree on at least ``threshold``."""
+    signatures = minhash_signatures(texts, num_perm, shingle_size)
+    width = num_perm // bands
+    parent = list(range(len(texts)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for band in range(bands):
+        buckets = {}
+        block = np.ascontiguousarray(signatures[:, band * width:(band + 1) * width])
+        for i, key in enumerate(row.tobytes() for row in block):
+            j = buckets.setdefault(key, i)
+            if j == i:
+                continue
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j and (signatures[i] == signatures[j]).mean() >= threshold:
+                parent[max(root_i, root_j)] = min(root_i, root_j)
+    return np.array([find(i) for i in range(len(texts))])
+
+
+def duplicate_groups(texts, near_duplicates=False, threshold=0.9, num_perm=64, bands=16, shingle_size=3):
+    """
+    Group postings whose text is identical or, optionally, nearly identical.
+
+    Exact duplicates are found by hashing the text. With ``near_duplicates``, the distinct
+    texts are also compared with MinHash signatures and banded LSH, and two texts whose
+    estimated Jaccard similarity of word shingles reaches ``threshold`` share a group.
+
+    Args:
+        texts (iterable of str): Texts to group, e.g. ``CombinedText``.
+        near_duplicates (bool): Also group near-identical texts.
+        threshold (float): Minimum estimated Jaccard similarity for near-duplicates.
+        num_perm (int): MinHash permutations; must be divisible by ``bands``.
+        bands (int): LSH bands; more bands find less similar candidate pairs.
+        shingle_size (int): Words per shingle.
+
+    Returns:
+        tuple: ``(representatives, inverse)``. ``representatives`` holds the position of the
+        first posting of each group, and ``representatives[inverse[i]]`` is posting i's.
+    """
+    codes, uniques = pd.factorize(np.asarray(list(texts), dtype=object), use_na_sentinel=False)
+    if near_duplicates and len(uniques) > 1:
+        roots = _near_duplicate_roots(list(uniques), threshold, num_perm, bands, shingle_size)
+        group_codes, _ = pd.factorize(roots)
+        codes = group_codes[codes]
+    _, representatives = np.unique(codes, return_index=True)
+    return representatives, codes
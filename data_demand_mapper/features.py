@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import json
+import time
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency: pip install data_demand_mapper[parquet]
+    pa = pq = None
+
+from .postings import compact_frame
+from .toolkit import USE_CASE_KEYWORDS, _model_columns, feature_fingerprint, score_frame
+
+# ------------------------
+# Columnar Feature Store
+# ------------------------
+
+FEATURE_STORE_FORMAT = 1
+_METADATA_KEY = b'data_demand_mapper'
+
+
+class FeatureSchemaMismatch(ValueError):
+    """Raised when stored features were engineered under different rules than the current ones."""
+
+
+def _require_pyarrow():
+    if pq is None:
+        raise ImportError(
+            "The feature store needs pyarrow. Install it with: pip install 'data_demand_mapper[parquet]'"
+        )
+
+
+def write_features(df_processed, path, compression='zstd'):
+    """
+    Write preprocessed postings to a compressed Parquet file tagged with the feature-schema version.
+
+    Args:
+        df_processed (pd.DataFrame): ``preprocess_job_batch`` output. Extra columns such as JobID
+            or data_buyer_score are stored too. The index is not stored.
+        path (str): Parquet file to write.
+        compression (str): Parquet codec, e.g. "zstd", "snappy" or "none".
+
+    Returns:
+        dict: The metadata written alongside the features.
+    """
+    _require_pyarrow()
+    missing = [col for col in _model_columns() if col not in df_processed.columns]
+    if missing:
+        raise ValueError(f"Missing model columns: {missing}")
+
+    table = pa.Table.from_pandas(compact_frame(df_processed), preserve_index=False)
+    info = {
+        'format': FEATURE_STORE_FORMAT,
+        'feature_schema': feature_fingerprint(),
+        'use_cases': list(USE_CASE_KEYWORDS),
+        'rows': table.num_rows,
+        'created': time.time(),
+    }
+    metadata = dict(table.schema.metadata or {})
+    metadata[_METADATA_KEY] = json.dumps(info).encode('utf-8')
+    pq.write_table(table.replace_schema_metadata(metadata), path, compression=compression)
+    return info
+
+
+def feature_store_info(path):
+    """Metadata of a feature file (format, feature_schema, use_cases, rows, created) without reading its data."""
+    _require_pyarrow()
+    metadata = pq.read_schema(path).metadata or {}
+    if _METADATA_KEY not in metadata:
+        raise ValueError(f"{path} was not written by write_features.")
+    return json.loads(metadata[_METADATA_KEY])
+
+
+def read_features(path, columns=None, memory_map=True, check_schema=True):
+    """
+    Read preprocessed postings back from a feature file.
+
+    Args:
+        path (str): File written by ``write_features``.
+        columns (list[str], optional): Only read these columns.
+        memory_map (bool): Memory-map the file instead of reading it into a buffer.
+        check_schema (bool): Raise ``FeatureSchemaMismatch`` if the file was written under different
+            feature rules (keyword lists, registered use cases) than the current ones.
+
+    Returns:
+        pd.DataFrame: The stored columns, with Agency, AgencySize and Industry as categoricals.
+    """
+    info = feature_store_info(path)
+    if check_schema and info['feature_schema'] != feature_fingerprint():
+        raise FeatureSchemaMismatch(
+            f"{path} was engineered under feature schema {info['feature_schema'][:12]}, "
+            f"current schema is {feature_fingerprint()[:12]}; re-run preprocessing."
+        )
+    return pq.read_table(path, columns=columns, memory_map=memory_map).to_pandas()
+
+
+def score_features(path, pipeline=None):
+    """
+    Score a feature file without repeating text feature engineering.
+
+    Returns:
+        np.ndarray: ``data_buyer_score`` for every stored posting, in file order.
+    """
+    return score_frame(read_features(path, columns=_model_columns()), pipeline)
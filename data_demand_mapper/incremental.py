@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from .postings import _join_text
+from .toolkit import (
+    MODEL_REGISTRY,
+    RAW_POSTING_COLUMNS,
+    _model_columns,
+    feature_fingerprint,
+    load_pipeline,
+    preprocess_job_batch,
+    score_frame,
+)
+
+# ------------------------
+# Incremental Posting Store
+# ------------------------
+
+def content_hash(title, agency, description, duties, schema=''):
+    """
+    Hash of a posting's raw text fields plus the feature schema they were processed under.
+
+    List-valued text (MajorDuties) is joined first, as preprocessing does, so a posting
+    hashes the same whether its duties arrive as a list or already joined.
+    """
+    payload = json.dumps([title, agency, _join_text(description), _join_text(duties), schema], default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class PostingStore:
+    """
+    Local SQLite store of every posting already preprocessed and scored.
+
+    Rows are keyed by ``MatchedObjectId`` and keep the content hash of the raw
+    posting, its engineered feature row, its ``data_buyer_score`` and the model
+    fingerprint that produced the score. ``score`` only preprocesses postings that
+    are new or whose text changed; postings whose features are current but whose
+    score came from a different model are rescored from the stored features without
+    repeating text feature engineering.
+
+    Args:
+        path (str): SQLite file to create or reuse.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self.last_run = {}
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS postings ("
+                "job_id TEXT PRIMARY KEY, content_hash TEXT, features TEXT, score REAL, "
+                "model TEXT, close_date TEXT, first_seen REAL, last_seen REAL)"
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+
+    def _lookup(self, job_ids):
+        found = {}
+        ids = list(job_ids)
+        with self._lock:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                marks = ','.join('?' * len(chunk))
+                for row in self._conn.execute(
+                    f"SELECT job_id, content_hash, features, score, model FROM postings WHERE job_id IN ({marks})",
+                    chunk
+                ):
+                    found[row[0]] = row[1:]
+        return found
+
+    def _upsert(self, rows, now):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO postings VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(job_id) DO UPDATE SET content_hash = excluded.content_hash, "
+                "features = excluded.features, score = excluded.score, model = excluded.model, "
+                "close_date = excluded.close_date, last_seen = excluded.last_seen",
+                [row + (now, now) for row in rows]
+            )
+
+    def _touch(self, job_ids, now):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE postings SET last_seen = ? WHERE job_id = ?", [(now, job_id) for job_id in job_ids]
+            )
+
+    def score(self, postings, pipeline=None, model_fingerprint=None):
+        """
+        Preprocess and score only new or changed postings, reusing stored results for the rest.
+
+        Args:
+            postings (pd.DataFrame): Raw postings with JobID, JobTitle, Agency, JobDescription and
+                KeyDuties columns, and optionally ApplicationCloseDate.
+            pipeline (optional): Scoring pipeline; defaults to the shared ``load_pipeline()``.
+            model_fingerprint (str, optional): Identifies ``pipeline`` across runs. Without it, stored
+                scores from an explicitly passed pipeline are never trusted and are recomputed.
+
+        Returns:
+            pd.DataFrame: The preprocessed model columns plus ``data_buyer_score`` for every
+            posting, in input order. Counts of new, changed, rescored and reused postings are
+            left in ``last_run``.
+        """
+        model = model_fingerprint
+        if pipeline is None:
+            pipeline = load_pipeline()
+            model = model or MODEL_REGISTRY.fingerprint
+        columns = _model_columns()
+        schema = feature_fingerprint()
+        postings = postings.reset_index(drop=True)
+        job_ids = _optional_strings(postings, 'JobID')
+        close_dates = _optional_strings(postings, 'ApplicationCloseDate')
+        hashes = [
+            content_hash(*values, schema)
+            for values in zip(*(postings[col] for col in RAW_POSTING_COLUMNS))
+        ]
+
+        stored = self._lookup({job_id for job_id in job_ids if job_id})
+        fresh, rescore, reuse = [], [], []
+        for position, (job_id, digest) in enumerate(zip(job_ids, hashes)):
+            entry = stored.get(job_id) if job_id else None
+            if entry is None or entry[0] != digest:
+                fresh.append(position)
+            elif model is None or entry[3] != model:
+                rescore.append(position)
+            else:
+                reuse.append(position)
+
+        parts = []
+        if fresh:
+            processed = preprocess_job_batch(postings.iloc[fresh])
+            parts.append(processed)
+        if rescore:
+            parts.append(pd.DataFrame(
+                [json.loads(stored[job_ids[position]][1]) for position in rescore],
+                index=rescore, columns=columns
+            ))
+        if reuse:
+            restored = pd.DataFrame(
+                [json.loads(stored[job_ids[position]][1]) for position in reuse],
+                index=reuse, columns=columns
+            )
+            restored['data_buyer_score'] = [stored[job_ids[position]][2] for position in reuse]
+            parts.append(restored)
+
+        to_score = [part for part in parts if 'data_buyer_score' not in part.columns]
+        if to_score:
+            needs_score = pd.concat(to_score)
+            needs_score['data_buyer_score'] = score_frame(needs_score, pipeline)
+            parts = [needs_score] + [part for part in parts if 'data_buyer_score' in part.columns]
+
+        result = pd.concat(parts).sort_index() if parts else pd.DataFrame(columns=columns + ['data_buyer_score'])
+        result['IsSeniorRole'] = result['IsSeniorRole'].astype(bool)
+        result['IsGeneralistRole'] = result['IsGeneralistRole'].astype(bool)
+
+        now = time.time()
+        updated = [position for position in fresh + rescore if job_ids[position]]
+        records = result.loc[updated, columns].to_dict('records')
+        self._upsert([
+            (
+                job_ids[position], hashes[position], json.dumps(record, default=_json_default),
+                float(result.at[position, 'data_buyer_score']), model, close_dates[position],
+            )
+            for position, record in zip(updated, records)
+        ], now)
+        self._touch([job_ids[position] for position in reuse], now)
+
+        self.last_run = {
+            'postings': len(postings), 'new_or_changed': len(fresh),
+            'rescored': len(rescore), 'reused': len(reuse),
+        }
+        return result.reset_index(drop=True)
+
+    def expire(self, unseen_for=None, closed_before=None):
+        """
+        Drop postings that are no longer open.
+
+        Args:
+            unseen_for (float, optional): Remove postings not returned by any harvest for this many seconds.
+            closed_before (str, optional): Remove postings whose ApplicationCloseDate is earlier than this
+                ISO date (e.g. today's date).
+
+        Returns:
+            int: Number of postings removed.
+        """
+        removed = 0
+        with self._lock, self._conn:
+            if unseen_for is not None:
+                removed += self._conn.execute(
+                    "DELETE FROM postings WHERE last_seen < ?", (time.time() - unseen_for,)
+                ).rowcount
+            if closed_before is not None:
+                removed += self._conn.execute(
+                    "DELETE FROM postings WHERE close_date IS NOT NULL AND close_date < ?", (str(closed_before),)
+                ).rowcount
+        return removed
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _optional_strings(frame, column):
+    if column not in frame.columns:
+        return [None] * len(frame)
+    return [None if value is None or value == '' or pd.isna(value) else str(value) for value in frame[column]]
+
+
+def _json_default(value):
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
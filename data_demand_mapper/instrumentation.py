@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import cProfile
+import functools
+import io
+import logging
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+logger = logging.getLogger('data_demand_mapper')
+logger.addHandler(logging.NullHandler())
+
+# ------------------------
+# Stage Timers, Counters and Callbacks
+# ------------------------
+
+class Stats:
+    """
+    Thread-safe timers and counters that every toolkit stage reports to.
+
+    Timed stages (``preprocess``, ``fuzzy``, ``score``, ``model.load``, ``http.request``,
+    entry points such as ``fetch_and_score_top_by_use_case_auto``) record call counts,
+    total and maximum seconds, and rows processed. Counters record HTTP status codes,
+    retries, bytes, cache hits and pages fetched per keyword. Every timing and event
+    is also passed to each registered callback as a dict, e.g. to forward it to a
+    metrics system.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.callbacks = []
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counters = Counter()
+            self.timers = defaultdict(lambda: {'calls': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'rows': 0})
+
+    def add_callback(self, callback):
+        """Call ``callback(event)`` for every timing and event; ``event`` has at least ``name``."""
+        self.callbacks.append(callback)
+        return callback
+
+    def remove_callback(self, callback):
+        self.callbacks.remove(callback)
+
+    def _dispatch(self, event):
+        for callback in list(self.callbacks):
+            try:
+                callback(event)
+            except Exception:
+                logger.exception("Stats callback %r failed", callback)
+
+    def incr(self, name, value=1):
+        with self._lock:
+            self.counters[name] += value
+
+    def observe(self, name, seconds, rows=None, **fields):
+        """Record one timed call of stage ``name``."""
+        with self._lock:
+            timer = self.timers[name]
+            timer['calls'] += 1
+            timer['seconds'] += seconds
+            timer['max_seconds'] = max(timer['max_seconds'], seconds)
+            timer['rows'] += rows or 0
+        logger.debug("%s took %.4fs%s", name, seconds, f" for {rows} rows" if rows is not None else "")
+        if self.callbacks:
+            self._dispatch(dict(fields, name=name, seconds=seconds, rows=rows))
+
+    @contextmanager
+    def timer(self, name, rows=None, **fields):
+        """Time the ``with`` block as one call of stage ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, rows, **fields)
+
+    def event(self, name, value=1, **fields):
+        """Count an untimed event and pass it to the callbacks."""
+        self.incr(name, value)
+        if self.callbacks:
+            self._dispatch(dict(fields, name=name, value=value))
+
+    def summary(self):
+        """
+        Snapshot of every timer (with rows_per_second) and counter.
+
+        Returns:
+            dict: ``{'timers': {...}, 'counters': {...}}``.
+        """
+        with self._lock:
+            timers = {}
+            for name, timer in self.timers.items():
+                timers[name] = dict(timer)
+                timers[name]['rows_per_second'] = (
+                    timer['rows'] / timer['seconds'] if timer['rows'] and timer['seconds'] else None
+                )
+            return {'timers': timers, 'counters': dict(self.counters)}
+
+
+_STATS = Stats()
+
+
+def get_stats():
+    """The ``Stats`` object all toolkit stages currently report to."""
+    return _STATS
+
+
+def set_stats(stats):
+    """Report to ``stats`` from now on (e.g. a fresh ``Stats()`` per run); returns the previous one."""
+    global _STATS
+    previous, _STATS = _STATS, stats
+    return previous
+
+
+def timer(name, rows=None, **fields):
+    return _STATS.timer(name, rows, **fields)
+
+
+def observe(name, seconds, rows=None, **fields):
+    _STATS.observe(name, seconds, rows, **fields)
+
+
+def event(name, value=1, **fields):
+    _STATS.event(name, value, **fields)
+
+
+def instrumented(func):
+    """Time every call of a public entry point under its own name."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with _STATS.timer(func.__name__):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def report():
+    """``get_stats().summary()`` plus the current title-cache and transform-cache hit rates."""
+    from . import toolkit, transform_cache
+
+    summary = _STATS.summary()
+    summary['caches'] = {'title': toolkit.title_cache_info()}
+    if transform_cache.TRANSFORM_CACHE is not None:
+        summary['caches']['transform'] = transform_cache.TRANSFORM_CACHE.info()
+    return summary
+
+
+# ------------------------
+# Single-Run Profiling
+# ------------------------
+
+class ProfileCapture:
+    """
+    Capture a cProfile CPU profile and/or tracemalloc memory profile of one ``with`` block.
+
+    Example:
+        with ProfileCapture(memory=True) as capture:
+            fetch_and_score_top_by_use_case_auto(api_key, email)
+        print(capture.report())
+
+    Args:
+        cpu (bool): Run cProfile.
+        memory (bool): Trace allocations with tracemalloc (slows the run down noticeably).
+        top (int): Rows to show per section of ``report()``.
+        sort (str): pstats sort key for the CPU section.
+    """
+
+    def __init__(self, cpu=True, memory=False, top=25, sort='cumulative'):
+        self.cpu = cpu
+        self.memory = memory
+        self.top = top
+        self.sort = sort
+        self.profile = None
+        self.snapshot = None
+        self.peak_memory = None
+        self.seconds = None
+        self._started_tracing = False
+
+    def __enter__(self):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        if self.memory and hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        if self.cpu:
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.seconds = time.perf_counter() - self._start
+        if self.cpu:
+            self.profile.disable()
+        if self.memory:
+            self.snapshot = tracemalloc.take_snapshot()
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            if self._started_tracing:
+                tracemalloc.stop()
+
+    def top_allocations(self):
+        """``(location, bytes)`` for the lines holding the most memory at the end of the block."""
+        if self.snapshot is None:
+            return []
+        return [(str(stat.traceback), stat.size) for stat in self.snapshot.statistics('lineno')[:self.top]]
+
+    def report(self):
+        lines = [f"Wall time: {self.seconds:.3f}s"]
+        if self.profile is not None:
+            buffer = io.StringIO()
+            pstats.Stats(self.profile, stream=buffer).sort_stats(self.sort).print_stats(self.top)
+            lines.append(buffer.getvalue())
+        if self.snapshot is not None:
+            lines.append(f"Peak traced memory: {self.peak_memory / 1024 ** 2:.1f} MiB")
+            lines.extend(f"{size / 1024:10.1f} KiB  {location}" for location, size in self.top_allocations())
+        return '\n'.join(lines)
@@ -0,0 +1,306 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+from array import array
+
+import numpy as np
+import pandas as pd
+
+# ------------------------
+# Compact Posting Storage
+# ------------------------
+
+CATEGORICAL_COLUMNS = ['Agency', 'Department', 'AgencySize', 'Industry', 'ApplicationCloseDate']
+
+
+def _join_text(value):
+    """MajorDuties/JobSummary arrive either as a string or a list of strings."""
+    if isinstance(value, list):
+        return ' '.join(value)
+    return value
+
+
+class _StringPool:
+    """Interns repeated strings as int32 codes; None is code -1."""
+
+    __slots__ = ('codes', 'values')
+
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def code(self, value):
+        if value is None:
+            return -1
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def categorical(self, codes):
+        return pd.Categorical.from_codes(np.frombuffer(codes, dtype=np.int32), categories=self.values)
+
+    def strings(self, codes):
+        values = np.array(self.values + [None], dtype=object)
+        return values[np.frombuffer(codes, dtype=np.int32)]
+
+
+class CompactPostings:
+    """
+    Harvested postings held column-wise instead of as one dict per posting.
+
+    Titles, agencies, departments and close dates are interned in string pools and
+    stored as int32 codes. Description and duties text is kept once per posting, with
+    MajorDuties lists joined on arrival. The search keywords that found each posting
+    are a bitmask over ``keywords``. ``to_frame`` builds the raw-postings frame that
+    ``preprocess_job_batch`` expects without copying any text.
+
+    Args:
+        keywords (list[str]): Search keywords; bit i of a posting's mask is ``keywords[i]``.
+            Keywords not listed are appended as they are seen.
+        missing_duties (str): KeyDuties value for postings without MajorDuties.
+    """
+
+    def __init__(self, keywords=(), missing_duties=''):
+        self.keywords = []
+        self._keyword_bits = {}
+        self.missing_duties = missing_duties
+        self._rows = {}
+        self.job_ids = []
+        self.descriptions = []
+        self.duties = []
+        self._titles, self.title_codes = _StringPool(), array('i')
+        self._agencies, self.agency_codes = _StringPool(), array('i')
+        self._departments, self.department_codes = _StringPool(), array('i')
+        self._close_dates, self.close_date_codes = _StringPool(), array('i')
+        self.keyword_masks = array('Q')
+        for keyword in keywords:
+            self._keyword_bit(keyword)
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    def __contains__(self, job_id):
+        return job_id in self._rows
+
+    def _keyword_bit(self, keyword):
+        bit = self._keyword_bits.get(keyword)
+        if bit is None:
+            bit = self._keyword_bits[keyword] = 1 << len(self.keywords)
+            self.keywords.append(keyword)
+            if len(self.keywords) > 64 and isinstance(self.keyword_masks, array):
+                self.keyword_masks = list(self.keyword_masks)
+        return bit
+
+    def add(self, job, keyword=None):
+        """
+        Add one ``SearchResultItems`` entry, or just record ``keyword`` if its JobID is already held.
+
+        Returns:
+            bool: True if the posting was new.
+        """
+        job_id = job.get('MatchedObjectId')
+        if not job_id:
+            return False
+        row = self._rows.get(job_id)
+        new = row is None
+        if new:
+            descriptor = job.get('MatchedObjectDescriptor', {})
+            details = descriptor.get('UserArea', {}).get('Details', {})
+            row = self._rows[job_id] = len(self.job_ids)
+            self.job_ids.append(job_id)
+            self.title_codes.append(self._titles.code(descriptor.get('PositionTitle')))
+            self.agency_codes.append(self._agencies.code(descriptor.get('OrganizationName')))
+            self.department_codes.append(self._departments.code(descriptor.get('DepartmentName')))
+            self.close_date_codes.append(self._close_dates.code(descriptor.get('ApplicationCloseDate')))
+            self.descriptions.append(_join_text(details.get('JobSummary')))
+            self.duties.append(_join_text(details.get('MajorDuties', self.missing_duties)))
+            self.keyword_masks.append(0)
+        if keyword is not None:
+            # The 65th keyword swaps keyword_masks for a list, so look its bit up first
+            bit = self._keyword_bit(keyword)
+            self.keyword_masks[row] |= bit
+        return new
+
+    def extend(self, harvested):
+        """Add ``(keyword, job)`` pairs, e.g. from ``USAJobsHarvester.harvest``."""
+        for keyword, job in harvested:
+            self.add(job, keyword)
+        return self
+
+    def search_keywords(self, row):
+        """Keywords that found the posting at ``row``, in keyword-list order."""
+        mask = self.keyword_masks[row]
+        return [keyword for keyword, bit in self._keyword_bits.items() if mask & bit]
+
+    def keyword_matrix(self):
+        """Boolean (postings x keywords) matrix of which keyword found which posting."""
+        if isinstance(self.keyword_masks, array):
+            masks = np.frombuffer(self.keyword_masks, dtype=np.uint64)
+            bits = np.left_shift(np.uint64(1), np.arange(len(self.keywords), dtype=np.uint64))
+            return (masks[:, None] & bits) != 0
+        return np.array([[bool(mask >> i & 1) for i in range(len(self.keywords))] for mask in self.keyword_masks],
+                        dtype=bool).reshape(len(self), len(self.keywords))
+
+    def to_frame(self, keywords=False, categorical=False):
+        """
+        Raw postings frame for ``preprocess_job_batch`` / ``PostingStore.score``.
+
+        The text columns reference the stored strings rather than copying them, and
+        JobTitle, Agency (OrganizationName), Department (DepartmentName) and
+        ApplicationCloseDate hold one shared string per distinct value.
+
+        Args:
+            keywords (bool): Add a ``SearchKeywords`` list column.
+            categorical (bool): Return Agency, Department and ApplicationCloseDate as categoricals.
+        """
+        def pooled(pool, codes):
+            return pool.categorical(codes) if categorical else pool.strings(codes)
+
+        frame = pd.DataFrame({
+            'JobID': pd.Series(self.job_ids, dtype=object),
+            'JobTitle': self._titles.strings(self.title_codes),
+            'JobDescription': pd.Series(self.descriptions, dtype=object),
+            'KeyDuties': pd.Series(self.duties, dtype=object),
+            'Agency': pooled(self._agencies, self.agency_codes),
+            'Department': pooled(self._departments, self.department_codes),
+            'ApplicationCloseDate': pooled(self._close_dates, self.close_date_codes),
+        })
+        if keywords:
+            frame['SearchKeywords'] = [self.search_keywords(row) for row in range(len(self))]
+        return frame
+
+
+def compact_frame(df):
+    """
+    Categorical dtypes for repeated string columns and uint8 for the 0/1 flags.
+
+    Applied to scored corpora and feature files; values are unchanged.
+    """
+    df = df.copy()
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    for col in df.columns:
+        if col.startswith(('Is', 'UseCase_')) and df[col].dtype.kind in 'iu':
+            df[col] = df[col].astype('uint8')
+    return df
+
+
+def expand_frame(df):
+    """Undo ``compact_frame`` on a (small) result: plain string columns and int64 flags."""
+    df = df.copy()
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(df[col].cat.categories.dtype)
+        elif col.startswith(('Is', 'UseCase_')) and df[col].dtype == np.uint8:
+            df[col] = df[col].astype('int64')
+    return df
+
+
+# ------------------------
+# Scored Corpus
+# ------------------------
+
+class ScoredCorpus:
+    """
+    A harvest that has been preprocessed and scored once, ready for any number of rankings.
+
+    Rows are held in descending ``data_buyer_score`` order, with ties in harvest order,
+    compacted with ``compact_frame`` (categorical Agency/AgencySize/Industry, uint8 flags).
+    Every use case and industry keeps the positions of its rows in that order, so a
+    ranking is a slice of a precomputed index rather than a new filter and sort.
+
+    Args:
+        scored (pd.DataFrame): Preprocessed postings with a ``data_buyer_score`` column.
+    """
+
+    def __init__(self, scored):
+        from .toolkit import detect_use_case
+
+        order = np.argsort(-scored['data_buyer_score'].to_numpy(), kind='stable')
+        frame = compact_frame(scored.iloc[order])
+        frame['DetectedUseCase'] = detect_use_case(frame)
+        self.frame = frame
+
+        self.use_case_index = {
+            col.replace('UseCase_', ''): np.flatnonzero(frame[col].to_numpy() == 1)
+            for col in frame.columns if col.startswith('UseCase_')
+        }
+        self.industry_index = {
+            industry: positions
+            for industry, positions in frame.groupby(frame['Industry'].str.lower(), sort=False).indices.items()
+        }
+
+    def __len__(self):
+        return len(self.frame)
+
+    @property
+    def use_cases(self):
+        return list(self.use_case_index)
+
+    @property
+    def industries(self):
+        return sorted(self.frame['Industry'].unique())
+
+    def _positions(self, use_case=None, industry_name=None, min_score=None):
+        positions = np.arange(len(self.frame))
+        if use_case is not None:
+            if use_case not in self.use_case_index:
+                raise ValueError(f"Use case '{use_case}' not available.")
+            positions = self.use_case_index[use_case]
+        if industry_name is not None:
+            industry = self.industry_index.get(industry_name.lower(), np.empty(0, dtype=np.intp))
+            positions = np.intersect1d(positions, industry, assume_unique=True)
+        if min_score is not None:
+            positions = positions[self.frame['data_buyer_score'].to_numpy()[positions] >= min_score]
+        return positions
+
+    def top(self, use_case=None, industry_name=None, top_n=100, min_score=None, columns=None):
+        """
+        Return the best-scoring postings matching every filter given.
+
+        Args:
+            use_case (str, optional): Keep postings flagged with this use case.
+            industry_name (str, optional): Keep postings in this industry (case-insensitive).
+            top_n (int): Maximum rows returned.
+            min_score (float, optional): Drop postings scoring below this.
+            columns (list[str], optional): Columns to return. Defaults to JobTitle, Agency,
+                Industry, data_buyer_score and DetectedUseCase.
+
+        Returns:
+            pd.DataFrame: Matching postings, highest score first.
+        """
+        if columns is None:
+            columns = ['JobTitle', 'Agency', 'Industry', 'data_buyer_score', 'DetectedUseCase']
+        positions = self._positions(use_case, industry_name, min_score)
+        return expand_frame(self.frame.iloc[positions[:top_n]][columns])
+
+    def top_by_use_case(self, use_case="Fraud", top_n=100):
+        """Same output as ``fetch_and_score_top_by_use_case_auto``."""
+        use_case_column = f"UseCase_{use_case}"
+        return self.top(use_case=use_case, top_n=top_n,
+                        columns=['JobTitle', 'Agency', 'data_buyer_score', use_case_column])
+
+    def top_by_industry(self, industry_name="Medical", top_n=100):
+        """Same output as ``fetch_and_score_top_by_industry_auto``."""
+        return self.top(industry_name=industry_name, top_n=top_n,
+                        columns=['JobTitle', 'Agency', 'data_buyer_score', 'DetectedUseCase'])
+
+    def segments(self, use_cases=None, industries=None, top_n=10):
+        """
+        Rank every use case and industry combination, e.g. for a weekly report.
+
+        Returns:
+            dict: ``{(use_case, industry): pd.DataFrame}`` for each pair with at least one posting.
+        """
+        use_cases = self.use_cases if use_cases is None else use_cases
+        industries = self.industries if industries is None else industries
+        report = {}
+        for use_case in use_cases:
+            for industry in industries:
+                ranked = self.top(use_case=use_case, industry_name=industry, top_n=top_n)
+                if len(ranked):
+                    report[(use_case, industry)] = ranked
+        return report
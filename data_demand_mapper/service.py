@@ -0,0 +1,380 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import json
+import queue
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import numpy as np
+
+from .instrumentation import event, logger, observe, report
+from .toolkit import MODEL_REGISTRY, preprocess_job_batch, score_frame, warmup
+from .usajobs import USAJobsClient
+
+# ------------------------
+# Request Micro-Batching
+# ------------------------
+
+class MicroBatcher:
+    """
+    Coalesce concurrent scoring requests into one preprocess + ``transform`` + ``predict_proba`` call.
+
+    A single worker thread takes the first waiting request, then keeps collecting
+    requests until ``max_batch_size`` postings are queued or ``max_wait_ms`` has passed,
+    and scores them all at once. If a batch fails, its requests are retried one by one
+    so a malformed posting only fails its own request.
+
+    Args:
+        score (callable): Takes a list of USAJobs descriptors and returns one score per descriptor.
+        max_batch_size (int): Postings scored per batch at most. A larger single request is scored on its own.
+        max_wait_ms (float): How long the first request in a batch waits for others to join it.
+    """
+
+    def __init__(self, score, max_batch_size=64, max_wait_ms=5.0):
+        self.score = score
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.batches = 0
+        self.postings = 0
+        self.largest_batch = 0
+        self._queue = queue.Queue()
+        self._held = None
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='data-demand-mapper-batcher', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def pending(self):
+        return self._queue.qsize() + (self._held is not None)
+
+    def submit(self, jobs):
+        """Queue a list of descriptors; the returned future resolves to their scores."""
+        future = Future()
+        self._queue.put((list(jobs), future))
+        return future
+
+    def _collect(self, first):
+        batch, size = [first], len(first[0])
+        deadline = time.perf_counter() + self.max_wait_ms / 1000
+        while size < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            if size + len(item[0]) > self.max_batch_size:
+                # Starts the next batch instead, so this one stays within the limit
+                self._held = item
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch, size
+
+    def _score_batch(self, batch, size):
+        start = time.perf_counter()
+        scores = self.score([job for jobs, _ in batch for job in jobs])
+        observe('service.batch', time.perf_counter() - start, size, requests=len(batch))
+        self.batches += 1
+        self.postings += size
+        self.largest_batch = max(self.largest_batch, size)
+        offset = 0
+        for jobs, future in batch:
+            future.set_result(scores[offset:offset + len(jobs)])
+            offset += len(jobs)
+
+    def _run(self):
+        while True:
+            first, self._held = self._held or self._queue.get(), None
+            if first is None:
+                return
+            batch, size = self._collect(first)
+            try:
+                self._score_batch(batch, size)
+                continue
+            except Exception as exc:
+                logger.warning("Scoring batch of %d postings failed: %s", size, exc)
+                if len(batch) == 1:
+                    batch[0][1].set_exception(exc)
+                    continue
+            for item in batch:
+                try:
+                    self._score_batch([item], len(item[0]))
+                except Exception as exc:
+                    item[1].set_exception(exc)
+
+
+# ------------------------
+# HTTP/JSON Scoring Service
+# ------------------------
+
+class _ScoringHandler(BaseHTTPRequestHandler):
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, route):
+        service = self.server.service
+        start = time.perf_counter()
+        path = urlparse(self.path).path
+        try:
+            status, payload = route(service, path)
+        except Exception as exc:
+            logger.exception("Request to %s failed", path)
+            status, payload = 500, {'error': repr(exc)}
+        self._send(status, payload)
+        service._record(path, status, time.perf_counter() - start)
+
+    def do_GET(self):
+        self._handle(lambda service, path: service.handle_get(path))
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length)
+        self._handle(lambda service, path: service.handle_post(path, raw))
+
+
+class _ScoringServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default listen backlog of 5 resets connections under concurrent load
+    request_queue_size = 128
+
+
+def _result(job, score):
+    return {
+        "data_buyer_score": round(float(score), 4),
+        "title": job.get('PositionTitle'),
+        "agency": job.get('OrganizationName'),
+    }
+
+
+class ScoringService:
+    """
+    Local HTTP/JSON scoring service that keeps the pipeline warm and micro-batches requests.
+
+    Endpoints:
+        ``POST /score`` with ``{"jobs": [<MatchedObjectDescriptor>, ...]}`` or ``{"job_ids": [...]}``
+        returns ``{"results": [{"data_buyer_score", "title", "agency"}, ...]}`` in request order.
+        Job IDs are looked up on the Search API; a failed lookup gives ``{"job_id", "error"}``
+        for that ID only.
+        ``GET /health`` returns the model fingerprint, uptime and queue depth.
+        ``GET /metrics`` returns request counts, latency percentiles, batch sizes and stage timings.
+
+    Args:
+        model_path (str, optional): Pipeline to serve; defaults to the packaged model.
+        compiled_path (str, optional): Serve a ``CompiledScorer`` artifact instead of the pipeline.
+        max_batch_size (int): Postings scored per batch at most.
+        max_wait_ms (float): How long a request waits for others to join its batch.
+        api_key / email (str, optional): USAJobs credentials, needed for ``job_ids`` requests.
+        client (USAJobsClient, optional): Client for ``job_ids`` lookups; built from the credentials if
+            omitted, in which case ``stop()`` closes it.
+        host / port: Address to listen on; port 0 picks a free port.
+    """
+
+    def __init__(self, model_path=None, compiled_path=None, max_batch_size=64, max_wait_ms=5.0,
+                 api_key=None, email=None, client=None, host='127.0.0.1', port=8000, fetch_workers=8):
+        self.model_path = model_path
+        self.compiled_path = compiled_path
+        self.host = host
+        self.port = port
+        self._owns_client = client is None
+        self.client = client or (USAJobsClient(api_key, email) if api_key and email else None)
+        self.batcher = MicroBatcher(self._score, max_batch_size, max_wait_ms)
+        self.fetch_workers = fetch_workers
+        self.started = None
+        self._scorer = None
+        self._server = None
+        self._fetch_pool = None
+        self._lock = threading.Lock()
+        self._requests = Counter()
+        self._latencies = {}
+
+    # --- scoring ---
+
+    def _score(self, jobs):
+        df_processed = preprocess_job_batch(jobs)
+        if self._scorer is not None:
+            return self._scorer.score(df_processed)
+        return score_frame(df_processed)
+
+    def _fetch(self, job_id):
+        response = self.client.search({"Keyword": job_id})
+        if response.status_code != 200:
+            raise ValueError(f"Failed to fetch job ID {job_id}: {response.status_code}")
+        items = response.json()['SearchResult']['SearchResultItems']
+        if not items:
+            raise ValueError(f"Job ID {job_id} not found")
+        return items[0]['MatchedObjectDescriptor']
+
+    def score_jobs(self, jobs):
+        """Score descriptors through the batcher, as ``POST /score`` with ``jobs`` does."""
+        scores = self.batcher.submit(jobs).result()
+        return [_result(job, score) for job, score in zip(jobs, scores)]
+
+    def score_job_ids(self, job_ids):
+        """Look up and score job IDs, as ``POST /score`` with ``job_ids`` does."""
+        if self.client is None:
+            raise PermissionError("Scoring job_ids needs USAJobs credentials; start the service with api_key and email.")
+        lookups = [self._fetch_pool.submit(self._fetch, str(job_id)) for job_id in job_ids]
+        found, results = [], []
+        for job_id, lookup in zip(job_ids, lookups):
+            try:
+                found.append((len(results), lookup.result()))
+                results.append({"job_id": job_id})
+            except Exception as exc:
+                results.append({"job_id": job_id, "error": str(exc)})
+        if found:
+            scores = self.batcher.submit([job for _, job in found]).result()
+            for (position, job), score in zip(found, scores):
+                results[position].update(_result(job, score))
+        return results
+
+    # --- HTTP routes ---
+
+    def handle_post(self, path, raw):
+        if path != '/score':
+            return 404, {'error': f"Unknown path {path}"}
+        try:
+            body = json.loads(raw or b'{}')
+        except ValueError as exc:
+            return 400, {'error': f"Invalid JSON: {exc}"}
+        if not isinstance(body, dict):
+            return 400, {'error': 'Expected a JSON object with "jobs" or "job_ids".'}
+        if 'job' in body:
+            body = {'jobs': [body['job']]}
+        if 'jobs' in body:
+            jobs = body['jobs']
+            if not isinstance(jobs, list) or not all(isinstance(job, dict) for job in jobs):
+                return 400, {'error': '"jobs" must be a list of MatchedObjectDescriptor objects.'}
+            return 200, {'results': self.score_jobs(jobs) if jobs else []}
+        if 'job_ids' in body:
+            try:
+                return 200, {'results': self.score_job_ids(list(body['job_ids']))}
+            except PermissionError as exc:
+                return 503, {'error': str(exc)}
+        return 400, {'error': 'Expected a JSON object with "jobs" or "job_ids".'}
+
+    def handle_get(self, path):
+        if path == '/health':
+            return 200, self.health()
+        if path == '/metrics':
+            return 200, self.metrics()
+        return 404, {'error': f"Unknown path {path}"}
+
+    def _record(self, path, status, seconds):
+        with self._lock:
+            self._requests[(path, status)] += 1
+            self._latencies.setdefault(path, deque(maxlen=10_000)).append(seconds)
+        event('service.requests', path=path, status=status)
+
+    def health(self):
+        return {
+            'status': 'ok',
+            'model': self.compiled_path or MODEL_REGISTRY.resolved_path,
+            'model_fingerprint': None if self.compiled_path else MODEL_REGISTRY.fingerprint,
+            'uptime_seconds': time.time() - self.started if self.started else 0.0,
+            'queue_depth': self.batcher.pending,
+        }
+
+    def metrics(self):
+        """Request counts by path and status, latency percentiles (ms) over the last 10,000 requests per path, and batching stats."""
+        with self._lock:
+            requests = [{'path': path, 'status': status, 'count': count}
+                        for (path, status), count in sorted(self._requests.items())]
+            latencies = {path: np.array(values) * 1000 for path, values in self._latencies.items()}
+        latency_ms = {
+            path: {'count': len(values), 'mean': float(values.mean()),
+                   **{f'p{q}': float(np.percentile(values, q)) for q in (50, 95, 99)},
+                   'max': float(values.max())}
+            for path, values in latencies.items()
+        }
+        batcher = self.batcher
+        return {
+            'requests': requests,
+            'latency_ms': latency_ms,
+            'batches': batcher.batches,
+            'postings_scored': batcher.postings,
+            'mean_batch_size': batcher.postings / batcher.batches if batcher.batches else None,
+            'largest_batch': batcher.largest_batch,
+            'max_batch_size': batcher.max_batch_size,
+            'max_wait_ms': batcher.max_wait_ms,
+            'stages': report()['timers'],
+        }
+
+    # --- lifecycle ---
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        """Load the model, start the batcher and listen in a background thread."""
+        if self.compiled_path:
+            from .compiled import CompiledScorer
+            self._scorer = CompiledScorer.load(self.compiled_path)
+        else:
+            warmup(self.model_path)
+        self._fetch_pool = ThreadPoolExecutor(max_workers=self.fetch_workers)
+        self.batcher.start()
+        self._server = _ScoringServer((self.host, self.port), _ScoringHandler)
+        self._server.service = self
+        self.started = time.time()
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        logger.info("Scoring service listening on %s", self.url)
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        self.batcher.stop()
+        if self._fetch_pool is not None:
+            self._fetch_pool.shutdown()
+            self._fetch_pool = None
+        if self._owns_client and self.client is not None:
+            self.client.close()
+
+    def serve_forever(self):
+        """Run until interrupted (Ctrl+C)."""
+        self.start()
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,396 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import json
+import os
+import socket
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+
+from .bulk import _init_worker
+from .instrumentation import event, instrumented, logger
+from .postings import CompactPostings, ScoredCorpus
+from .toolkit import DEFAULT_SEARCH_KEYWORDS, MODEL_REGISTRY, USE_CASE_KEYWORDS, _score_postings, feature_fingerprint
+from .usajobs import USAJobsClient, USAJobsHarvester, _harvester_scope, _page_count
+
+# ------------------------
+# Shard Planning
+# ------------------------
+
+MANIFEST_FORMAT = 1
+MANIFEST_NAME = 'manifest.json'
+ORDER_COLUMNS = ['ShardKeyword', 'ShardPage', 'ShardPosition']
+
+# The custom rankings a run can reproduce; 'use_case' reads Agency from DepartmentName
+RANKINGS = ('industry', 'use_case')
+
+
+def _write_json(path, data):
+    tmp = f'{path}.{uuid.uuid4().hex}.tmp'
+    with open(tmp, 'w') as handle:
+        json.dump(data, handle, indent=2)
+    os.replace(tmp, path)
+
+
+def read_manifest(directory):
+    with open(os.path.join(directory, MANIFEST_NAME)) as handle:
+        manifest = json.load(handle)
+    if manifest.get('format') != MANIFEST_FORMAT:
+        raise ValueError(f"Unsupported shard manifest format {manifest.get('format')!r}.")
+    return manifest
+
+
+def _shard_path(directory, shard, suffix):
+    return os.path.join(directory, 'shards', f"{shard['id']}{suffix}")
+
+
+@instrumented
+def plan_shards(directory, api_key=None, email=None, search_keywords=None, ranking='industry', pages_per_shard=4,
+                harvester=None, client=None):
+    """
+    Split a custom-keyword harvest into independent (keyword, page range) shards and write a manifest.
+
+    Page 1 of every keyword is requested to learn its page count. A keyword whose
+    response does not report one becomes a single shard that pages until empty.
+    Planning an existing directory returns its manifest unchanged, so a crashed run
+    is resumed by simply running the workers again.
+
+    Args:
+        directory (str): Run directory shared by every worker (a local path or a shared mount).
+        api_key (str, optional): USAJobs API key; not needed when ``harvester`` or ``client`` is given.
+        email (str, optional): USAJobs API email User-Agent.
+        search_keywords (list[str], optional): Keywords to harvest. Defaults to ``DEFAULT_SEARCH_KEYWORDS``.
+        ranking (str): ``'industry'`` to reproduce ``fetch_top_data_buyers_by_industry_custom`` or
+            ``'use_case'`` for ``fetch_and_score_top_by_use_case_custom``; they read Agency from
+            different fields, which changes the features and scores.
+        pages_per_shard (int): Result pages fetched by one shard.
+        harvester (USAJobsHarvester, optional): Harvester used to fetch the first pages.
+        client (USAJobsClient, optional): Client for the default harvester.
+
+    Returns:
+        dict: The manifest.
+    """
+    path = os.path.join(directory, MANIFEST_NAME)
+    if os.path.exists(path):
+        return read_manifest(directory)
+    if ranking not in RANKINGS:
+        raise ValueError(f"ranking must be one of {list(RANKINGS)}, not {ranking!r}.")
+    if search_keywords is None:
+        search_keywords = DEFAULT_SEARCH_KEYWORDS
+    keywords = list(dict.fromkeys(search_keywords))
+
+    with _harvester_scope(harvester, api_key, email, client) as harvester, \
+            ThreadPoolExecutor(max_workers=harvester.max_workers) as pool:
+        first_pages = list(pool.map(lambda keyword: harvester.fetch_page(keyword, 1), keywords))
+
+    shards = []
+    for index, (keyword, data) in enumerate(zip(keywords, first_pages)):
+        if data is not None and not harvester._page_items(data):
+            continue
+        count = None if data is None else _page_count(data, harvester.results_per_page)
+        if count is None:
+            shards.append({'id': f'{index:03d}-00001', 'keyword': keyword, 'keyword_index': index,
+                           'first_page': 1, 'last_page': None})
+            continue
+        for first in range(1, count + 1, pages_per_shard):
+            shards.append({'id': f'{index:03d}-{first:05d}', 'keyword': keyword, 'keyword_index': index,
+                           'first_page': first, 'last_page': min(first + pages_per_shard - 1, count)})
+
+    os.makedirs(os.path.join(directory, 'shards'), exist_ok=True)
+    manifest = {
+        'format': MANIFEST_FORMAT,
+        'created': time.time(),
+        'ranking': ranking,
+        'keywords': keywords,
+        'results_per_page': harvester.results_per_page,
+        'model_fingerprint': MODEL_REGISTRY.fingerprint,
+        'feature_schema': feature_fingerprint(),
+        'use_cases': dict(USE_CASE_KEYWORDS),
+        'shards': shards,
+    }
+    _write_json(path, manifest)
+    logger.info("Planned %d shards for %d keywords in %s", len(shards), len(keywords), directory)
+    return manifest
+
+
+# ------------------------
+# Shard Workers
+# ------------------------
+
+class _ShardLock:
+    """
+    Exclusive lock file for one shard, holding a token unique to this claim.
+
+    The holder refreshes the file's mtime while it works, so only a lock whose
+    holder has been silent for ``stale_after`` seconds is broken by another worker,
+    and a holder whose lock was broken never removes its successor's.
+    """
+
+    def __init__(self, path, stale_after):
+        self.path = path
+        self.stale_after = stale_after
+        self.owner = json.dumps({'host': socket.gethostname(), 'pid': os.getpid(), 'token': uuid.uuid4().hex})
+
+    def _stale(self, path):
+        return time.time() - os.path.getmtime(path) >= self.stale_after
+
+    def _break(self):
+        """Move a stale lock aside; returns False if it turned out to be alive."""
+        broken = f'{self.path}.{uuid.uuid4().hex}.stale'
+        try:
+            if not self._stale(self.path):
+                return False
+            # Renaming is atomic, so only one of several workers breaks a stale lock
+            os.rename(self.path, broken)
+        except FileNotFoundError:
+            return True
+        # Another worker may have replaced the stale lock between the check and the rename
+        if not self._stale(broken):
+            try:
+                os.link(broken, self.path)
+            except FileExistsError:
+                pass
+            os.remove(broken)
+            return False
+        os.remove(broken)
+        return True
+
+    def acquire(self):
+        for _ in range(2):
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if not self._break():
+                    return False
+                continue
+            with os.fdopen(fd, 'w') as handle:
+                handle.write(self.owner)
+            return True
+        return False
+
+    def owned(self):
+        try:
+            with open(self.path) as handle:
+                return handle.read() == self.owner
+        except FileNotFoundError:
+            return False
+
+    def touch(self):
+        """Mark the holder as alive; between pages of a long shard."""
+        if self.owned():
+            try:
+                os.utime(self.path)
+            except FileNotFoundError:
+                pass
+
+    def release(self):
+        if self.owned():
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+
+def _fetch_shard_pages(harvester, shard, lock):
+    keyword, first, last = shard['keyword'], shard['first_page'], shard['last_page']
+
+    def fetch(page):
+        data = harvester.fetch_page(keyword, page)
+        lock.touch()
+        return data
+
+    if last is None:
+        pages = [harvester._page_items(fetch(first))]
+        while pages[-1]:
+            data = fetch(first + len(pages))
+            if data is None:
+                break
+            pages.append(harvester._page_items(data))
+        return enumerate(pages, start=first)
+    pages = range(first, last + 1)
+    with ThreadPoolExecutor(max_workers=harvester.max_workers) as pool:
+        return zip(pages, [harvester._page_items(data) for data in pool.map(fetch, pages)])
+
+
+def _score_shard(manifest, harvester, shard, lock):
+    """Fetch, preprocess and score one shard, keeping each posting's (keyword, page, position)."""
+    failed = len(harvester.failed_pages)
+    postings = CompactPostings(missing_duties='N/A')
+    order = []
+    for page, items in _fetch_shard_pages(harvester, shard, lock):
+        for position, job in enumerate(items):
+            if postings.add(job):
+                order.append((shard['keyword_index'], page, position))
+    if len(harvester.failed_pages) > failed:
+        raise RuntimeError(f"{len(harvester.failed_pages) - failed} pages of shard {shard['id']} failed.")
+
+    df = postings.to_frame()
+    if not len(df):
+        return pd.DataFrame(columns=['JobID'] + ORDER_COLUMNS)
+    if manifest['ranking'] == 'use_case':
+        # This ranking has always read Agency from DepartmentName
+        df = df.rename(columns={'Agency': 'Department', 'Department': 'Agency'})
+    df_processed = _score_postings(df)
+    df_processed.insert(0, 'JobID', df['JobID'].to_numpy())
+    df_processed.insert(1, 'ApplicationCloseDate', df['ApplicationCloseDate'].to_numpy())
+    return pd.concat([df_processed, pd.DataFrame(order, columns=ORDER_COLUMNS, index=df_processed.index)], axis=1)
+
+
+def _check_model(manifest):
+    if manifest['model_fingerprint'] != MODEL_REGISTRY.fingerprint:
+        raise ValueError("This worker's model differs from the one the shards were planned with; "
+                         "point load_pipeline() at the same artifact.")
+    if manifest['feature_schema'] != feature_fingerprint():
+        raise ValueError("This worker's keyword lists differ from the ones the shards were planned with; "
+                         "register the same use cases before running shards.")
+
+
+@instrumented
+def run_shards(directory, api_key=None, email=None, harvester=None, client=None, max_shards=None, stale_after=3600):
+    """
+    Work through the manifest's unfinished shards, writing one scored partial result per shard.
+
+    Any number of workers, local processes or other machines sharing ``directory``,
+    can run this at the same time. Each shard is claimed with an exclusive lock file and
+    its result is written atomically, so finished shards are skipped and a shard whose
+    worker died is picked up again once its lock has not been refreshed for ``stale_after``
+    seconds; a working shard refreshes its lock after every page. A shard
+    with a failed page is left unfinished for a later run to retry.
+
+    Args:
+        directory (str): Run directory written by ``plan_shards``.
+        api_key (str, optional): USAJobs API key; not needed when ``harvester`` or ``client`` is given.
+        email (str, optional): USAJobs API email User-Agent.
+        harvester (USAJobsHarvester, optional): Harvester to fetch pages with.
+        client (USAJobsClient, optional): Client for the default harvester.
+        max_shards (int, optional): Stop after finishing this many shards.
+        stale_after (float): Seconds after which another worker's lock is considered abandoned.
+
+    Returns:
+        list[str]: IDs of the shards this call finished.
+    """
+    manifest = read_manifest(directory)
+    _check_model(manifest)
+    with _harvester_scope(harvester, api_key, email, client,
+                          results_per_page=manifest['results_per_page']) as harvester:
+        if harvester.results_per_page != manifest['results_per_page']:
+            raise ValueError(f"The shards were planned with {manifest['results_per_page']} results per page, "
+                             f"not {harvester.results_per_page}.")
+        finished = []
+        for shard in manifest['shards']:
+            if max_shards is not None and len(finished) >= max_shards:
+                break
+            result = _shard_path(directory, shard, '.pkl')
+            if os.path.exists(result):
+                continue
+            lock = _ShardLock(_shard_path(directory, shard, '.lock'), stale_after)
+            if not lock.acquire():
+                continue
+            try:
+                if os.path.exists(result):
+                    continue
+                scored = _score_shard(manifest, harvester, shard, lock)
+                tmp = f'{result}.{uuid.uuid4().hex}.tmp'
+                scored.to_pickle(tmp)
+                os.replace(tmp, result)
+                finished.append(shard['id'])
+                event('shards.finished', rows=len(scored))
+                logger.debug("Finished shard %s (%d postings)", shard['id'], len(scored))
+            except Exception as exc:
+                event('shards.failed')
+                logger.warning("Shard %s failed: %s", shard['id'], exc)
+            finally:
+                lock.release()
+    return finished
+
+
+def _run_shards_worker(directory, api_key, email, harvester_kwargs, client_kwargs, stale_after):
+    with USAJobsClient(api_key, email, **client_kwargs) as client:
+        harvester = USAJobsHarvester(client=client, **harvester_kwargs)
+        return run_shards(directory, harvester=harvester, stale_after=stale_after)
+
+
+def run_shards_parallel(directory, api_key=None, email=None, processes=None, requests_per_second=10.0,
+                        max_workers=8, stale_after=3600, **client_kwargs):
+    """
+    Run ``run_shards`` in ``processes`` local worker processes, e.g. to test a sharded run on one machine.
+
+    ``requests_per_second`` is the limit for all processes together. ``client_kwargs``
+    (e.g. ``base_url`` or a ``cache`` path) are passed to each process's ``USAJobsClient``.
+
+    Returns:
+        list[str]: IDs of the shards finished by all processes.
+    """
+    processes = processes or os.cpu_count() or 1
+    manifest = read_manifest(directory)
+    harvester_kwargs = {
+        'max_workers': max_workers,
+        'requests_per_second': requests_per_second / processes if requests_per_second else None,
+        'results_per_page': manifest['results_per_page'],
+    }
+    initargs = (MODEL_REGISTRY.model_path, MODEL_REGISTRY.mmap_mode, manifest['use_cases'])
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=initargs) as executor:
+        futures = [
+            executor.submit(_run_shards_worker, directory, api_key, email, harvester_kwargs, client_kwargs,
+                            stale_after)
+            for _ in range(processes)
+        ]
+        return [shard_id for future in futures for shard_id in future.result()]
+
+
+def shard_status(directory):
+    """
+    Progress of a sharded run.
+
+    Returns:
+        dict: Counts of ``shards``, ``finished``, ``running`` (locked) and ``pending`` shards,
+        plus the IDs of the unfinished ones.
+    """
+    manifest = read_manifest(directory)
+    finished, running, pending = [], [], []
+    for shard in manifest['shards']:
+        if os.path.exists(_shard_path(directory, shard, '.pkl')):
+            finished.append(shard['id'])
+        elif os.path.exists(_shard_path(directory, shard, '.lock')):
+            running.append(shard['id'])
+        else:
+            pending.append(shard['id'])
+    return {'shards': len(manifest['shards']), 'finished': len(finished), 'running': len(running),
+            'pending': len(pending), 'running_ids': running, 'pending_ids': pending}
+
+
+# ------------------------
+# Merge
+# ------------------------
+
+@instrumented
+def merge_shards(directory):
+    """
+    Combine every shard's scored postings into one ``ScoredCorpus``.
+
+    Postings found by several shards are deduplicated by ``MatchedObjectId``, keeping
+    the first occurrence in serial-crawl order (keyword, then page, then position), so
+    rankings match the monolithic run: ``top_by_industry`` for ``ranking='industry'``
+    equals ``fetch_top_data_buyers_by_industry_custom`` and ``top_by_use_case`` for
+    ``ranking='use_case'`` equals ``fetch_and_score_top_by_use_case_custom``.
+
+    Raises:
+        ValueError: If some shards are not finished yet, or no postings were found.
+    """
+    manifest = read_manifest(directory)
+    status = shard_status(directory)
+    if status['finished'] < status['shards']:
+        raise ValueError(f"{status['shards'] - status['finished']} of {status['shards']} shards are not "
+                         f"finished; run run_shards() on {directory!r} first.")
+
+    frames = [pd.read_pickle(_shard_path(directory, shard, '.pkl')) for shard in manifest['shards']]
+    frames = [frame for frame in frames if len(frame)]
+    if not frames:
+        raise ValueError("No jobs found.")
+    merged = pd.concat(frames, ignore_index=True)
+    merged = merged.sort_values(ORDER_COLUMNS, kind='stable').drop_duplicates('JobID', keep='first')
+    event('shards.duplicates_dropped', sum(len(frame) for frame in frames) - len(merged))
+    return ScoredCorpus(merged.drop(columns=ORDER_COLUMNS).reset_index(drop=True))
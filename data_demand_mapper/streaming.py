@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import pandas as pd
+
+from .instrumentation import instrumented
+from .toolkit import (
+    DEFAULT_SEARCH_KEYWORDS,
+    detect_use_case,
+    load_pipeline,
+    preprocess_job_batch,
+    score_frame,
+    top_n_rows,
+)
+from .usajobs import _harvester_scope
+
+# ------------------------
+# Streaming Harvest Pipeline
+# ------------------------
+
+def iter_postings(api_key=None, email=None, search_keywords=None, harvester=None, client=None, verbose=False):
+    """
+    Lazily yield one raw posting record per unique ``MatchedObjectId``.
+
+    Pages are pulled from the API only as the consumer asks for more postings, so
+    at most one window of pages is held in memory at a time. Only the set of IDs
+    already seen grows with the harvest.
+
+    Yields:
+        dict: JobID, JobTitle, Agency, Department, JobDescription, KeyDuties and ApplicationCloseDate.
+    """
+    if search_keywords is None:
+        search_keywords = DEFAULT_SEARCH_KEYWORDS
+    seen = set()
+
+    with _harvester_scope(harvester, api_key, email, client) as harvester:
+        for keyword, job in harvester.iter_items(search_keywords, verbose=verbose):
+            job_id = job.get('MatchedObjectId')
+            if not job_id or job_id in seen:
+                continue
+            seen.add(job_id)
+            descriptor = job.get('MatchedObjectDescriptor', {})
+            details = descriptor.get('UserArea', {}).get('Details', {})
+            yield {
+                'JobID': job_id,
+                'JobTitle': descriptor.get('PositionTitle'),
+                'Agency': descriptor.get('OrganizationName'),
+                'Department': descriptor.get('DepartmentName'),
+                'JobDescription': details.get('JobSummary'),
+                'KeyDuties': details.get('MajorDuties', ''),
+                'ApplicationCloseDate': descriptor.get('ApplicationCloseDate'),
+            }
+
+
+def iter_features(postings, chunk_size=1000):
+    """
+    Group raw posting records into fixed-size chunks and preprocess each one.
+
+    Yields:
+        pd.DataFrame: ``preprocess_job_batch`` output for up to ``chunk_size`` postings,
+        with the JobID column carried over when present.
+    """
+    chunk = []
+    for posting in postings:
+        chunk.append(posting)
+        if len(chunk) >= chunk_size:
+            yield _preprocess_chunk(chunk)
+            chunk = []
+    if chunk:
+        yield _preprocess_chunk(chunk)
+
+
+def _preprocess_chunk(records):
+    frame = pd.DataFrame(records)
+    processed = preprocess_job_batch(frame)
+    if 'JobID' in frame.columns:
+        processed.insert(0, 'JobID', frame['JobID'].to_numpy())
+    return processed
+
+
+def score_stream(feature_chunks, pipeline=None):
+    """Add ``data_buyer_score`` to each preprocessed chunk as it arrives."""
+    pipeline = pipeline or load_pipeline()
+    for chunk in feature_chunks:
+        chunk['data_buyer_score'] = score_frame(chunk, pipeline)
+        yield chunk
+
+
+class RunningTopN:
+    """
+    Keep only the ``top_n`` highest-scoring postings per use case and per industry.
+
+    Each ``update`` merges a scored chunk into the kept rows and trims every group
+    back to ``top_n``, so memory depends on the number of groups, not the number of
+    postings. Text columns are dropped from the kept rows. Ties keep the posting
+    seen first.
+
+    Args:
+        top_n (int): Rows kept per group.
+    """
+
+    KEPT_COLUMNS = ['JobID', 'JobTitle', 'Agency', 'Industry', 'data_buyer_score', 'DetectedUseCase']
+
+    def __init__(self, top_n=100):
+        self.top_n = top_n
+        self.rows_seen = 0
+        self.use_cases = {}
+        self.industries = {}
+
+    def _merge(self, current, incoming):
+        merged = incoming if current is None else pd.concat([current, incoming], ignore_index=True)
+        return top_n_rows(merged, self.top_n)
+
+    def update(self, scored):
+        self.rows_seen += len(scored)
+        scored = scored.copy()
+        scored['DetectedUseCase'] = detect_use_case(scored)
+        use_case_columns = [col for col in scored.columns if col.startswith('UseCase_')]
+        slim = scored[[col for col in self.KEPT_COLUMNS + use_case_columns if col in scored.columns]]
+
+        for col in use_case_columns:
+            name = col.replace('UseCase_', '')
+            self.use_cases[name] = self._merge(self.use_cases.get(name), slim[slim[col] == 1])
+        for industry, group in slim.groupby(slim['Industry'].str.lower(), sort=False):
+            self.industries[industry] = self._merge(self.industries.get(industry), group)
+        return self
+
+    def top_by_use_case(self, use_case="Fraud"):
+        use_case_column = f"UseCase_{use_case}"
+        if use_case not in self.use_cases:
+            raise ValueError(f"Use case '{use_case}' not available.")
+        return self.use_cases[use_case][['JobTitle', 'Agency', 'data_buyer_score', use_case_column]]
+
+    def top_by_industry(self, industry_name="Medical"):
+        kept = self.industries.get(industry_name.lower())
+        if kept is None:
+            return pd.DataFrame(columns=['JobTitle', 'Agency', 'data_buyer_score', 'DetectedUseCase'])
+        return kept[['JobTitle', 'Agency', 'data_buyer_score', 'DetectedUseCase']]
+
+
+@instrumented
+def stream_top_buyers(api_key, email, top_n=100, search_keywords=None, chunk_size=1000,
+                      harvester=None, client=None, pipeline=None):
+    """
+    Harvest, preprocess and score postings chunk by chunk, keeping only running top-N lists.
+
+    Peak memory stays flat however many postings are harvested: one chunk of
+    postings plus ``top_n`` rows per use case and industry.
+
+    Returns:
+        RunningTopN: Query it with ``top_by_use_case`` or ``top_by_industry``.
+    """
+    tracker = RunningTopN(top_n)
+    postings = iter_postings(api_key, email, search_keywords, harvester=harvester, client=client)
+    for scored in score_stream(iter_features(postings, chunk_size), pipeline):
+        tracker.update(scored)
+    if tracker.rows_seen == 0:
+        raise ValueError("No jobs found.")
+    return tracker
@@ -1,216 +1,671 @@
 #!/usr/bin/env python
 # coding: utf-8
 
-import pandas as pd
+import functools
+import hashlib
+import json
+import os
 import re
-import requests
-import joblib
-from rapidfuzz import fuzz, process
-import importlib.resources
+import threading
+import time
 import warnings
-from sklearn.exceptions import InconsistentVersionWarning
-import joblib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# joblib, rapidfuzz, scipy and scikit-learn are imported inside the functions that
+# need them, so importing the toolkit does not pay for them up front.
+
+from . import transform_cache as _transform_cache
+from .dedupe import duplicate_groups
+from .instrumentation import event, instrumented, logger, observe, timer
+from .postings import CompactPostings, ScoredCorpus, _join_text
+from .transform_cache import _transform_input_columns
+from .usajobs import _client_scope, _harvester_scope
 
 # ------------------------
 # Helper to Load Pipeline
 # ------------------------
 
-def load_pipeline():
+MODEL_FILENAME = 'nlp_pipeline_with_smote.joblib'
+
+
+def _packaged_model_path():
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), MODEL_FILENAME)
+
+
+class ModelRegistry:
+    """
+    Process-wide holder for the scoring pipeline.
+
+    The pipeline is deserialized lazily on first use and then shared by every scoring
+    function, so a batch of N jobs pays for one ``joblib.load`` instead of N. Loading is
+    guarded by a lock, so concurrent callers never load the artifact twice.
+
+    Args:
+        model_path (str, optional): Path to a joblib pipeline; defaults to the packaged model.
+        mmap_mode (str, optional): Passed to ``joblib.load`` (e.g. "r") so the model's numpy
+            arrays are memory-mapped and shared between worker processes.
+    """
+
+    def __init__(self, model_path=None, mmap_mode=None):
+        self._lock = threading.Lock()
+        self._pipeline = None
+        self._fingerprint = None
+        self.model_path = model_path
+        self.mmap_mode = mmap_mode
+
+    @property
+    def loaded(self):
+        return self._pipeline is not None
+
+    @property
+    def resolved_path(self):
+        return self.model_path or _packaged_model_path()
+
+    def _check_artifact(self):
+        if os.path.exists(self.resolved_path):
+            return
+        if self.model_path is None:
+            raise FileNotFoundError(
+                f"No model found at {self.resolved_path}: this install does not include the trained "
+                f"pipeline. Point load_pipeline(model_path=...) at a joblib artifact, or build one with "
+                f"`data-demand-mapper train` (see train_pipeline)."
+            )
+        raise FileNotFoundError(f"No model found at {self.resolved_path}.")
+
+    def configure(self, model_path=None, mmap_mode=None):
+        """Point the registry at a different artifact; it is loaded on next use."""
+        with self._lock:
+            self.model_path = model_path
+            self.mmap_mode = mmap_mode
+            self._pipeline = None
+            self._fingerprint = None
+
+    def _load(self):
+        # Imported here so that preprocessing and compiled scoring work without scikit-learn
+        import joblib
+        from sklearn.exceptions import InconsistentVersionWarning
+
+        self._check_artifact()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", InconsistentVersionWarning)
+            warnings.simplefilter("ignore", UserWarning)
+            warnings.simplefilter("ignore", FutureWarning)
+            with timer('model.load', path=self.resolved_path):
+                pipeline = joblib.load(self.resolved_path, mmap_mode=self.mmap_mode)
+        self._fingerprint = None
+        return pipeline
+
+    @property
+    def fingerprint(self):
+        """SHA-256 of the artifact file, used to invalidate anything derived from the model."""
+        if self._fingerprint is None:
+            self._check_artifact()
+            digest = hashlib.sha256()
+            with open(self.resolved_path, 'rb') as handle:
+                for block in iter(lambda: handle.read(1 << 20), b''):
+                    digest.update(block)
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def get(self):
+        pipeline = self._pipeline
+        if pipeline is None:
+            with self._lock:
+                if self._pipeline is None:
+                    self._pipeline = self._load()
+                pipeline = self._pipeline
+        return pipeline
+
+    def warmup(self):
+        """Load the pipeline now (e.g. at worker start-up) instead of on the first score."""
+        return self.get()
+
+    def reload(self):
+        """Re-read the artifact from disk, e.g. after it was retrained."""
+        with self._lock:
+            self._pipeline = self._load()
+            return self._pipeline
+
+
+MODEL_REGISTRY = ModelRegistry()
+
+
+def load_pipeline(model_path=None, mmap_mode=None):
     """
     Loads the trained NLP pipeline model from inside the package (nlp_pipeline_with_smote.joblib),
     suppressing version mismatch warnings at the point of load.
+
+    The artifact is not part of the repository; when it is missing, pass ``model_path``
+    or train one with ``train_pipeline`` / ``data-demand-mapper train``.
+
+    The pipeline is loaded once per process and reused on later calls. Passing
+    ``model_path`` or ``mmap_mode`` switches the shared pipeline to that artifact.
+    """
+    if (model_path, mmap_mode) != (None, None) and (model_path, mmap_mode) != (
+        MODEL_REGISTRY.model_path, MODEL_REGISTRY.mmap_mode
+    ):
+        MODEL_REGISTRY.configure(model_path=model_path, mmap_mode=mmap_mode)
+    return MODEL_REGISTRY.get()
+
+
+def warmup(model_path=None, mmap_mode=None):
+    """Load the shared pipeline ahead of the first scoring call."""
+    return load_pipeline(model_path=model_path, mmap_mode=mmap_mode)
+
+
+def reload_pipeline():
+    """Force the shared pipeline to be re-read from disk."""
+    return MODEL_REGISTRY.reload()
+
+
+# ------------------------
+# Phrase Matching
+# ------------------------
+
+def _trie_pattern(phrases):
+    """Build a regex body from a character trie so shared prefixes are only tested once."""
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def emit(node):
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Greedy optional group: the longest phrase at a position is tried first
+        return '(?:' + body + ')?' if '' in node else body
+
+    return emit(trie)
+
+
+class PhraseMatcher:
+    """
+    Match many named phrase groups against text in a single scan.
+
+    All phrases of all groups are compiled into one trie-shaped regular expression.
+    A zero-width lookahead tries it at every position, so overlapping hits from
+    different groups are all reported. Only the longest phrase is returned per
+    position; the groups of any shorter phrase that is a prefix of it are folded in
+    when the matcher is compiled.
+
+    Args:
+        groups (dict, optional): Mapping of group name to a list of phrases.
     """
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore", InconsistentVersionWarning)
-        warnings.simplefilter("ignore", UserWarning)
-        warnings.simplefilter("ignore", FutureWarning)
-        
-        with importlib.resources.path('data_buyer_toolkit', 'nlp_pipeline_with_smote.joblib') as model_path:
-            pipeline = joblib.load(model_path)
-    
-    return pipeline
+
+    def __init__(self, groups=None):
+        self._groups = {}
+        self._compiled = None
+        self._lock = threading.Lock()
+        for name, phrases in (groups or {}).items():
+            self.register(name, phrases)
+
+    @property
+    def group_names(self):
+        return list(self._groups)
+
+    def register(self, name, phrases):
+        """Add or replace a phrase group; the combined pattern is rebuilt on next use."""
+        with self._lock:
+            self._groups[name] = [phrase.lower() for phrase in phrases]
+            self._compiled = None
+
+    def _compile(self):
+        with self._lock:
+            if self._compiled is None:
+                owners = {}
+                for index, phrases in enumerate(self._groups.values()):
+                    for phrase in phrases:
+                        owners.setdefault(phrase, set()).add(index)
+                # Every registered phrase that is a prefix of a match also matched there
+                hit_groups = {
+                    phrase: sorted(set().union(*(groups for other, groups in owners.items() if phrase.startswith(other))))
+                    for phrase in owners
+                }
+                regex = re.compile('(?=(' + _trie_pattern(owners) + '))', re.IGNORECASE) if owners else None
+                self._compiled = (regex, hit_groups, len(self._groups))
+            return self._compiled
+
+    def find_groups(self, text):
+        """Return the names of every group with at least one phrase in ``text``."""
+        hits = self.match_matrix([text])[0]
+        return [name for name, hit in zip(self._groups, hits) if hit]
+
+    def match_matrix(self, texts):
+        """
+        Scan each text once and flag every group it hits.
+
+        Args:
+            texts (iterable of str): Texts to scan; non-strings never match.
+
+        Returns:
+            np.ndarray: A ``(len(texts), len(group_names))`` uint8 array.
+        """
+        regex, hit_groups, n_groups = self._compile()
+        texts = list(texts)
+        matrix = np.zeros((len(texts), n_groups), dtype=np.uint8)
+        if regex is None:
+            return matrix
+        for row, text in enumerate(texts):
+            if not isinstance(text, str):
+                continue
+            for phrase in set(regex.findall(text)):
+                matrix[row, hit_groups[phrase.lower()]] = 1
+        return matrix
+
+    def match_frame(self, texts, index=None):
+        """Same as ``match_matrix`` but returned as an int dataframe with one column per group."""
+        return pd.DataFrame(self.match_matrix(texts).astype(int), columns=self.group_names, index=index)
+
+    def first_group(self, texts, default=None):
+        """Return, per text, the first group in registration order that it hits."""
+        names = np.array(self.group_names + [default], dtype=object)
+        matrix = self.match_matrix(texts)
+        if matrix.shape[1] == 0:
+            return names[np.zeros(len(matrix), dtype=int)]
+        first = np.where(matrix.any(axis=1), matrix.argmax(axis=1), len(names) - 1)
+        return names[first]
+
 # ------------------------
 # Preprocessing Function
 # ------------------------
 
-def preprocess_job_api_response(job_json):
+RELATED_PHRASES = [
+    "data acquisition", "data procurement", "procure data", "purchase data",
+    "buy data", "acquiring data", "data sourcing", "data licensing",
+    "external data acquisition", "third-party data", "data vendor",
+    "data provider", "data contracts", "contracting data", "data subscriptions",
+    "vendor management", "external data", "commercial data"
+]
+
+SIGNAL_PHRASES = [
+    "data acquisition", "data procurement", "procure data", "purchase data",
+    "buy data", "acquiring data", "data sourcing", "data licensing",
+    "external data", "third-party data", "data vendor", "data provider",
+    "data contracts", "contracting data", "data subscriptions", "vendor management",
+    "commercial data", "data assets", "data commercialization",
+    "procurement of data", "external data sources", "data aggregators",
+    "data monetization", "sourcing external data", "partner data", "data purchasing agreements",
+    "data ingestion", "subscription data", "data acquisition strategy", "data buying",
+    "external datasets", "external partnerships", "data sharing agreements",
+    "data acquisition channels", "third-party data sources", "sourcing data providers",
+    "managing data vendors", "data reseller", "external data vendors", "contracted data"
+]
+
+LARGE_AGENCIES = [
+    "Department of Defense", "Department of Veterans Affairs", "Department of the Treasury",
+    "Department of Homeland Security", "Department of Health and Human Services",
+    "Department of Justice", "Department of the Army"
+]
+
+MEDIUM_AGENCIES = [
+    "Department of Transportation", "Department of Commerce", "Department of Agriculture",
+    "Department of Energy", "Department of the Interior", "National Aeronautics and Space Administration"
+]
+
+# Checked in order; the first industry whose keywords appear in "title agency" wins.
+INDUSTRY_KEYWORDS = {
+    'Finance': ['finance', 'financial', 'account', 'budget'],
+    'Marketing': ['marketing', 'communications', 'advertising'],
+    'Medical': ['medical', 'health', 'clinical', 'pharmacy', 'nurse'],
+    'Security/Tech': ['cyber', 'security', 'software', 'data scientist', 'tech', 'information technology'],
+    'Policy': ['policy', 'regulation', 'legislative', 'compliance', 'analyst'],
+}
+
+SENIOR_ROLE_PATTERN = r'\bsenior\b|\blead\b|\bchief\b|\bprincipal\b|\bdirector\b|\bhead\b'
+
+DATA_KEYWORDS = ['data', 'analyst', 'scientist', 'analytics', 'statistician', 'intelligence', 'information', 'it']
+
+USE_CASE_KEYWORDS = {
+    'Fraud': ['fraud', 'eligibility', 'verification', 'audit', 'compliance'],
+    'Sentiment': ['sentiment', 'public opinion', 'media monitoring', 'engagement', 'communication'],
+    'PatientMatching': ['patient match', 'interoperability', 'record linkage', 'ehr', 'health record'],
+    'AdTargeting': ['audience segmentation', 'targeting', 'ad performance', 'campaign data']
+}
+
+GENERALIST_TITLES = [
+    'Contract Specialist', 'Grants Officer', 'Grants Specialist', 'Budget Officer',
+    'Administrative Officer', 'Operations Coordinator', 'Program Coordinator',
+    'Project Coordinator', 'Procurement Specialist', 'Procurement Analyst',
+    'Communications Specialist', 'Public Affairs Officer', 'Public Information Officer',
+    'Community Outreach Coordinator', 'Health IT Coordinator', 'Program Specialist',
+    'Program Manager', 'Business Operations Specialist'
+]
+
+COLUMNS_FOR_MODEL = [
+    'JobTitle', 'Agency', 'CombinedText',
+    'IsDataBuyer', 'IsFuzzyMatch', 'IsLikelyDataBuyer',
+    'AgencySize', 'Industry', 'IsSeniorRole',
+    'IsExplicitDataJob', 'UseCase_Fraud', 'UseCase_Sentiment',
+    'UseCase_PatientMatching', 'UseCase_AdTargeting', 'IsGeneralistRole'
+]
+
+RAW_POSTING_COLUMNS = ['JobTitle', 'Agency', 'JobDescription', 'KeyDuties']
+
+# Compiled once and shared by every call; see register_use_case to extend them.
+TEXT_MATCHER = PhraseMatcher({'IsDataBuyer': RELATED_PHRASES})
+for _use_case, _keywords in USE_CASE_KEYWORDS.items():
+    TEXT_MATCHER.register(f'UseCase_{_use_case}', _keywords)
+INDUSTRY_MATCHER = PhraseMatcher(INDUSTRY_KEYWORDS)
+SENIOR_ROLE_RE = re.compile(SENIOR_ROLE_PATTERN)
+DATA_KEYWORDS_RE = re.compile('|'.join(DATA_KEYWORDS))
+
+
+def register_use_case(use_case, keywords):
     """
-    Preprocess a single job JSON response into a model-ready dataframe.
+    Register a custom use case so every preprocessing call emits a ``UseCase_<name>`` flag.
 
     Args:
-        job_json (dict): A single job's JSON dictionary from USAJobs API.
+        use_case (str): Use case name, e.g. "Benefits".
+        keywords (list[str]): Phrases that signal the use case in the posting text.
+    """
+    USE_CASE_KEYWORDS[use_case] = list(keywords)
+    TEXT_MATCHER.register(f'UseCase_{use_case}', keywords)
+
+
+def _model_columns():
+    extra = [f'UseCase_{name}' for name in USE_CASE_KEYWORDS if f'UseCase_{name}' not in COLUMNS_FOR_MODEL]
+    return COLUMNS_FOR_MODEL + extra
+
+
+def feature_fingerprint():
+    """
+    Hash of every phrase list and rule that shapes the engineered columns.
+
+    Stored features computed under a different fingerprint are stale and must be
+    recomputed, e.g. after ``register_use_case`` or an edit to a keyword list.
+    """
+    schema = [
+        _model_columns(), RELATED_PHRASES, SIGNAL_PHRASES, LARGE_AGENCIES, MEDIUM_AGENCIES,
+        INDUSTRY_KEYWORDS, SENIOR_ROLE_PATTERN, DATA_KEYWORDS, USE_CASE_KEYWORDS, GENERALIST_TITLES,
+    ]
+    return hashlib.sha256(json.dumps(schema, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _descriptor_to_row(job_json):
+    details = job_json.get('UserArea', {}).get('Details', {})
+    return {
+        'JobTitle': job_json.get('PositionTitle', ''),
+        'Agency': job_json.get('OrganizationName', ''),
+        'JobDescription': _join_text(details.get('JobSummary', '')),
+        'KeyDuties': _join_text(details.get('MajorDuties', '')),
+    }
+
+
+def fuzzy_match(text, phrases, threshold=80):
+    """Return the first phrase whose partial ratio against ``text`` reaches ``threshold``."""
+    from rapidfuzz import fuzz
+
+    for phrase in phrases:
+        if fuzz.partial_ratio(phrase.lower(), text.lower()) >= threshold:
+            return phrase
+    return None
+
+
+def fuzzy_signal_match(texts, phrases=None, threshold=80, workers=1, exact_hits=None):
+    """
+    Batched version of ``fuzzy_match`` built on ``rapidfuzz.process.cdist``.
+
+    Each text gets the first phrase (in list order) whose partial ratio reaches
+    ``threshold``, exactly as ``fuzzy_match`` would return it. Texts and phrases are
+    lowercased once instead of on every comparison.
+
+    Args:
+        texts (iterable of str): Texts to score.
+        phrases (list[str], optional): Signal phrases; defaults to ``SIGNAL_PHRASES``.
+        threshold (int): Minimum ``fuzz.partial_ratio`` score for a match.
+        workers (int): Threads used by ``cdist``; -1 uses every core.
+        exact_hits (array-like of bool, optional): Rows already known to contain an exact
+            keyword (e.g. ``IsDataBuyer``). When one of those rows contains a signal phrase
+            verbatim, that phrase is guaranteed to score 100, so the row is only scored
+            against the phrases listed before it.
 
     Returns:
-        pd.DataFrame: A single-row dataframe ready for model prediction.
+        np.ndarray: Object array with the matched phrase, or None, for each text.
     """
-    title = job_json.get('PositionTitle', '')
-    agency = job_json.get('OrganizationName', '')
+    from rapidfuzz import fuzz, process
+
+    started = time.perf_counter()
+    phrases = SIGNAL_PHRASES if phrases is None else list(phrases)
+    lowered_phrases = [phrase.lower() for phrase in phrases]
+    texts = [text.lower() for text in texts]
+    matched = np.full(len(texts), None, dtype=object)
+
+    # Index of the first phrase each row contains verbatim (len(phrases) if none or unknown)
+    verbatim = np.full(len(texts), len(phrases))
+    if exact_hits is not None:
+        for row in np.flatnonzero(np.asarray(exact_hits, dtype=bool)):
+            verbatim[row] = next(
+                (index for index, lowered in enumerate(lowered_phrases) if lowered in texts[row]), len(phrases)
+            )
+
+    # Phrase-major order: rows leave the pool at their first hit, just like the
+    # early return in fuzzy_match, so later phrases only score unmatched rows.
+    pending = np.arange(len(texts))
+    for index, (phrase, lowered) in enumerate(zip(phrases, lowered_phrases)):
+        settled = verbatim[pending] == index
+        matched[pending[settled]] = phrase
+        pending = pending[~settled]
+        if not len(pending):
+            break
+        scores = process.cdist(
+            [lowered], [texts[row] for row in pending],
+            scorer=fuzz.partial_ratio, score_cutoff=threshold, workers=workers
+        )[0]
+        hit = scores >= threshold
+        matched[pending[hit]] = phrase
+        pending = pending[~hit]
+
+    observe('fuzzy', time.perf_counter() - started, len(texts))
+    return matched
+
+
+def is_generalist(title):
+    if not isinstance(title, str) or not title:
+        return False
+    from rapidfuzz import fuzz, process
+
+    match, score, _ = process.extractOne(title, GENERALIST_TITLES, scorer=fuzz.partial_ratio)
+    return score >= 65
 
-    desc = job_json.get('UserArea', {}).get('Details', {}).get('JobSummary', '')
-    duties = job_json.get('UserArea', {}).get('Details', {}).get('MajorDuties', '')
 
-    if isinstance(desc, list):
-        desc = ' '.join(desc)
-    if isinstance(duties, list):
-        duties = ' '.join(duties)
+# ------------------------
+# Title Feature Cache
+# ------------------------
 
-    df = pd.DataFrame([{
-        'JobTitle': title,
-        'Agency': agency,
-        'JobDescription': desc,
-        'KeyDuties': duties
-    }])
+TITLE_CACHE_SIZE = 65536
 
-    # Combined text
-    df['CombinedText'] = (df['JobDescription'].fillna('') + ' ' + df['KeyDuties'].fillna('')).str.lower()
 
-    # Direct keyword match
-    related_phrases = [
-        "data acquisition", "data procurement", "procure data", "purchase data",
-        "buy data", "acquiring data", "data sourcing", "data licensing",
-        "external data acquisition", "third-party data", "data vendor",
-        "data provider", "data contracts", "contracting data", "data subscriptions",
-        "vendor management", "external data", "commercial data"
-    ]
-    pattern = '|'.join(map(re.escape, related_phrases))
-    df['IsDataBuyer'] = df['CombinedText'].str.contains(pattern, case=False, na=False).astype(int)
-
-    # Fuzzy match
-    signal_phrases = [
-        "data acquisition", "data procurement", "procure data", "purchase data",
-        "buy data", "acquiring data", "data sourcing", "data licensing",
-        "external data", "third-party data", "data vendor", "data provider",
-        "data contracts", "contracting data", "data subscriptions", "vendor management",
-        "commercial data", "data assets", "data commercialization",
-        "procurement of data", "external data sources", "data aggregators",
-        "data monetization", "sourcing external data", "partner data", "data purchasing agreements",
-        "data ingestion", "subscription data", "data acquisition strategy", "data buying",
-        "external datasets", "external partnerships", "data sharing agreements",
-        "data acquisition channels", "third-party data sources", "sourcing data providers",
-        "managing data vendors", "data reseller", "external data vendors", "contracted data"
-    ]
+def _title_flags(title):
+    """(IsSeniorRole, IsExplicitDataJob, IsGeneralistRole) for one exact title string."""
+    if not isinstance(title, str):
+        return False, 0, False
+    lowered = title.lower()
+    return (
+        SENIOR_ROLE_RE.search(lowered) is not None,
+        int(DATA_KEYWORDS_RE.search(lowered) is not None),
+        is_generalist(title),
+    )
+
+
+def _title_industry(title, agency):
+    return INDUSTRY_MATCHER.first_group([f"{title} {agency}".lower()], default='Other')[0]
+
+
+def set_title_cache_size(maxsize=TITLE_CACHE_SIZE):
+    """
+    (Re)create the process-wide LRU caches for title-level features.
+
+    Titles repeat heavily across USAJobs harvests, so IsSeniorRole, IsExplicitDataJob,
+    IsGeneralistRole and Industry are computed once per distinct title (Industry per
+    distinct title and agency pair) and reused across calls. Resizing drops the cache.
+
+    Args:
+        maxsize (int | None): Maximum entries per cache; None means unbounded.
+    """
+    global _cached_title_flags, _cached_title_industry
+    _cached_title_flags = functools.lru_cache(maxsize=maxsize)(_title_flags)
+    _cached_title_industry = functools.lru_cache(maxsize=maxsize)(_title_industry)
+
+
+def clear_title_cache():
+    _cached_title_flags.cache_clear()
+    _cached_title_industry.cache_clear()
 
-    def fuzzy_match(text, phrases, threshold=80):
-        for phrase in phrases:
-            if fuzz.partial_ratio(phrase.lower(), text.lower()) >= threshold:
-                return phrase
-        return None
 
-    df['FuzzyMatchedPhrase'] = df['CombinedText'].apply(lambda x: fuzzy_match(x, signal_phrases))
+def title_cache_info():
+    """
+    Report hit and miss counts for the title feature caches.
+
+    Returns:
+        dict: hits, misses, currsize, maxsize and hit_rate for the ``flags`` and ``industry`` caches.
+    """
+    info = {}
+    for name, cached in (('flags', _cached_title_flags), ('industry', _cached_title_industry)):
+        stats = cached.cache_info()
+        lookups = stats.hits + stats.misses
+        info[name] = {
+            'hits': stats.hits,
+            'misses': stats.misses,
+            'currsize': stats.currsize,
+            'maxsize': stats.maxsize,
+            'hit_rate': stats.hits / lookups if lookups else 0.0,
+        }
+    return info
+
+
+set_title_cache_size()
+
+
+def preprocess_job_batch(jobs, fuzzy_threshold=80, fuzzy_workers=1, near_duplicates=False):
+    """
+    Preprocess many job postings at once into a model-ready dataframe.
+
+    Every feature column is computed column-wise over the whole batch, so the
+    result is identical to concatenating ``preprocess_job_api_response`` over
+    each posting, without building one dataframe per posting. Text features are
+    computed once per distinct text and copied to every posting that repeats it.
+
+    Args:
+        jobs (list[dict] | pd.DataFrame): Either USAJobs ``MatchedObjectDescriptor``
+            dictionaries, or a dataframe with JobTitle, Agency, JobDescription and
+            KeyDuties columns (as built by the harvest functions).
+        fuzzy_threshold (int): Minimum partial ratio for a signal phrase to count as a fuzzy match.
+        fuzzy_workers (int): Threads used for fuzzy scoring; -1 uses every core.
+        near_duplicates (bool): Also collapse near-identical texts (see ``duplicate_groups``).
+            Each posting then takes the text, text features and score of the first
+            posting in its group, so results are approximate.
+
+    Returns:
+        pd.DataFrame: One row per posting with the ``COLUMNS_FOR_MODEL`` columns, plus a
+        ``UseCase_<name>`` column for every use case added with ``register_use_case``.
+    """
+    started = time.perf_counter()
+    if isinstance(jobs, pd.DataFrame):
+        missing = [col for col in RAW_POSTING_COLUMNS if col not in jobs.columns]
+        if missing:
+            raise ValueError(f"Missing required columns: {missing}")
+        df = jobs[RAW_POSTING_COLUMNS].copy()
+        for col in ('JobDescription', 'KeyDuties'):
+            df[col] = [_join_text(value) for value in df[col]]
+    else:
+        df = pd.DataFrame([_descriptor_to_row(job) for job in jobs], columns=RAW_POSTING_COLUMNS, dtype=object)
+
+    if df.empty:
+        return pd.DataFrame(columns=_model_columns())
+
+    # Combined text
+    df['CombinedText'] = (df['JobDescription'].fillna('') + ' ' + df['KeyDuties'].fillna('')).str.lower()
+
+    # Collapse repeated announcements; duplicates share one text object from here on
+    representatives, inverse = duplicate_groups(df['CombinedText'], near_duplicates=near_duplicates)
+    texts = df['CombinedText'].to_numpy(dtype=object)[representatives]
+    collapsed = len(df) - len(texts)
+    if collapsed:
+        event('dedupe.text_rows_collapsed', collapsed, rows=len(df))
+        logger.debug("Collapsed %d of %d postings onto %d distinct texts", collapsed, len(df), len(texts))
+        df['CombinedText'] = texts[inverse]
+
+    # Direct keyword and use case matches, one scan per distinct text
+    unique_hits = TEXT_MATCHER.match_frame(texts)
+    text_hits = unique_hits.iloc[inverse].set_axis(df.index)
+    df['IsDataBuyer'] = text_hits['IsDataBuyer']
+
+    # Fuzzy match, skipping rows the exact keyword match already settled
+    df['FuzzyMatchedPhrase'] = fuzzy_signal_match(
+        texts, threshold=fuzzy_threshold, workers=fuzzy_workers,
+        exact_hits=unique_hits['IsDataBuyer'].to_numpy() == 1
+    )[inverse]
     df['IsFuzzyMatch'] = df['FuzzyMatchedPhrase'].notnull().astype(int)
 
     # Likely buyer if either is true
     df['IsLikelyDataBuyer'] = ((df['IsDataBuyer'] == 1) | (df['IsFuzzyMatch'] == 1)).astype(int)
 
     # Agency size
-    large_agencies = [
-        "Department of Defense", "Department of Veterans Affairs", "Department of the Treasury",
-        "Department of Homeland Security", "Department of Health and Human Services",
-        "Department of Justice", "Department of the Army"
-    ]
-    medium_agencies = [
-        "Department of Transportation", "Department of Commerce", "Department of Agriculture",
-        "Department of Energy", "Department of the Interior", "National Aeronautics and Space Administration"
+    df['AgencySize'] = np.select(
+        [df['Agency'].isin(LARGE_AGENCIES), df['Agency'].isin(MEDIUM_AGENCIES)],
+        ['Large', 'Medium'],
+        default='Small'
+    )
+
+    # Industry classifier, once per distinct title and agency
+    df['Industry'] = [
+        _cached_title_industry(title, agency) for title, agency in zip(df['JobTitle'], df['Agency'])
     ]
 
-    def classify_agency(agency_name):
-        if agency_name in large_agencies:
-            return 'Large'
-        elif agency_name in medium_agencies:
-            return 'Medium'
-        else:
-            return 'Small'
-
-    df['AgencySize'] = df['Agency'].apply(classify_agency).fillna('Unknown')
-
-    # Industry classifier
-    def classify_industry(row):
-        text = f"{row['JobTitle']} {row['Agency']}".lower()
-        if any(word in text for word in ['finance', 'financial', 'account', 'budget']):
-            return 'Finance'
-        if any(word in text for word in ['marketing', 'communications', 'advertising']):
-            return 'Marketing'
-        if any(word in text for word in ['medical', 'health', 'clinical', 'pharmacy', 'nurse']):
-            return 'Medical'
-        if any(word in text for word in ['cyber', 'security', 'software', 'data scientist', 'tech', 'information technology']):
-            return 'Security/Tech'
-        if any(word in text for word in ['policy', 'regulation', 'legislative', 'compliance', 'analyst']):
-            return 'Policy'
-        return 'Other'
-
-    df['Industry'] = df.apply(classify_industry, axis=1)
-
-    # Senior role
-    df['IsSeniorRole'] = df['JobTitle'].str.lower().str.contains(r'\bsenior\b|\blead\b|\bchief\b|\bprincipal\b|\bdirector\b|\bhead\b', na=False)
-
-    # Explicitly a "data" job
-    data_keywords = ['data', 'analyst', 'scientist', 'analytics', 'statistician', 'intelligence', 'information', 'it']
-    df['IsExplicitDataJob'] = df['JobTitle'].str.lower().str.contains('|'.join(data_keywords), na=False).astype(int)
+    # Senior role, explicit data job and generalist role, once per distinct title
+    title_flags = [_cached_title_flags(title) for title in df['JobTitle']]
+    df['IsSeniorRole'] = np.array([flags[0] for flags in title_flags], dtype=bool)
+    df['IsExplicitDataJob'] = np.array([flags[1] for flags in title_flags], dtype=int)
+    df['IsGeneralistRole'] = np.array([flags[2] for flags in title_flags], dtype=bool)
 
     # Use case detection
-    use_case_keywords = {
-        'Fraud': ['fraud', 'eligibility', 'verification', 'audit', 'compliance'],
-        'Sentiment': ['sentiment', 'public opinion', 'media monitoring', 'engagement', 'communication'],
-        'PatientMatching': ['patient match', 'interoperability', 'record linkage', 'ehr', 'health record'],
-        'AdTargeting': ['audience segmentation', 'targeting', 'ad performance', 'campaign data']
-    }
-    for use_case, keywords in use_case_keywords.items():
-        pattern = '|'.join(map(re.escape, keywords))
-        df[f'UseCase_{use_case}'] = df['CombinedText'].str.contains(pattern, case=False, na=False).astype(int)
-
-    # Generalist role detection
-    generalist_titles = [
-        'Contract Specialist', 'Grants Officer', 'Grants Specialist', 'Budget Officer',
-        'Administrative Officer', 'Operations Coordinator', 'Program Coordinator',
-        'Project Coordinator', 'Procurement Specialist', 'Procurement Analyst',
-        'Communications Specialist', 'Public Affairs Officer', 'Public Information Officer',
-        'Community Outreach Coordinator', 'Health IT Coordinator', 'Program Specialist',
-        'Program Manager', 'Business Operations Specialist'
-    ]
+    for use_case in USE_CASE_KEYWORDS:
+        df[f'UseCase_{use_case}'] = text_hits[f'UseCase_{use_case}']
 
-    def is_generalist(title):
-        if not title:
-            return False
-        match, score, _ = process.extractOne(title, generalist_titles, scorer=fuzz.partial_ratio)
-        return score >= 65
-
-    df['IsGeneralistRole'] = df['JobTitle'].apply(lambda x: is_generalist(x))
-
-    # Ensure all needed columns exist
-    columns_for_model = [
-        'JobTitle', 'Agency', 'CombinedText', 
-        'IsDataBuyer', 'IsFuzzyMatch', 'IsLikelyDataBuyer',
-        'AgencySize', 'Industry', 'IsSeniorRole',
-        'IsExplicitDataJob', 'UseCase_Fraud', 'UseCase_Sentiment',
-        'UseCase_PatientMatching', 'UseCase_AdTargeting', 'IsGeneralistRole'
-    ]
-    for col in columns_for_model:
-        if col not in df.columns:
-            if col == 'IsSeniorRole':
-                df[col] = False
-            elif col.startswith('UseCase') or col.startswith('Is'):
-                df[col] = 0
-            else:
-                df[col] = 'Unknown'
+    observe('preprocess', time.perf_counter() - started, len(df))
+    return df[_model_columns()]
+
+
+def preprocess_job_api_response(job_json):
+    """
+    Preprocess a single job JSON response into a model-ready dataframe.
+
+    Args:
+        job_json (dict): A single job's JSON dictionary from USAJobs API.
+
+    Returns:
+        pd.DataFrame: A single-row dataframe ready for model prediction.
+    """
+    return preprocess_job_batch([job_json])
 
-    return df[columns_for_model]
 
 # ------------------------
 # Core Job Fetch Functions
 # ------------------------
 
-def fetch_and_score_job(job_id, api_key, email):
-    headers = {"User-Agent": email, "Authorization-Key": api_key}
-    url = f"https://data.usajobs.gov/api/Search?Keyword={job_id}"
-    response = requests.get(url, headers=headers)
+DEFAULT_SEARCH_KEYWORDS = [
+    'data', 'contract', 'analyst', 'machine learning', 'marketing', 'aquisition',
+    'finance', 'security', 'tech', 'purchasing', 'statistics', 'math',
+    'data scientist', 'research', 'economist'
+]
+
+@instrumented
+def fetch_and_score_job(job_id, api_key, email, client=None):
+    with _client_scope(client, api_key, email) as client:
+        response = client.search({"Keyword": job_id})
     if response.status_code != 200:
         raise ValueError(f"Failed to fetch job ID {job_id}: {response.status_code}")
 
     job_data = response.json()['SearchResult']['SearchResultItems'][0]['MatchedObjectDescriptor']
     df_processed = preprocess_job_api_response(job_data)
-    pipeline = load_pipeline()
-    X = pipeline.named_steps['preprocessor'].transform(df_processed)
-    score = pipeline.named_steps['classifier'].predict_proba(X)[0][1]
+    score = score_frame(df_processed)[0]
 
     return {
         "data_buyer_score": round(score, 4),
@@ -218,11 +673,11 @@ def fetch_and_score_job(job_id, api_key, email):
         "agency": job_data['OrganizationName']
     }
 
-def search_job_ids_by_title(position_title, api_key, email, max_results=10):
-    headers = {"User-Agent": email, "Authorization-Key": api_key}
-    url = "https://data.usajobs.gov/api/Search"
+@instrumented
+def search_job_ids_by_title(position_title, api_key, email, max_results=10, client=None):
     params = {"Keyword": position_title, "ResultsPerPage": max_results}
-    response = requests.get(url, headers=headers, params=params)
+    with _client_scope(client, api_key, email) as client:
+        response = client.search(params)
     if response.status_code != 200:
         raise ValueError(f"Failed to search: {response.status_code}")
 
@@ -233,160 +688,233 @@ def search_job_ids_by_title(position_title, api_key, email, max_results=10):
         "agency": job['MatchedObjectDescriptor']['OrganizationName']
     } for job in jobs]
 
-def batch_fetch_and_score_jobs(job_titles, api_key, email):
-    results = []
-    for title in job_titles:
+def _first_search_descriptor(client, position_title):
+    response = client.search({"Keyword": position_title, "ResultsPerPage": 1})
+    if response.status_code != 200:
+        raise ValueError(f"Failed to search: {response.status_code}")
+    jobs = response.json()['SearchResult']['SearchResultItems']
+    return jobs[0]['MatchedObjectDescriptor'] if jobs else None
+
+
+@instrumented
+def batch_fetch_and_score_jobs(job_titles, api_key, email, client=None, max_workers=8):
+    """
+    Search each title and score its top posting, in one Search request per distinct title.
+
+    The descriptor returned by the title search is scored directly instead of being fetched
+    again by PositionID. Searches run concurrently, and all found postings are scored in one
+    batch.
+
+    Args:
+        job_titles (list[str]): Titles or keywords to search; repeats are searched once.
+        max_workers (int): Concurrent Search requests.
+
+    Returns:
+        pd.DataFrame: One row per distinct title, in input order, with query, data_buyer_score,
+        title, agency, job_id, status ("ok", "not_found" or "error") and error.
+    """
+    queries = list(dict.fromkeys(job_titles))
+    with _client_scope(client, api_key, email) as client, \
+            ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(queries)))) as pool:
+        searches = [pool.submit(_first_search_descriptor, client, query) for query in queries]
+
+    rows, found = [], []
+    for query, search in zip(queries, searches):
+        row = {"query": query, "data_buyer_score": np.nan, "title": None, "agency": None, "job_id": None,
+               "status": "ok", "error": None}
+        rows.append(row)
         try:
-            search_results = search_job_ids_by_title(title, api_key, email, max_results=1)
-            if search_results:
-                job_id = search_results[0]['job_id']
-                results.append(fetch_and_score_job(job_id, api_key, email))
+            job_data = search.result()
         except Exception as e:
-            print(f"Error processing {title}: {e}")
-    return pd.DataFrame(results)
+            logger.debug("Error processing %s: %s", query, e)
+            row.update(status="error", error=str(e))
+            continue
+        if job_data is None:
+            row["status"] = "not_found"
+            continue
+        row.update(title=job_data.get('PositionTitle'), agency=job_data.get('OrganizationName'),
+                   job_id=job_data.get('PositionID'))
+        found.append((len(rows) - 1, job_data))
+
+    if found:
+        try:
+            scores = score_frame(preprocess_job_batch([job_data for _, job_data in found]))
+            for (position, _), score in zip(found, scores):
+                rows[position]["data_buyer_score"] = round(score, 4)
+        except Exception as e:
+            logger.debug("Error scoring batch: %s", e)
+            for position, _ in found:
+                rows[position].update(status="error", error=str(e))
+
+    return pd.DataFrame(rows, columns=["query", "data_buyer_score", "title", "agency", "job_id", "status", "error"])
 
 # ------------------------
-# USAJobs Live Search and Score Functions Use Case
+# Shared Scoring Step
 # ------------------------
 
-def fetch_and_score_top_by_use_case_auto(api_key, email, use_case="Fraud", top_n=100):
-    headers = {"User-Agent": email, "Authorization-Key": api_key}
-    keywords = [
-        'data', 'contract', 'analyst', 'machine learning', 'marketing', 'aquisition',
-        'finance', 'security', 'tech', 'purchasing', 'statistics', 'math', 
-        'data scientist', 'research', 'economist'
-    ]
-    url = "https://data.usajobs.gov/api/Search"
-    all_jobs = {}
-
-    for keyword in keywords:
-        params = {'Keyword': keyword, 'ResultsPerPage': 500, 'Page': 1}
-        while True:
-            response = requests.get(url, headers=headers, params=params)
-            if response.status_code != 200:
-                break
-            jobs = response.json().get('SearchResult', {}).get('SearchResultItems', [])
-            if not jobs:
-                break
-            for job in jobs:
-                job_id = job.get('MatchedObjectId')
-                if job_id and job_id not in all_jobs:
-                    descriptor = job['MatchedObjectDescriptor']
-                    details = descriptor.get('UserArea', {}).get('Details', {})
-                    all_jobs[job_id] = {
-                        'JobTitle': descriptor.get('PositionTitle'),
-                        'JobDescription': details.get('JobSummary'),
-                        'KeyDuties': details.get('MajorDuties', ''),
-                        'Agency': descriptor.get('OrganizationName')
-                    }
-            params['Page'] += 1
-
-    df = pd.DataFrame(all_jobs.values())
-    if df.empty:
-        raise ValueError("No jobs found.")
+def score_frame(df_processed, pipeline=None, transform_cache=None):
+    """
+    Return ``data_buyer_score`` for an already preprocessed frame.
 
-    processed = [preprocess_job_api_response({
-        'PositionTitle': row['JobTitle'],
-        'OrganizationName': row['Agency'],
-        'UserArea': {'Details': {'JobSummary': row['JobDescription'], 'MajorDuties': row['KeyDuties']}}
-    }) for _, row in df.iterrows()]
+    Postings with identical model inputs are transformed and scored once. When a
+    transform cache is enabled (or passed) and the shared pipeline is used,
+    postings whose model inputs were transformed before skip the TF-IDF vectorizer.
+    """
+    pipeline = pipeline or load_pipeline()
+    cache = transform_cache if transform_cache is not None else _transform_cache.TRANSFORM_CACHE
+    preprocessor = pipeline.named_steps['preprocessor']
+    with timer('score', rows=len(df_processed)):
+        if not len(df_processed):
+            return pipeline.predict_proba(df_processed)[:, 1]
+        columns = _transform_input_columns(preprocessor, df_processed)
+        inverse = df_processed.groupby(columns, sort=False, dropna=False).ngroup().to_numpy()
+        _, representatives = np.unique(inverse, return_index=True)
+        unique_rows = df_processed.iloc[representatives]
+        if len(unique_rows) < len(df_processed):
+            event('dedupe.score_rows_collapsed', len(df_processed) - len(unique_rows), rows=len(df_processed))
+        if cache is not None and pipeline is MODEL_REGISTRY._pipeline:
+            X = cache.transform(preprocessor, unique_rows, MODEL_REGISTRY.fingerprint)
+        else:
+            X = preprocessor.transform(unique_rows)
+        return pipeline.named_steps['classifier'].predict_proba(X)[:, 1][inverse]
 
-    df_processed = pd.concat(processed, ignore_index=True)
-    pipeline = load_pipeline()
-    X = pipeline.named_steps['preprocessor'].transform(df_processed)
-    df_processed['data_buyer_score'] = pipeline.named_steps['classifier'].predict_proba(X)[:, 1]
 
-    use_case_column = f"UseCase_{use_case}"
-    if use_case_column not in df_processed.columns:
-        raise ValueError(f"Use case '{use_case}' not available.")
+def _score_postings(df, store=None):
+    """
+    Preprocess and score a frame of harvested postings.
 
-    return df_processed[df_processed[use_case_column] == 1].sort_values("data_buyer_score", ascending=False).head(top_n)[['JobTitle', 'Agency', 'data_buyer_score', use_case_column]]
+    With a ``PostingStore`` only new or changed postings (by JobID and content
+    hash) are preprocessed and scored; the rest come from the store.
+    """
+    if store is not None:
+        return store.score(df)
+    df_processed = preprocess_job_batch(df)
+    df_processed['data_buyer_score'] = score_frame(df_processed)
+    return df_processed
 
 
 # ------------------------
-# USAJobs Live Search and Score Functions Industry Auto
+# Ranking Helpers
 # ------------------------
 
+def detect_use_case(df_processed, default='General'):
+    """
+    Name of the first ``UseCase_*`` flag set on each row, or ``default`` when none is.
 
+    Args:
+        df_processed (pd.DataFrame): Preprocessed postings.
+        default (str): Label for rows with no use case flag.
 
-def fetch_and_score_top_by_industry_auto(api_key, email, industry_name="Medical", top_n=100):
+    Returns:
+        np.ndarray: One use case name per row, in column order of precedence.
     """
-    Scrape USAJobs API, preprocess, assign use cases, score with model, and return top buyers by industry.
+    usecase_columns = [col for col in df_processed.columns if col.startswith('UseCase_')]
+    names = np.array([col.replace('UseCase_', '') for col in usecase_columns] + [default], dtype=object)
+    if not usecase_columns:
+        return np.repeat(names, len(df_processed))
+    hits = df_processed[usecase_columns].to_numpy() == 1
+    return names[np.where(hits.any(axis=1), hits.argmax(axis=1), len(usecase_columns))]
+
+
+def top_n_positions(scores, top_n):
     """
+    Positions of the ``top_n`` highest scores, highest first, without sorting every score.
 
-    headers = {
-        "User-Agent": email,
-        "Authorization-Key": api_key
-    }
+    ``np.argpartition`` finds the cut-off score in linear time and only the rows at or
+    above it are sorted. Ties keep their input order and NaN scores rank last.
 
-    keywords = [
-        'data', 'contract', 'analyst', 'machine learning', 'marketing', 'aquisition',
-        'finance', 'security', 'tech', 'purchasing', 'statistics', 'math',
-        'data scientist', 'research', 'economist'
-    ]
+    Args:
+        scores (array-like): Scores to rank.
+        top_n (int): Number of positions to return.
+
+    Returns:
+        np.ndarray: Integer positions into ``scores``.
+    """
+    scores = np.asarray(scores, dtype=float)
+    scores = np.where(np.isnan(scores), -np.inf, scores)
+    if top_n <= 0:
+        return np.empty(0, dtype=np.intp)
+    if top_n < len(scores):
+        cutoff = scores[np.argpartition(-scores, top_n - 1)[top_n - 1]]
+        candidates = np.flatnonzero(scores >= cutoff)
+    else:
+        candidates = np.arange(len(scores))
+    order = np.argsort(-scores[candidates], kind='stable')
+    return candidates[order[:top_n]]
+
+
+def top_n_rows(df, top_n, column='data_buyer_score'):
+    """Return the ``top_n`` rows of ``df`` with the highest ``column``, like ``sort_values(...).head(top_n)``."""
+    return df.iloc[top_n_positions(df[column].to_numpy(), top_n)]
+
+
+# ------------------------
+# Harvest Once, Rank Many
+# ------------------------
+
+@instrumented
+def harvest_and_score(api_key, email, search_keywords=None, harvester=None, client=None, store=None):
+    """
+    Harvest USAJobs once, preprocess and score every unique posting, and return a ``ScoredCorpus``.
 
-    url = "https://data.usajobs.gov/api/Search"
-    all_jobs = {}
-
-    for keyword in keywords:
-        params = {'Keyword': keyword, 'ResultsPerPage': 500, 'Page': 1}
-        while True:
-            response = requests.get(url, headers=headers, params=params)
-            if response.status_code != 200:
-                break
-            jobs = response.json().get('SearchResult', {}).get('SearchResultItems', [])
-            if not jobs:
-                break
-            for job in jobs:
-                job_id = job.get('MatchedObjectId')
-                if job_id and job_id not in all_jobs:
-                    descriptor = job['MatchedObjectDescriptor']
-                    details = descriptor.get('UserArea', {}).get('Details', {})
-                    all_jobs[job_id] = {
-                        'JobTitle': descriptor.get('PositionTitle'),
-                        'JobDescription': details.get('JobSummary'),
-                        'KeyDuties': details.get('MajorDuties', ''),
-                        'Agency': descriptor.get('OrganizationName')
-                    }
-            params['Page'] += 1
-
-    if not all_jobs:
+    Args:
+        api_key (str): USAJobs API key.
+        email (str): USAJobs API email User-Agent.
+        search_keywords (list[str], optional): Keywords to search. Defaults to ``DEFAULT_SEARCH_KEYWORDS``.
+        harvester (USAJobsHarvester, optional): Harvester to fetch pages with.
+        client (USAJobsClient, optional): Client for the default harvester.
+        store (PostingStore, optional): Reuse stored results for postings seen before.
+
+    Returns:
+        ScoredCorpus: Query it with ``top_by_use_case``, ``top_by_industry``, ``top`` or ``segments``.
+    """
+    if search_keywords is None:
+        search_keywords = DEFAULT_SEARCH_KEYWORDS
+
+    with _harvester_scope(harvester, api_key, email, client) as harvester:
+        postings = CompactPostings(search_keywords).extend(harvester.harvest(search_keywords))
+    if not len(postings):
         raise ValueError("No jobs found.")
+    df = postings.to_frame()
 
-    # Preprocess jobs
-    processed = [
-        preprocess_job_api_response({
-            'PositionTitle': row['JobTitle'],
-            'OrganizationName': row['Agency'],
-            'UserArea': {'Details': {'JobSummary': row['JobDescription'], 'MajorDuties': row['KeyDuties']}}
-        }) for _, row in pd.DataFrame(all_jobs.values()).iterrows()
-    ]
+    df_processed = _score_postings(df, store=store)
+    df_processed.insert(0, 'JobID', df['JobID'].to_numpy())
+    df_processed.insert(1, 'ApplicationCloseDate', df['ApplicationCloseDate'].to_numpy())
+    return ScoredCorpus(df_processed)
 
-    df_processed = pd.concat(processed, ignore_index=True)
 
-    # Score using your internal pipeline
-    pipeline = load_pipeline()
-    X = pipeline.named_steps['preprocessor'].transform(df_processed)
-    df_processed['data_buyer_score'] = pipeline.named_steps['classifier'].predict_proba(X)[:, 1]
+# ------------------------
+# USAJobs Live Search and Score Functions Use Case
+# ------------------------
 
-    # Assign Use Case automatically
-    usecase_columns = [col for col in df_processed.columns if col.startswith('UseCase_')]
+@instrumented
+def fetch_and_score_top_by_use_case_auto(api_key, email, use_case="Fraud", top_n=100, harvester=None, client=None,
+                                         store=None):
+    corpus = harvest_and_score(api_key, email, harvester=harvester, client=client, store=store)
+    return corpus.top_by_use_case(use_case, top_n)
 
-    def assign_detected_usecase(row):
-        for col in usecase_columns:
-            if row[col] == 1:
-                return col.replace('UseCase_', '')
-        return 'General'
 
-    df_processed['DetectedUseCase'] = df_processed.apply(assign_detected_usecase, axis=1)
+# ------------------------
+# USAJobs Live Search and Score Functions Industry Auto
+# ------------------------
 
-    # Filter by industry
-    filtered = df_processed[df_processed['Industry'].str.lower() == industry_name.lower()]
 
-    # Sort by score and return
-    top_buyers = filtered.sort_values('data_buyer_score', ascending=False).head(top_n)
 
-    return top_buyers[['JobTitle', 'Agency', 'data_buyer_score', 'DetectedUseCase']]
+@instrumented
+def fetch_and_score_top_by_industry_auto(api_key, email, industry_name="Medical", top_n=100, harvester=None,
+                                         client=None, store=None):
+    """
+    Scrape USAJobs API, preprocess, assign use cases, score with model, and return top buyers by industry.
+
+    To rank several industries or use cases, call ``harvest_and_score`` once and query the
+    returned ``ScoredCorpus`` instead.
+    """
+    corpus = harvest_and_score(api_key, email, harvester=harvester, client=client, store=store)
+    return corpus.top_by_industry(industry_name, top_n)
+
+
+# Name used in the README and the package exports
+fetch_top_data_buyers_by_industry_auto = fetch_and_score_top_by_industry_auto
 
 
 # ------------------------
@@ -395,102 +923,34 @@ def fetch_and_score_top_by_industry_auto(api_key, email, industry_name="Medical"
 
 
 
-def fetch_top_data_buyers_by_industry_custom(api_key, email, industry_name, top_n=10, search_keywords=None):
+@instrumented
+def fetch_top_data_buyers_by_industry_custom(api_key, email, industry_name, top_n=10, search_keywords=None,
+                                             harvester=None, client=None, store=None):
     """
     Scrape USAJobs API using custom keywords, preprocess, assign use cases, score with model, and return top buyers by industry.
     """
 
-    headers = {
-        "User-Agent": email,
-        "Authorization-Key": api_key
-    }
-
     if search_keywords is None:
-        search_keywords = [
-            'data', 'contract', 'analyst', 'machine learning', 'marketing', 'aquisition',
-            'finance', 'security', 'tech', 'purchasing', 'statistics', 'math',
-            'data scientist', 'research', 'economist'
-        ]
-
-    url = "https://data.usajobs.gov/api/Search"
-    all_jobs = {}
-
-    for keyword in search_keywords:
-        print(f"Searching for keyword: {keyword}")
-        params = {
-            'Keyword': keyword,
-            'ResultsPerPage': 500,
-            'Page': 1
-        }
-        
-        while True:
-            response = requests.get(url, headers=headers, params=params)
-            if response.status_code != 200:
-                print(f"Error {response.status_code}: {response.text}")
-                break
-
-            data = response.json()
-            jobs = data.get('SearchResult', {}).get('SearchResultItems', [])
-            if not jobs:
-                break
-
-            for job in jobs:
-                job_id = job.get('MatchedObjectId')
-                descriptor = job.get('MatchedObjectDescriptor', {})
-                details = descriptor.get('UserArea', {}).get('Details', {})
-
-                if job_id and job_id not in all_jobs:
-                    all_jobs[job_id] = {
-                        'JobTitle': descriptor.get('PositionTitle'),
-                        'Agency': descriptor.get('OrganizationName'),
-                        'JobDescription': details.get('JobSummary'),
-                        'KeyDuties': details.get('MajorDuties', 'N/A')
-                    }
-
-            params['Page'] += 1
-
-    if not all_jobs:
-        raise ValueError("No jobs found.")
+        search_keywords = DEFAULT_SEARCH_KEYWORDS
 
-    # Preprocess jobs
-    processed_jobs = []
-    for _, job_data in all_jobs.items():
-        job_json = {
-            'PositionTitle': job_data['JobTitle'],
-            'OrganizationName': job_data['Agency'],
-            'UserArea': {
-                'Details': {
-                    'JobSummary': job_data['JobDescription'],
-                    'MajorDuties': job_data['KeyDuties']
-                }
-            }
-        }
-        processed_job = preprocess_job_api_response(job_json)
-        processed_jobs.append(processed_job)
+    postings = CompactPostings(search_keywords, missing_duties='N/A')
+    with _harvester_scope(harvester, api_key, email, client) as harvester:
+        postings.extend(harvester.harvest(search_keywords, verbose=True))
 
-    df_processed = pd.concat(processed_jobs, ignore_index=True)
+    if not len(postings):
+        raise ValueError("No jobs found.")
 
-    # Now load the pipeline AFTER processing
-    pipeline = load_pipeline()
-    X = pipeline.named_steps['preprocessor'].transform(df_processed)
-    df_processed['data_buyer_score'] = pipeline.named_steps['classifier'].predict_proba(X)[:, 1]
+    # Preprocess and score jobs
+    df_processed = _score_postings(postings.to_frame(), store=store)
 
     # Infer Use Case
-    usecase_columns = [col for col in df_processed.columns if col.startswith('UseCase_')]
-
-    def assign_detected_usecase(row):
-        for col in usecase_columns:
-            if row[col] == 1:
-                return col.replace('UseCase_', '')
-        return 'General'
-
-    df_processed['DetectedUseCase'] = df_processed.apply(assign_detected_usecase, axis=1)
+    df_processed['DetectedUseCase'] = detect_use_case(df_processed)
 
     # Filter by industry
     filtered = df_processed[df_processed['Industry'].str.lower() == industry_name.lower()]
 
-    # Sort by score
-    top_buyers = filtered.sort_values('data_buyer_score', ascending=False).head(top_n)
+    # Top scores
+    top_buyers = top_n_rows(filtered, top_n)
 
     return top_buyers[['JobTitle', 'Agency', 'data_buyer_score', 'DetectedUseCase']]
 
@@ -499,96 +959,29 @@ def fetch_top_data_buyers_by_industry_custom(api_key, email, industry_name, top_
 # USAJobs Live Search and Score Functions usecase Custom
 # ------------------------
 
-
-import pandas as pd
-import requests
-
-def fetch_and_score_top_by_use_case_custom(api_key, email, use_case="Fraud", top_n=100, search_keywords=None):
+@instrumented
+def fetch_and_score_top_by_use_case_custom(api_key, email, use_case="Fraud", top_n=100, search_keywords=None,
+                                           harvester=None, client=None, store=None):
     """
     Fetch jobs live from USAJobs API using a predefined or custom keyword list,
     score them, and return top N jobs matching a specified use case.
     """
 
-    headers = {
-        "User-Agent": email,
-        "Authorization-Key": api_key
-    }
-
     if search_keywords is None:
-        search_keywords = [
-            'data', 'contract', 'analyst', 'machine learning', 'marketing', 'aquisition',
-            'finance', 'security', 'tech', 'purchasing', 'statistics', 'math', 'data scientist',
-            'research', 'economist'
-        ]
-
-    url = "https://data.usajobs.gov/api/Search"
-    all_jobs = {}
-
-    for keyword in search_keywords:
-        print(f"Searching for keyword: {keyword}")
-        params = {'Keyword': keyword, 'ResultsPerPage': 500, 'Page': 1}
-        while True:
-            response = requests.get(url, headers=headers, params=params)
-            if response.status_code != 200:
-                print(f"Error {response.status_code}: {response.text}")
-                break
-
-            data = response.json()
-            jobs = data.get('SearchResult', {}).get('SearchResultItems', [])
-            if not jobs:
-                break
-
-            for job in jobs:
-                job_id = job.get('MatchedObjectId')
-                descriptor = job.get('MatchedObjectDescriptor', {})
-                details = descriptor.get('UserArea', {}).get('Details', {})
-
-                if job_id not in all_jobs:
-                    all_jobs[job_id] = {
-                        'JobID': job_id,
-                        'JobTitle': descriptor.get('PositionTitle'),
-                        'JobDescription': details.get('JobSummary'),
-                        'KeyDuties': details.get('MajorDuties', 'N/A'),
-                        'Department': descriptor.get('OrganizationName'),
-                        'Agency': descriptor.get('DepartmentName'),
-                        'SearchKeywords': [keyword]
-                    }
-                else:
-                    if keyword not in all_jobs[job_id]['SearchKeywords']:
-                        all_jobs[job_id]['SearchKeywords'].append(keyword)
-
-            params['Page'] += 1
-
-    # Convert dictionary to DataFrame
-    df = pd.DataFrame(all_jobs.values())
+        search_keywords = DEFAULT_SEARCH_KEYWORDS
 
-    if df.empty:
-        raise ValueError("No jobs found across all keywords.")
+    postings = CompactPostings(search_keywords, missing_duties='N/A')
+    with _harvester_scope(harvester, api_key, email, client) as harvester:
+        postings.extend(harvester.harvest(search_keywords, verbose=True))
 
-    # Preprocess all jobs properly
-    processed_jobs = []
-    for _, row in df.iterrows():
-        job_json = {
-            'PositionTitle': row['JobTitle'],
-            'OrganizationName': row['Agency'],
-            'UserArea': {
-                'Details': {
-                    'JobSummary': row['JobDescription'],
-                    'MajorDuties': row['KeyDuties'],
-                    'JobCategory': ', '.join(row['SearchKeywords'])
-                }
-            }
-        }
-        processed_job = preprocess_job_api_response(job_json)
-        processed_jobs.append(processed_job)
+    if not len(postings):
+        raise ValueError("No jobs found across all keywords.")
 
-    df_processed = pd.concat(processed_jobs, ignore_index=True)
+    # This ranking has always read Agency from DepartmentName
+    df = postings.to_frame().rename(columns={'Agency': 'Department', 'Department': 'Agency'})
 
-    # Load pipeline and predict
-    pipeline = load_pipeline()
-    X = pipeline.named_steps['preprocessor'].transform(df_processed)
-    scores = pipeline.named_steps['classifier'].predict_proba(X)[:, 1]
-    df_processed['data_buyer_score'] = scores
+    # Preprocess all jobs in one vectorized pass and score them
+    df_processed = _score_postings(df, store=store)
 
     # Filter by use case
     use_case_column = f"UseCase_{use_case}"
@@ -596,7 +989,7 @@ def fetch_and_score_top_by_use_case_custom(api_key, email, use_case="Fraud", top
         raise ValueError(f"Use case '{use_case}' not available.")
 
     filtered = df_processed[df_processed[use_case_column] == 1]
-    ranked = filtered.sort_values("data_buyer_score", ascending=False).head(top_n)
+    ranked = top_n_rows(filtered, top_n)
 
     return ranked[['JobTitle', 'Agency', 'data_buyer_score', use_case_column]]
 
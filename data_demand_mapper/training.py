@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from .instrumentation import instrumented, logger, timer
+from .toolkit import ModelRegistry, feature_fingerprint, preprocess_job_batch
+
+# scikit-learn and imbalanced-learn are imported when a model is trained, so importing
+# this module (e.g. for ``data-demand-mapper --help``) stays cheap.
+
+# ------------------------
+# Model Definition
+# ------------------------
+
+FEATURE_COLUMNS = ['CombinedText', 'AgencySize', 'Industry', 'IsSeniorRole']
+LABEL_COLUMN = 'IsLikelyDataBuyer'
+
+# Only classifier settings vary by default, so the fitted preprocessor (and SMOTE
+# resampling) of each fold is computed once and reused by every candidate.
+DEFAULT_PARAM_GRID = {'classifier__C': [0.1, 1.0, 10.0]}
+
+SMOTE_NEIGHBORS = 5
+
+CV_METRICS = ['accuracy', 'precision', 'recall', 'f1', 'roc_auc', 'neg_log_loss']
+
+
+def build_pipeline(smote=True, memory=None, random_state=42):
+    """
+    The packaged model's TF-IDF + one-hot ``ColumnTransformer`` and LogisticRegression.
+
+    Args:
+        smote (bool): Oversample the minority class with SMOTE between the preprocessor and
+            the classifier. This needs imbalanced-learn; SMOTE then only runs on training folds.
+        memory (str or joblib.Memory, optional): Cache for fitted preprocessor/SMOTE steps, so
+            parameter candidates that only change the classifier reuse them.
+        random_state (int): Seed for SMOTE.
+
+    Returns:
+        Pipeline: Unfitted pipeline with ``preprocessor``, optionally ``smote``, and ``classifier`` steps.
+    """
+    from sklearn.compose import ColumnTransformer
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+    preprocessor = ColumnTransformer(transformers=[
+        ('onehot_agency', OneHotEncoder(handle_unknown='ignore'), ['AgencySize']),
+        ('onehot_industry', OneHotEncoder(handle_unknown='ignore'), ['Industry']),
+        ('scale_senior', StandardScaler(), ['IsSeniorRole']),
+        ('text_vectorizer', TfidfVectorizer(stop_words='english', ngram_range=(1, 3), max_features=5000), 'CombinedText')
+    ])
+    classifier = LogisticRegression(max_iter=1000)
+    if not smote:
+        from sklearn.pipeline import Pipeline
+        return Pipeline(steps=[('preprocessor', preprocessor), ('classifier', classifier)], memory=memory)
+
+    try:
+        from imblearn.over_sampling import SMOTE
+        from imblearn.pipeline import Pipeline
+    except ImportError:  # optional dependency: pip install data_demand_mapper[train]
+        raise ImportError(
+            "Training with SMOTE needs imbalanced-learn. Install it with: pip install 'data_demand_mapper[train]'"
+        ) from None
+    return Pipeline(steps=[
+        ('preprocessor', preprocessor),
+        ('smote', SMOTE(k_neighbors=SMOTE_NEIGHBORS, random_state=random_state)),
+        ('classifier', classifier),
+    ], memory=memory)
+
+
+def _scoring_pipeline(fitted):
+    """Drop the resampling step so the artifact has the packaged model's shape and loads without imblearn."""
+    from sklearn.pipeline import Pipeline
+
+    return Pipeline(steps=[
+        ('preprocessor', fitted.named_steps['preprocessor']),
+        ('classifier', fitted.named_steps['classifier']),
+    ])
+
+
+# ------------------------
+# Training Data
+# ------------------------
+
+def _training_frame(data, labels=None, label_column=LABEL_COLUMN):
+    """
+    Model features and labels from engineered features, raw postings or USAJobs descriptors.
+
+    A frame that already has the model's feature columns is used as is. Anything else goes
+    through ``preprocess_job_batch``, and ``label_column`` is then taken from the input frame
+    when present, else from the engineered columns (the keyword-rule label the notebooks used).
+    """
+    if isinstance(data, pd.DataFrame) and all(col in data.columns for col in FEATURE_COLUMNS):
+        features = data.reset_index(drop=True)
+    else:
+        features = preprocess_job_batch(data)
+        if labels is None and isinstance(data, pd.DataFrame) and label_column in data.columns:
+            labels = data[label_column].to_numpy()
+
+    if labels is None:
+        if label_column not in features.columns:
+            raise ValueError(f"No labels: pass labels=... or include a {label_column!r} column.")
+        labels = features[label_column].to_numpy()
+    labels = np.asarray(labels).astype(int)
+    if len(labels) != len(features):
+        raise ValueError(f"Got {len(labels)} labels for {len(features)} postings.")
+    if len(np.unique(labels)) != 2:
+        raise ValueError("Training needs both positive and negative examples.")
+    return features[FEATURE_COLUMNS], labels
+
+
+# ------------------------
+# Training Entry Point
+# ------------------------
+
+def _cv_scores(estimator, X, y):
+    """
+    Every ``CV_METRICS`` score from one ``predict_proba`` call.
+
+    Named scorers would call ``predict``, ``predict_proba`` and ``decision_function``
+    separately, each re-running the TF-IDF transform of the held-out fold.
+    """
+    from sklearn import metrics
+
+    proba = estimator.predict_proba(X)[:, 1]
+    predicted = (proba > 0.5).astype(int)
+    return {
+        'accuracy': metrics.accuracy_score(y, predicted),
+        'precision': metrics.precision_score(y, predicted, zero_division=0),
+        'recall': metrics.recall_score(y, predicted),
+        'f1': metrics.f1_score(y, predicted),
+        'roc_auc': metrics.roc_auc_score(y, proba),
+        'neg_log_loss': -metrics.log_loss(y, proba, labels=[0, 1]),
+    }
+
+
+def _metric_summary(cv_results, index, n_splits):
+    metrics = {}
+    for name in CV_METRICS:
+        folds = [float(cv_results[f'split{i}_test_{name}'][index]) for i in range(n_splits)]
+        if name.startswith('neg_'):
+            name, folds = name[len('neg_'):], [-value for value in folds]
+        metrics[name] = {'mean': float(np.mean(folds)), 'std': float(np.std(folds)), 'folds': folds}
+    return metrics
+
+
+def _plain_params(params):
+    return {key: value.item() if hasattr(value, 'item') else value for key, value in params.items()}
+
+
+@instrumented
+def train_pipeline(data, output_dir, labels=None, label_column=LABEL_COLUMN, param_grid=None, cv=5,
+                   n_jobs=-1, smote=True, cache_dir=None, version=None, refit_metric='roc_auc', random_state=8):
+    """
+    Retrain the scoring pipeline with a parallel, cached grid search and save a versioned artifact.
+
+    Every parameter candidate is cross-validated with stratified folds across ``n_jobs``
+    processes. Fitted preprocessor and SMOTE steps are cached on disk, so candidates that
+    only change the classifier do not re-vectorize the text of each fold, and each held-out
+    fold is transformed once per candidate for all metrics. The best candidate
+    is refit on all rows and written as a ``preprocessor`` + ``classifier`` pipeline that
+    ``load_pipeline()`` and ``export_compiled_model()`` accept, next to a JSON metrics report.
+
+    Args:
+        data (pd.DataFrame or list of dict): Engineered features with the model columns
+            (``CombinedText``, ``AgencySize``, ``Industry``, ``IsSeniorRole``), or anything
+            ``preprocess_job_batch`` accepts.
+        output_dir (str): Directory for ``data_buyer_model-<version>.joblib`` and ``.metrics.json``.
+        labels (array-like, optional): 0/1 label per posting; defaults to ``label_column``.
+        label_column (str): Label column used when ``labels`` is not given.
+        param_grid (dict or list of dict, optional): ``GridSearchCV`` grid over pipeline
+            parameters; defaults to ``DEFAULT_PARAM_GRID``.
+        cv (int): Stratified folds.
+        n_jobs (int): Processes used by the search; -1 uses every core.
+        smote (bool): Oversample the minority class within each training fold.
+        cache_dir (str, optional): Keep the fitted-step cache here to reuse it across runs;
+            by default a temporary cache is used and removed afterwards.
+        version (str, optional): Artifact version; defaults to a UTC timestamp.
+        refit_metric (str): CV metric that picks the best candidate.
+        random_state (int): Seed for fold shuffling.
+
+    Returns:
+        tuple: ``(pipeline, report)`` where ``report`` is the dict written to the metrics file,
+        including the artifact path, its SHA-256 fingerprint and the CV metrics.
+    """
+    import joblib
+    import sklearn
+    from sklearn.model_selection import GridSearchCV, StratifiedKFold
+
+    started = time.perf_counter()
+    X, y = _training_frame(data, labels, label_column)
+    version = version or time.strftime('%Y%m%d-%H%M%S', time.gmtime())
+    param_grid = DEFAULT_PARAM_GRID if param_grid is None else param_grid
+    folds = StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state)
+    minority = int(min(y.sum(), len(y) - y.sum()))
+    if smote and minority * (cv - 1) // cv <= SMOTE_NEIGHBORS:
+        raise ValueError(
+            f"Only {minority} examples of the minority class: SMOTE needs more than {SMOTE_NEIGHBORS} "
+            f"per training fold. Train on more data, with fewer folds, or with smote=False."
+        )
+
+    cache = cache_dir or tempfile.mkdtemp(prefix='data_demand_mapper-train-')
+    try:
+        search = GridSearchCV(
+            build_pipeline(smote=smote, memory=joblib.Memory(cache, verbose=0)), param_grid,
+            scoring=_cv_scores, refit=refit_metric, cv=folds, n_jobs=n_jobs, error_score='raise'
+        )
+        with timer('train.search', rows=len(X)):
+            search.fit(X, y)
+    finally:
+        if cache_dir is None:
+            shutil.rmtree(cache, ignore_errors=True)
+    pipeline = _scoring_pipeline(search.best_estimator_)
+
+    os.makedirs(output_dir, exist_ok=True)
+    artifact = os.path.join(output_dir, f'data_buyer_model-{version}.joblib')
+    joblib.dump(pipeline, artifact)
+    results = search.cv_results_
+    report = {
+        'version': version,
+        'artifact': os.path.abspath(artifact),
+        'fingerprint': ModelRegistry(artifact).fingerprint,
+        'feature_schema': feature_fingerprint(),
+        'created': time.time(),
+        'sklearn_version': sklearn.__version__,
+        'rows': int(len(y)),
+        'positives': int(y.sum()),
+        'smote': smote,
+        'cv_folds': cv,
+        'refit_metric': refit_metric,
+        'best_params': _plain_params(search.best_params_),
+        'cv_metrics': _metric_summary(results, search.best_index_, cv),
+        'candidates': [
+            {'params': _plain_params(params), 'mean_fit_seconds': float(results['mean_fit_time'][i]),
+             **{f'mean_{name}': float(results[f'mean_test_{name}'][i]) for name in CV_METRICS}}
+            for i, params in enumerate(results['params'])
+        ],
+        'seconds': time.perf_counter() - started,
+    }
+    with open(os.path.join(output_dir, f'data_buyer_model-{version}.metrics.json'), 'w') as handle:
+        json.dump(report, handle, indent=2)
+    metric = refit_metric[len('neg_'):] if refit_metric.startswith('neg_') else refit_metric
+    logger.info("Trained %s: %s=%.4f with %s in %.1fs", artifact, metric,
+                report['cv_metrics'][metric]['mean'], report['best_params'], report['seconds'])
+    return pipeline, report
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# scipy is imported when rows are first transformed.
+
+# ------------------------
+# TF-IDF Transform Cache
+# ------------------------
+
+TRANSFORM_CACHE_BYTES = 256 * 1024 * 1024
+
+
+def _transform_input_columns(preprocessor, df):
+    """Columns the fitted preprocessor actually reads; everything else cannot change its output."""
+    columns = []
+    for name, transformer, selected in getattr(preprocessor, 'transformers_', []):
+        if isinstance(transformer, str) and transformer == 'drop':
+            continue
+        selected = [selected] if isinstance(selected, str) else list(selected)
+        if not all(isinstance(col, str) for col in selected):
+            return list(df.columns)
+        columns.extend(selected)
+    return columns or list(df.columns)
+
+
+class TransformCache:
+    """
+    LRU cache of the preprocessor's sparse output row for each posting.
+
+    Rows are keyed by a hash of the values in the columns the preprocessor reads
+    (CombinedText, AgencySize, Industry, IsSeniorRole for the packaged model) plus
+    the model fingerprint. Only rows not already cached go through the TF-IDF
+    vectorizer. Cached and new rows are stacked into one CSR matrix in input order.
+    All entries are dropped when the model fingerprint changes, e.g. after
+    ``reload_pipeline()`` picks up a retrained artifact.
+
+    Args:
+        max_bytes (int): Upper bound on the stored row data; least recently used rows are evicted.
+    """
+
+    def __init__(self, max_bytes=TRANSFORM_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._rows = OrderedDict()
+        self._bytes = 0
+        self.model = None
+        self.n_features = None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._rows)
+
+    def clear(self):
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        # Callers hold self._lock
+        self._rows.clear()
+        self._bytes = 0
+        self.n_features = None
+
+    def _keys(self, df, columns, model):
+        values = zip(*(df[col].tolist() for col in columns))
+        return [
+            hashlib.blake2b('\x1f'.join(map(str, (model,) + row)).encode('utf-8'), digest_size=16).digest()
+            for row in values
+        ]
+
+    def _store(self, key, indices, data):
+        size = indices.nbytes + data.nbytes
+        if key in self._rows or size > self.max_bytes:
+            return
+        self._rows[key] = (indices, data)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (old_indices, old_data) = self._rows.popitem(last=False)
+            self._bytes -= old_indices.nbytes + old_data.nbytes
+
+    def transform(self, preprocessor, df_processed, model):
+        """
+        Return ``preprocessor.transform(df_processed)`` as CSR, transforming only uncached rows.
+
+        Args:
+            preprocessor: Fitted ColumnTransformer.
+            df_processed (pd.DataFrame): Preprocessed postings.
+            model (str): Fingerprint of the artifact ``preprocessor`` came from.
+        """
+        from scipy import sparse
+
+        keys = self._keys(df_processed, _transform_input_columns(preprocessor, df_processed), model)
+
+        rows = [None] * len(keys)
+        missing = {}
+        with self._lock:
+            if self.model != model:
+                self._clear()
+                self.model = model
+            n_features = self.n_features
+            for position, key in enumerate(keys):
+                cached = self._rows.get(key)
+                if cached is None:
+                    missing.setdefault(key, []).append(position)
+                else:
+                    self._rows.move_to_end(key)
+                    rows[position] = cached
+            self.hits += len(keys) - sum(len(positions) for positions in missing.values())
+            self.misses += sum(len(positions) for positions in missing.values())
+
+        if missing:
+            first = [positions[0] for positions in missing.values()]
+            fresh = sparse.csr_matrix(preprocessor.transform(df_processed.iloc[first]))
+            fresh.sort_indices()
+            n_features = fresh.shape[1]
+            with self._lock:
+                # Another thread may have switched the cache to a different model meanwhile
+                current = self.model == model
+                if current:
+                    self.n_features = n_features
+                for i, (key, positions) in enumerate(missing.items()):
+                    start, end = fresh.indptr[i], fresh.indptr[i + 1]
+                    row = (fresh.indices[start:end].copy(), fresh.data[start:end].copy())
+                    for position in positions:
+                        rows[position] = row
+                    if current:
+                        self._store(key, *row)
+
+        if n_features is None:
+            return sparse.csr_matrix(preprocessor.transform(df_processed))
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum([len(indices) for indices, _ in rows], out=indptr[1:])
+        indices = np.concatenate([indices for indices, _ in rows]) if rows else np.empty(0, dtype=np.int32)
+        data = np.concatenate([data for _, data in rows]) if rows else np.empty(0)
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(rows), n_features))
+
+    def info(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'rows': len(self._rows),
+            'bytes': self._bytes,
+            'max_bytes': self.max_bytes,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+TRANSFORM_CACHE = None
+
+
+def enable_transform_cache(max_bytes=TRANSFORM_CACHE_BYTES):
+    """Turn on the process-wide TF-IDF transform cache used by ``score_frame``; returns the cache."""
+    global TRANSFORM_CACHE
+    TRANSFORM_CACHE = TransformCache(max_bytes)
+    return TRANSFORM_CACHE
+
+
+def disable_transform_cache():
+    global TRANSFORM_CACHE
+    TRANSFORM_CACHE = None
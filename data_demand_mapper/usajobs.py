@@ -0,0 +1,616 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import contextlib
+import email.utils
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import sqlite3
+import threading
+import time
+import zlib
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .instrumentation import event, logger, observe
+
+SEARCH_URL = "https://data.usajobs.gov/api/Search"
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# ------------------------
+# Pooled HTTP Client
+# ------------------------
+
+class RequestMetrics:
+    """
+    Thread-safe counters for every request a client makes.
+
+    Args:
+        history (int): Number of most recent per-request records to keep.
+    """
+
+    def __init__(self, history=1000):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.cache_hits = 0
+        self.retries = 0
+        self.failures = 0
+        self.bytes = 0
+        self.total_latency = 0.0
+        self.status_codes = Counter()
+        self.history = deque(maxlen=history)
+
+    def record(self, url, params, status, latency, attempts, size, error=None):
+        with self._lock:
+            self.requests += 1
+            self.retries += attempts - 1
+            self.bytes += size
+            self.total_latency += latency
+            self.status_codes[status if status is not None else 'error'] += 1
+            if error is not None or status != 200:
+                self.failures += 1
+            self.history.append({
+                'url': url, 'params': dict(params or {}), 'status': status, 'latency': latency,
+                'attempts': attempts, 'bytes': size, 'error': error,
+            })
+
+    def record_cache_hit(self, url, params):
+        with self._lock:
+            self.cache_hits += 1
+            self.history.append({
+                'url': url, 'params': dict(params or {}), 'status': 200, 'latency': 0.0,
+                'attempts': 0, 'bytes': 0, 'error': None, 'cached': True,
+            })
+
+    def summary(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'cache_hits': self.cache_hits,
+                'retries': self.retries,
+                'failures': self.failures,
+                'bytes': self.bytes,
+                'mean_latency': self.total_latency / self.requests if self.requests else 0.0,
+                'status_codes': dict(self.status_codes),
+            }
+
+
+# ------------------------
+# On-Disk Response Cache
+# ------------------------
+
+class OfflineCacheMiss(requests.RequestException):
+    """Raised by an offline client when a request is not in the response cache."""
+
+
+class ResponseCache:
+    """
+    Persistent SQLite cache of successful API responses.
+
+    Bodies are stored zlib-compressed and keyed by endpoint plus query parameters
+    (Keyword, Page, ResultsPerPage, ...). Entries older than ``ttl`` are ignored and
+    purged. When the stored bodies exceed ``max_bytes``, the least recently used
+    entries are evicted.
+
+    Args:
+        path (str): SQLite file to create or reuse.
+        ttl (float, optional): Seconds an entry stays valid; None keeps entries forever.
+        max_bytes (int, optional): Bound on the total compressed body size; None disables eviction.
+    """
+
+    def __init__(self, path, ttl=24 * 3600, max_bytes=512 * 1024 ** 2):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, url TEXT, params TEXT, body BLOB, "
+                "size INTEGER, created REAL, accessed REAL)"
+            )
+
+    @staticmethod
+    def make_key(url, params):
+        canonical = json.dumps([url, sorted((str(k), str(v)) for k, v in (params or {}).items())])
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def _expired(self, created, now):
+        return self.ttl is not None and now - created > self.ttl
+
+    def get(self, url, params):
+        """Return the cached body bytes, or None on a miss or an expired entry."""
+        key = self.make_key(url, params)
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT body, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if self._expired(row[1], now):
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        return zlib.decompress(row[0])
+
+    def set(self, url, params, body):
+        key = self.make_key(url, params)
+        blob = zlib.compress(body)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, url, json.dumps(dict(params or {}), default=str), blob, len(blob), now, now)
+            )
+            self._evict()
+
+    def _evict(self):
+        if self.max_bytes is None:
+            return
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        stale = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+    def purge_expired(self):
+        """Delete every expired entry and return how many were removed."""
+        if self.ttl is None:
+            return 0
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "DELETE FROM responses WHERE created < ?", (time.time() - self.ttl,)
+            ).rowcount
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def stats(self):
+        with self._lock:
+            count, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {'entries': count, 'bytes': size, 'max_bytes': self.max_bytes, 'ttl': self.ttl}
+
+    def __len__(self):
+        return self.stats()['entries']
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _cached_response(url, body):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    response.url = url
+    response.headers['Content-Type'] = 'application/json'
+    response.encoding = 'utf-8'
+    return response
+
+
+def _retry_after_seconds(response):
+    """Parse a Retry-After header given either as seconds or as an HTTP date."""
+    value = response.headers.get('Retry-After') if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        try:
+            return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+class USAJobsClient:
+    """
+    Shared HTTP client for the USAJobs API.
+
+    Keeps a pool of keep-alive connections so pages reuse TLS sessions, applies
+    timeouts, and retries 429/5xx responses and connection errors with exponential
+    backoff and full jitter. A ``Retry-After`` header, when present, sets the wait.
+    Every request is recorded in ``metrics``.
+
+    With a ``cache``, successful responses are stored on disk and served from there
+    until they expire; ``offline=True`` never touches the network and raises
+    ``OfflineCacheMiss`` for anything not cached, which makes recorded harvests
+    replayable in tests and benchmarks.
+
+    Args:
+        api_key (str): USAJobs API key.
+        email (str): Email registered with the API, sent as the User-Agent.
+        base_url (str): Search endpoint; point it at a local server for testing.
+        pool_size (int): Keep-alive connections kept per host.
+        timeout (float | tuple): Connect/read timeout passed to ``requests``.
+        max_retries (int): Retries after the first attempt before giving up.
+        backoff_factor (float): Base delay in seconds; attempt n waits up to ``backoff_factor * 2**n``.
+        max_backoff (float): Upper bound for a single wait.
+        retry_statuses (tuple[int]): Status codes that are retried.
+        cache (ResponseCache | str, optional): Response cache, or a path to create one at.
+        offline (bool): Serve only from ``cache``.
+    """
+
+    def __init__(self, api_key, email, base_url=SEARCH_URL, pool_size=16, timeout=(5, 30),
+                 max_retries=5, backoff_factor=0.5, max_backoff=60.0, retry_statuses=RETRY_STATUSES,
+                 cache=None, offline=False):
+        if isinstance(cache, (str, os.PathLike)):
+            cache = ResponseCache(cache)
+        if offline and cache is None:
+            raise ValueError("offline mode needs a response cache")
+        self.cache = cache
+        self.offline = offline
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.retry_statuses = tuple(retry_statuses)
+        self.metrics = RequestMetrics()
+
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": email, "Authorization-Key": api_key})
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _record(self, url, params, status, latency, attempts, size, error=None):
+        self.metrics.record(url, params, status, latency, attempts, size, error)
+        observe('http.request', latency, url=url, params=dict(params or {}), status=status,
+                attempts=attempts, bytes=size, error=error)
+        event(f'http.status.{status if status is not None else "error"}')
+        event('http.bytes', size)
+        if attempts > 1:
+            event('http.retries', attempts - 1)
+
+    def _backoff(self, attempt, response=None):
+        retry_after = _retry_after_seconds(response)
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * 2 ** attempt))
+
+    def get(self, params=None, url=None):
+        """
+        GET ``url`` (the Search endpoint by default), retrying transient failures.
+
+        Returns:
+            requests.Response: The final response, which may still be an error status
+            once retries are exhausted.
+
+        Raises:
+            requests.RequestException: If the connection keeps failing after all retries.
+        """
+        url = url or self.base_url
+        if self.cache is not None:
+            body = self.cache.get(url, params)
+            if body is not None:
+                self.metrics.record_cache_hit(url, params)
+                event('http.cache_hits', url=url, params=dict(params or {}))
+                return _cached_response(url, body)
+            if self.offline:
+                raise OfflineCacheMiss(f"Not cached: {url} {dict(params or {})}")
+
+        attempt = 0
+        started = time.perf_counter()
+        while True:
+            attempt += 1
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                if attempt > self.max_retries:
+                    self._record(url, params, None, time.perf_counter() - started, attempt, 0, repr(exc))
+                    raise
+                response = None
+            else:
+                if response.status_code not in self.retry_statuses or attempt > self.max_retries:
+                    self._record(
+                        url, params, response.status_code, time.perf_counter() - started,
+                        attempt, len(response.content)
+                    )
+                    if self.cache is not None and response.status_code == 200:
+                        self.cache.set(url, params, response.content)
+                    return response
+            delay = self._backoff(attempt - 1, response)
+            logger.debug("Retrying %s in %.2fs (attempt %d, status %s)", url, delay, attempt,
+                         response.status_code if response is not None else 'connection error')
+            time.sleep(delay)
+
+    def search(self, params):
+        """GET the Search endpoint with the given query parameters."""
+        return self.get(params=params)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# ------------------------
+# Rate Limiting
+# ------------------------
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting how many requests start per second.
+
+    Args:
+        rate (float): Tokens added per second (sustained requests per second).
+        capacity (float, optional): Maximum burst size; defaults to ``rate``.
+    """
+
+    def __init__(self, rate, capacity=None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# ------------------------
+# Concurrent Harvester
+# ------------------------
+
+def _page_count(data, results_per_page):
+    """Read the number of result pages from a Search response, or None if it is not reported."""
+    result = data.get('SearchResult', {})
+    pages = result.get('UserArea', {}).get('NumberOfPages')
+    if pages not in (None, ''):
+        return int(pages)
+    total = result.get('SearchResultCountAll')
+    if total is not None:
+        return math.ceil(int(total) / results_per_page)
+    return None
+
+
+class HarvestIncomplete(RuntimeError):
+    """
+    Raised by a strict harvest when some result pages still failed after the client's retries.
+
+    Attributes:
+        failed_pages (list[tuple]): ``(keyword, page, error)`` for every page that was not fetched.
+    """
+
+    def __init__(self, message, failed_pages):
+        super().__init__(message)
+        self.failed_pages = failed_pages
+
+
+class USAJobsHarvester:
+    """
+    Fetch every Search result page for a list of keywords concurrently.
+
+    Page 1 of every keyword is requested first. The page count it reports is used
+    to plan and fetch all remaining pages in parallel, so no request is spent
+    finding an empty trailing page. Keywords whose response does not report a page
+    count fall back to paging until an empty page.
+
+    Args:
+        api_key (str, optional): USAJobs API key; not needed when ``client`` is given.
+        email (str, optional): Email registered with the API; not needed when ``client`` is given.
+        max_workers (int): Maximum requests in flight at once.
+        requests_per_second (float, optional): Token-bucket limit on request starts; None disables it.
+        results_per_page (int): ResultsPerPage sent with every request (the API maximum is 500).
+        client (USAJobsClient, optional): Shared client; defaults to a new one for ``api_key``/``email``,
+            which ``close()`` closes.
+    """
+
+    def __init__(self, api_key=None, email=None, max_workers=8, requests_per_second=10.0,
+                 results_per_page=500, client=None):
+        self._owns_client = client is None
+        self.client = client or USAJobsClient(api_key, email)
+        self.max_workers = max_workers
+        self.rate_limiter = TokenBucket(requests_per_second) if requests_per_second else None
+        self.results_per_page = results_per_page
+        self.failed_pages = []
+
+    def fetch_page(self, keyword, page, verbose=False):
+        """
+        Fetch one page of results.
+
+        Returns the decoded JSON, or None when the page still fails after the client's
+        retries; failed pages are listed in ``failed_pages``.
+        """
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        params = {'Keyword': keyword, 'ResultsPerPage': self.results_per_page, 'Page': page}
+        level = logging.WARNING if verbose else logging.DEBUG
+        try:
+            response = self.client.search(params)
+        except requests.RequestException as exc:
+            self.failed_pages.append((keyword, page, repr(exc)))
+            event('harvest.failed_pages', keyword=keyword, page=page)
+            logger.log(level, "Error fetching %r page %d: %s", keyword, page, exc)
+            return None
+        if response.status_code != 200:
+            self.failed_pages.append((keyword, page, response.status_code))
+            event('harvest.failed_pages', keyword=keyword, page=page)
+            logger.log(level, "Error %s: %s", response.status_code, response.text)
+            return None
+        event('harvest.pages', keyword=keyword, page=page)
+        event(f'harvest.pages.{keyword}')
+        return response.json()
+
+    def _page_items(self, data):
+        if data is None:
+            return []
+        return data.get('SearchResult', {}).get('SearchResultItems', [])
+
+    def _page_until_empty(self, keyword, first_items, verbose):
+        pages = [first_items]
+        page = 2
+        while pages[-1]:
+            data = self.fetch_page(keyword, page, verbose)
+            if data is None:
+                break
+            pages.append(self._page_items(data))
+            page += 1
+        return pages
+
+    def _check_failures(self, since, strict):
+        """Warn about (or with ``strict`` raise on) pages that failed since ``failed_pages[since]``."""
+        failed = self.failed_pages[since:]
+        if not failed:
+            return
+        by_keyword = {}
+        for keyword, page, _ in failed:
+            by_keyword.setdefault(keyword, []).append(page)
+        summary = '; '.join(
+            f"{keyword!r} page{'s' if len(pages) > 1 else ''} {', '.join(map(str, sorted(pages)))}"
+            for keyword, pages in by_keyword.items()
+        )
+        message = (f"Harvest incomplete: {len(failed)} result page{'s' if len(failed) > 1 else ''} "
+                   f"failed after retries ({summary})")
+        if strict:
+            raise HarvestIncomplete(message, failed)
+        logger.warning("%s; the results are partial.", message)
+
+    def iter_items(self, keywords, verbose=False, strict=False):
+        """
+        Lazily yield ``(keyword, SearchResultItem)`` pairs in serial-crawl order.
+
+        Unlike ``harvest`` this never holds more than ``max_workers`` pages in memory:
+        pages of one keyword are fetched in windows of ``max_workers`` concurrent
+        requests and yielded as soon as each window completes. Failed pages are
+        reported once the last pair has been yielded, as in ``harvest``.
+        """
+        since = len(self.failed_pages)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for keyword in dict.fromkeys(keywords):
+                logger.log(logging.INFO if verbose else logging.DEBUG, "Searching for keyword: %s", keyword)
+                data = self.fetch_page(keyword, 1, verbose)
+                items = self._page_items(data)
+                for item in items:
+                    yield keyword, item
+                if not items:
+                    continue
+                count = _page_count(data, self.results_per_page)
+                if count is None:
+                    page = 2
+                    while items:
+                        items = self._page_items(self.fetch_page(keyword, page, verbose))
+                        for item in items:
+                            yield keyword, item
+                        page += 1
+                    continue
+                for start in range(2, count + 1, self.max_workers):
+                    window = [
+                        pool.submit(self.fetch_page, keyword, page, verbose)
+                        for page in range(start, min(start + self.max_workers, count + 1))
+                    ]
+                    for future in window:
+                        for item in self._page_items(future.result()):
+                            yield keyword, item
+        self._check_failures(since, strict)
+
+    def harvest(self, keywords, verbose=False, strict=False):
+        """
+        Fetch all result pages for every keyword.
+
+        Pages that still fail after the client's retries are left out of the result and
+        listed in ``failed_pages``. A warning names each keyword and its missing pages.
+
+        Args:
+            keywords (list[str]): Search keywords; a repeated keyword is fetched once.
+            verbose (bool): Log each keyword searched at INFO and any failed request at WARNING.
+            strict (bool): Raise ``HarvestIncomplete`` instead of returning partial results.
+
+        Returns:
+            list[tuple[str, dict]]: ``(keyword, SearchResultItem)`` pairs ordered by keyword,
+            then page, then position on the page, i.e. the order a serial crawl would see them.
+        """
+        keywords = list(dict.fromkeys(keywords))
+        since = len(self.failed_pages)
+        pages = {}
+
+        for keyword in keywords:
+            logger.log(logging.INFO if verbose else logging.DEBUG, "Searching for keyword: %s", keyword)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            first = {keyword: pool.submit(self.fetch_page, keyword, 1, verbose) for keyword in keywords}
+
+            planned = {}
+            unplanned = {}
+            for keyword in keywords:
+                data = first[keyword].result()
+                items = self._page_items(data)
+                pages[(keyword, 1)] = items
+                if not items:
+                    continue
+                count = _page_count(data, self.results_per_page)
+                if count is None:
+                    unplanned[keyword] = pool.submit(self._page_until_empty, keyword, items, verbose)
+                else:
+                    for page in range(2, count + 1):
+                        planned[(keyword, page)] = pool.submit(self.fetch_page, keyword, page, verbose)
+
+            for key, future in planned.items():
+                pages[key] = self._page_items(future.result())
+            for keyword, future in unplanned.items():
+                for page, items in enumerate(future.result(), start=1):
+                    pages[(keyword, page)] = items
+
+        self._check_failures(since, strict)
+        order = {keyword: index for index, keyword in enumerate(keywords)}
+        return [
+            (keyword, item)
+            for keyword, page in sorted(pages, key=lambda key: (order[key[0]], key[1]))
+            for item in pages[(keyword, page)]
+        ]
+
+    def close(self):
+        """Close the client if this harvester created it; a shared client is left open."""
+        if self._owns_client:
+            self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _client_scope(client, api_key, email):
+    """``with`` target yielding ``client``, or a new ``USAJobsClient`` that is closed on exit."""
+    return contextlib.nullcontext(client) if client is not None else USAJobsClient(api_key, email)
+
+
+def _harvester_scope(harvester, api_key, email, client=None, **kwargs):
+    """``with`` target yielding ``harvester``, or a new ``USAJobsHarvester`` that is closed on exit."""
+    if harvester is not None:
+        return contextlib.nullcontext(harvester)
+    return USAJobsHarvester(api_key, email, client=client, **kwargs)
@@ -0,0 +1,24 @@
+import joblib
+import pytest
+
+from data_demand_mapper.toolkit import MODEL_REGISTRY, load_pipeline, preprocess_job_batch
+from data_demand_mapper.training import FEATURE_COLUMNS, LABEL_COLUMN, build_pipeline
+from tests.mockapi import synthetic_search_items
+
+
+@pytest.fixture(scope='session')
+def model_path(tmp_path_factory):
+    """A small pipeline fitted on synthetic postings; the packaged model is not in the repository."""
+    items = synthetic_search_items(400, seed=4, signal_rate=0.3)
+    frame = preprocess_job_batch([item['MatchedObjectDescriptor'] for item in items])
+    path = str(tmp_path_factory.mktemp('model') / 'model.joblib')
+    joblib.dump(build_pipeline(smote=False).fit(frame[FEATURE_COLUMNS], frame[LABEL_COLUMN]), path)
+    return path
+
+
+@pytest.fixture
+def model(model_path):
+    """Point the shared pipeline at ``model_path`` for one test."""
+    previous = MODEL_REGISTRY.model_path, MODEL_REGISTRY.mmap_mode
+    yield load_pipeline(model_path)
+    MODEL_REGISTRY.configure(*previous)
@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import json
+import math
+import random
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from data_demand_mapper.toolkit import LARGE_AGENCIES, MEDIUM_AGENCIES, RELATED_PHRASES, SIGNAL_PHRASES, USE_CASE_KEYWORDS
+
+# ------------------------
+# Synthetic USAJobs Payloads
+# ------------------------
+
+SYNTHETIC_TITLES = [
+    'Data Scientist', 'Senior Data Scientist', 'Contract Specialist', 'IT Specialist', 'Budget Analyst',
+    'Program Analyst', 'Management Analyst', 'Lead Cybersecurity Engineer', 'Economist', 'Statistician',
+    'Chief Financial Officer', 'Marketing Specialist', 'Public Affairs Specialist', 'Nurse', 'Medical Officer',
+    'Procurement Analyst', 'Supervisory Operations Research Analyst', 'Policy Advisor', 'Auditor', 'Engineer',
+]
+SYNTHETIC_AGENCIES = LARGE_AGENCIES + MEDIUM_AGENCIES + [
+    'Small Business Administration', 'National Science Foundation', 'Office of Personnel Management',
+]
+_FILLER = (
+    'the of and to in for with support manage develop review analyze program office team federal agency '
+    'reports policies budget operations mission staff stakeholders systems projects guidance quality '
+    'requirements coordinate perform provide ensure maintain evaluate records information services'
+).split()
+
+
+def synthetic_search_items(n, seed=0, signal_rate=0.2):
+    """
+    Generate ``n`` USAJobs ``SearchResultItems`` with realistic titles, agencies and duty text.
+
+    About ``signal_rate`` of the postings mention a data-buying phrase and a use case
+    keyword, so preprocessing, fuzzy matching and ranking all have work to do.
+    The output is deterministic for a given ``seed``.
+    """
+    rng = random.Random(seed)
+    phrases = RELATED_PHRASES + SIGNAL_PHRASES
+    use_case_terms = [term for terms in USE_CASE_KEYWORDS.values() for term in terms]
+
+    def text(words, signal):
+        parts = [rng.choice(_FILLER) for _ in range(words)]
+        if signal:
+            parts.insert(rng.randrange(len(parts) + 1), rng.choice(phrases))
+            parts.insert(rng.randrange(len(parts) + 1), rng.choice(use_case_terms))
+        return ' '.join(parts).capitalize() + '.'
+
+    items = []
+    for i in range(n):
+        signal = rng.random() < signal_rate
+        job_id = str(700000 + i)
+        items.append({
+            'MatchedObjectId': job_id,
+            'MatchedObjectDescriptor': {
+                'PositionID': f'SYN-{job_id}',
+                'PositionTitle': rng.choice(SYNTHETIC_TITLES),
+                'OrganizationName': rng.choice(SYNTHETIC_AGENCIES),
+                'DepartmentName': rng.choice(LARGE_AGENCIES),
+                'ApplicationCloseDate': f'2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+                'UserArea': {'Details': {
+                    'JobSummary': text(rng.randint(40, 120), signal),
+                    'MajorDuties': [text(rng.randint(10, 40), signal and rng.random() < 0.5)
+                                    for _ in range(rng.randint(1, 4))],
+                }},
+            },
+        })
+    return items
+
+
+# ------------------------
+# Local Mock Search Endpoint
+# ------------------------
+
+class _SearchHandler(BaseHTTPRequestHandler):
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        mock = self.server.mock
+        query = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+        keyword = query.get('Keyword', '')
+        per_page = min(int(query.get('ResultsPerPage', 25)), mock.max_results_per_page)
+        page = int(query.get('Page', 1))
+
+        if mock.latency:
+            time.sleep(mock.latency)
+        failure = mock._inject_error()
+        if failure is not None:
+            status, retry_after = failure
+            self.send_response(status)
+            if retry_after is not None:
+                self.send_header('Retry-After', str(retry_after))
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        items = mock.items_for(keyword)
+        chunk = items[(page - 1) * per_page:page * per_page]
+        result = {
+            'SearchResultCount': len(chunk),
+            'SearchResultCountAll': len(items),
+            'SearchResultItems': chunk,
+            'UserArea': {'NumberOfPages': str(math.ceil(len(items) / per_page))} if mock.report_pages else {},
+        }
+        body = json.dumps({'SearchResult': result}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MockSearchServer:
+    """
+    Local stand-in for the USAJobs Search endpoint, for offline tests and benchmarks.
+
+    Each keyword returns a deterministic sample of ``items`` (overlapping across keywords,
+    like the real API), paginated by ``Page`` and ``ResultsPerPage``. A keyword equal to a
+    posting's ``MatchedObjectId`` or ``PositionID`` returns just that posting. Responses can be
+    delayed by ``latency`` seconds and a fraction ``error_rate`` of them fail with 503.
+    ``failures`` scripts the first responses instead, e.g. ``[429, (503, '2'), 500]``.
+
+    Args:
+        items (list[dict]): SearchResultItems to serve; defaults to 1,000 synthetic postings.
+        keyword_share (float): Fraction of ``items`` each keyword matches.
+        latency (float): Seconds to wait before every response.
+        error_rate (float): Probability of a 503 response.
+        failures (list): Statuses returned, in order, by the first requests before any random
+            errors; an entry may be a ``(status, retry_after)`` pair, where ``retry_after`` is the
+            Retry-After header value or None to leave the header out (plain statuses send none).
+        report_pages (bool): Include ``UserArea.NumberOfPages`` in responses.
+        seed (int): Seed for keyword samples and error injection.
+    """
+
+    def __init__(self, items=None, keyword_share=0.3, latency=0.0, error_rate=0.0, report_pages=True,
+                 max_results_per_page=500, seed=0, failures=()):
+        self.items = synthetic_search_items(1000, seed) if items is None else items
+        self.keyword_share = keyword_share
+        self.latency = latency
+        self.error_rate = error_rate
+        self.report_pages = report_pages
+        self.max_results_per_page = max_results_per_page
+        self.seed = seed
+        self.failures = deque(failure if isinstance(failure, tuple) else (failure, None) for failure in failures)
+        self.hits = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._by_keyword = {}
+        self._by_id = {}
+        for item in self.items:
+            self._by_id[item['MatchedObjectId']] = item
+            self._by_id[item['MatchedObjectDescriptor'].get('PositionID')] = item
+        self._server = None
+
+    def items_for(self, keyword):
+        if keyword in self._by_id:
+            return [self._by_id[keyword]]
+        with self._lock:
+            if keyword not in self._by_keyword:
+                rng = random.Random(f'{self.seed}:{keyword}')
+                size = int(len(self.items) * self.keyword_share)
+                self._by_keyword[keyword] = rng.sample(self.items, size)
+            return self._by_keyword[keyword]
+
+    def _inject_error(self):
+        with self._lock:
+            self.hits += 1
+            if self.failures:
+                self.errors += 1
+                return self.failures.popleft()
+            failed = self._rng.random() < self.error_rate
+            self.errors += failed
+            return (503, '0') if failed else None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/api/Search'
+
+    def start(self):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), _SearchHandler)
+        self._server.daemon_threads = True
+        self._server.mock = self
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
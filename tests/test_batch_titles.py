@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from data_demand_mapper.toolkit import batch_fetch_and_score_jobs, fetch_and_score_job, search_job_ids_by_title
+from data_demand_mapper.usajobs import USAJobsClient
+from tests.mockapi import SYNTHETIC_TITLES, MockSearchServer, synthetic_search_items
+
+TITLES = SYNTHETIC_TITLES[:8] + ['Data Scientist', 'Economist', 'Budget Analyst']
+
+
+@pytest.fixture
+def server():
+    with MockSearchServer(synthetic_search_items(200, seed=13, signal_rate=0.4)) as server:
+        yield server
+
+
+def _client(server):
+    return USAJobsClient('key', 'me@example.com', base_url=server.url)
+
+
+def _two_call_loop(titles, client):
+    """Search each title, then fetch and score its first posting by PositionID."""
+    results = {}
+    for title in titles:
+        found = search_job_ids_by_title(title, 'key', 'me@example.com', max_results=1, client=client)
+        if found:
+            results[title] = fetch_and_score_job(found[0]['job_id'], 'key', 'me@example.com', client=client)
+    return results
+
+
+@pytest.mark.parametrize('max_workers', [1, 8])
+def test_matches_search_then_fetch(server, model, max_workers):
+    expected = _two_call_loop(TITLES, _client(server))
+    hits = server.hits
+
+    scored = batch_fetch_and_score_jobs(TITLES, 'key', 'me@example.com', client=_client(server),
+                                        max_workers=max_workers)
+    assert server.hits - hits == len(set(TITLES))
+    assert scored['query'].tolist() == list(dict.fromkeys(TITLES))
+    assert (scored['status'] == 'ok').all()
+    for row in scored.itertuples():
+        assert (row.data_buyer_score, row.title, row.agency) == (
+            expected[row.query]['data_buyer_score'], expected[row.query]['title'], expected[row.query]['agency'])
+
+
+def test_not_found_and_errors(model):
+    with MockSearchServer([]) as server:
+        scored = batch_fetch_and_score_jobs(['Data Scientist'], 'key', 'me@example.com', client=_client(server))
+    assert scored['status'].tolist() == ['not_found'] and np.isnan(scored['data_buyer_score'][0])
+
+    with MockSearchServer(synthetic_search_items(50), failures=[404]) as server:
+        scored = batch_fetch_and_score_jobs(['Economist', 'Nurse'], 'key', 'me@example.com',
+                                            client=_client(server), max_workers=1)
+    assert scored['status'].tolist() == ['error', 'ok']
+    assert '404' in scored['error'][0] and scored['data_buyer_score'][1] >= 0
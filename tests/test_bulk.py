@@ -0,0 +1,59 @@
+import io
+
+import pandas as pd
+import pytest
+
+from data_demand_mapper.bulk import score_csv, score_dataframe
+from data_demand_mapper.toolkit import detect_use_case, preprocess_job_batch, score_frame
+from tests.mockapi import synthetic_search_items
+
+COLUMNS = {'JobTitle': 'title', 'Agency': 'agency', 'JobDescription': 'summary', 'KeyDuties': 'duties'}
+
+
+@pytest.fixture(scope='module')
+def dataset():
+    rows = []
+    for item in synthetic_search_items(150, seed=3, signal_rate=0.4):
+        descriptor = item['MatchedObjectDescriptor']
+        details = descriptor['UserArea']['Details']
+        rows.append({
+            'job_id': item['MatchedObjectId'],
+            'title': descriptor['PositionTitle'],
+            'agency': descriptor['OrganizationName'],
+            'summary': details['JobSummary'],
+            'duties': ' '.join(details['MajorDuties']),
+        })
+    return pd.DataFrame(rows, index=pd.RangeIndex(1000, 1150))
+
+
+def _plain(dataset):
+    raw = dataset.rename(columns={source: target for target, source in COLUMNS.items()})
+    processed = preprocess_job_batch(raw[list(COLUMNS)])
+    processed['data_buyer_score'] = score_frame(processed)
+    processed['DetectedUseCase'] = detect_use_case(processed)
+    return pd.concat([dataset, processed.drop(columns=['CombinedText'])], axis=1)
+
+
+@pytest.mark.parametrize('workers, chunksize', [(1, 10_000), (1, 40), (2, 40)])
+def test_score_dataframe_matches_one_batch(dataset, model, workers, chunksize):
+    scored = score_dataframe(dataset, columns=COLUMNS, workers=workers, chunksize=chunksize)
+    pd.testing.assert_frame_equal(scored, _plain(dataset), check_dtype=False)
+
+
+def test_keep_columns_and_empty_input(dataset, model):
+    scored = score_dataframe(dataset, columns=COLUMNS, keep_columns=['job_id'])
+    assert scored.columns[0] == 'job_id' and 'summary' not in scored.columns
+    empty = score_dataframe(dataset.iloc[:0], columns=COLUMNS)
+    assert empty.empty and {'data_buyer_score', 'DetectedUseCase'} <= set(empty.columns)
+    with pytest.raises(ValueError):
+        score_dataframe(dataset.drop(columns=['title']), columns=COLUMNS)
+
+
+def test_score_csv_matches_one_batch(dataset, model, tmp_path):
+    source, out = tmp_path / 'postings.csv', tmp_path / 'scored.csv'
+    dataset.to_csv(source, index=False)
+    stats = score_csv(str(source), str(out), chunksize=40, workers=2, columns=COLUMNS)
+    assert (stats['rows'], stats['chunks']) == (150, 4)
+
+    expected = pd.read_csv(io.StringIO(_plain(dataset).to_csv(index=False)))
+    pd.testing.assert_frame_equal(pd.read_csv(out), expected, check_dtype=False)
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from data_demand_mapper.compiled import CompiledScorer, export_compiled_model
+from data_demand_mapper.toolkit import preprocess_job_batch
+from data_demand_mapper.training import FEATURE_COLUMNS, LABEL_COLUMN, build_pipeline
+from tests.mockapi import synthetic_search_items
+
+
+@pytest.fixture(scope='module')
+def split():
+    items = synthetic_search_items(600, seed=11, signal_rate=0.3)
+    frame = preprocess_job_batch([item['MatchedObjectDescriptor'] for item in items])
+    return frame.iloc[:450], frame.iloc[450:].reset_index(drop=True)
+
+
+def test_compiled_scores_match_pipeline(split, tmp_path):
+    train, held_out = split
+    pipeline = build_pipeline(smote=False).fit(train[FEATURE_COLUMNS], train[LABEL_COLUMN])
+
+    path = tmp_path / 'model.npz'
+    export_compiled_model(str(path), pipeline=pipeline, validation_frame=held_out)
+    scorer = CompiledScorer.load(str(path))
+
+    expected = pipeline.predict_proba(held_out[FEATURE_COLUMNS])[:, 1]
+    np.testing.assert_allclose(scorer.score(held_out), expected, rtol=0, atol=1e-9)
+    # Unseen agencies, industries and vocabulary still score like the pipeline
+    unseen = held_out.head(5).assign(Industry='Unknown', AgencySize='Unknown', CombinedText='zzz qqq')
+    np.testing.assert_allclose(scorer.score(unseen), pipeline.predict_proba(unseen[FEATURE_COLUMNS])[:, 1],
+                               rtol=0, atol=1e-9)
@@ -0,0 +1,94 @@
+import random
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from data_demand_mapper.dedupe import duplicate_groups, minhash_signatures
+from data_demand_mapper.toolkit import preprocess_job_batch
+from tests.mockapi import synthetic_search_items
+
+
+def _shingles(text, size=3):
+    tokens = text.split()
+    if len(tokens) <= size:
+        return {' '.join(tokens)}
+    return {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def _jaccard(a, b):
+    a, b = _shingles(a), _shingles(b)
+    return len(a & b) / len(a | b)
+
+
+def _texts(n=40, seed=0):
+    """Unrelated texts, each followed by copies with zero to a few words changed."""
+    rng = random.Random(seed)
+    texts = []
+    for item in synthetic_search_items(n, seed=seed):
+        base = item['MatchedObjectDescriptor']['UserArea']['Details']['JobSummary'].split()
+        texts.append(' '.join(base))
+        for edits in rng.sample([0, 1, 1, 3, 20], 3):
+            words = list(base)
+            for _ in range(edits):
+                words[rng.randrange(len(words))] = 'changed'
+            texts.append(' '.join(words))
+    rng.shuffle(texts)
+    return texts
+
+
+def test_exact_groups_match_first_occurrence():
+    texts = _texts() + [None, '', None, '']
+    representatives, inverse = duplicate_groups(texts)
+    first = {}
+    for i, text in enumerate(texts):
+        first.setdefault(text, i)
+        assert representatives[inverse[i]] == first[text]
+    assert len(representatives) == len(first)
+    assert list(representatives) == sorted(first.values())
+
+
+def test_near_groups_agree_with_jaccard():
+    texts = _texts()
+    representatives, inverse = duplicate_groups(texts, near_duplicates=True, threshold=0.9)
+    exact, _ = duplicate_groups(texts)
+    assert len(representatives) < len(exact)
+
+    for i, j in combinations(range(len(texts)), 2):
+        similarity = _jaccard(texts[i], texts[j])
+        if similarity == 1.0:
+            assert inverse[i] == inverse[j]
+        if similarity < 0.5:
+            assert inverse[i] != inverse[j], (texts[i], texts[j])
+    for group in np.unique(inverse):
+        members = np.flatnonzero(inverse == group)
+        assert representatives[group] == members[0]
+
+
+def test_minhash_estimates_jaccard():
+    texts = _texts(10, seed=3)
+    signatures = minhash_signatures(texts, num_perm=256)
+    errors = [abs((signatures[i] == signatures[j]).mean() - _jaccard(texts[i], texts[j]))
+              for i, j in combinations(range(len(texts)), 2)]
+    assert max(errors) < 0.15 and np.mean(errors) < 0.03
+
+
+def test_near_duplicate_preprocessing_reuses_representative_features():
+    items = synthetic_search_items(30, seed=5, signal_rate=0.5)
+    descriptors = [item['MatchedObjectDescriptor'] for item in items]
+    copies = []
+    for descriptor in descriptors[:10]:
+        copy = {**descriptor, 'UserArea': {'Details': dict(descriptor['UserArea']['Details'])}}
+        copy['UserArea']['Details']['JobSummary'] += ' Apply now.'
+        copies.append(copy)
+    jobs = descriptors + copies
+
+    plain = preprocess_job_batch(jobs)
+    collapsed = preprocess_job_batch(jobs, near_duplicates=True)
+    _, inverse = duplicate_groups(plain['CombinedText'], near_duplicates=True)
+    assert len(np.unique(inverse)) < len(jobs)
+    features = [col for col in plain.columns if col != 'CombinedText']
+    for position, group in enumerate(inverse):
+        representative = np.flatnonzero(inverse == group)[0]
+        pd.testing.assert_series_equal(collapsed.iloc[position][features], plain.iloc[representative][features],
+                                       check_names=False)
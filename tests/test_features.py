@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from data_demand_mapper import features  # noqa: E402
+from data_demand_mapper.features import (  # noqa: E402
+    FeatureSchemaMismatch,
+    feature_store_info,
+    read_features,
+    score_features,
+    write_features,
+)
+from data_demand_mapper.toolkit import _model_columns, preprocess_job_batch, score_frame  # noqa: E402
+from tests.mockapi import synthetic_search_items  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def processed():
+    items = synthetic_search_items(120, seed=7, signal_rate=0.4)
+    frame = preprocess_job_batch([item['MatchedObjectDescriptor'] for item in items])
+    frame.insert(0, 'JobID', [item['MatchedObjectId'] for item in items])
+    return frame
+
+
+def _as_plain(frame):
+    frame = frame.reset_index(drop=True).copy()
+    for col in frame.columns:
+        if isinstance(frame[col].dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(frame[col]):
+            frame[col] = frame[col].astype(object)
+    return frame
+
+
+@pytest.mark.parametrize('compression', ['zstd', 'snappy', 'none'])
+def test_round_trip_matches_preprocessed_frame(processed, tmp_path, compression):
+    path = str(tmp_path / 'features.parquet')
+    info = write_features(processed, path, compression=compression)
+    assert info['rows'] == len(processed)
+    assert feature_store_info(path)['feature_schema'] == info['feature_schema']
+
+    restored = read_features(path)
+    assert isinstance(restored['Industry'].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(_as_plain(restored), _as_plain(processed), check_dtype=False)
+
+    subset = read_features(path, columns=['JobID', 'IsDataBuyer'], memory_map=False)
+    assert subset.columns.tolist() == ['JobID', 'IsDataBuyer']
+
+
+def test_scores_match_scoring_the_frame(processed, tmp_path, model):
+    path = str(tmp_path / 'features.parquet')
+    write_features(processed, path)
+    np.testing.assert_allclose(score_features(path, model), score_frame(processed, model))
+
+
+def test_schema_and_input_checks(processed, tmp_path, monkeypatch):
+    path = str(tmp_path / 'features.parquet')
+    with pytest.raises(ValueError):
+        write_features(processed.drop(columns=[_model_columns()[0]]), path)
+    write_features(processed, path)
+
+    monkeypatch.setattr(features, 'feature_fingerprint', lambda: 'rules changed')
+    with pytest.raises(FeatureSchemaMismatch):
+        read_features(path)
+    assert len(read_features(path, check_schema=False)) == len(processed)
+
+    processed.to_parquet(tmp_path / 'other.parquet')
+    with pytest.raises(ValueError):
+        feature_store_info(str(tmp_path / 'other.parquet'))
+
+    monkeypatch.setattr(features, 'pq', None)
+    with pytest.raises(ImportError, match='pip install'):
+        read_features(path)
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from data_demand_mapper.toolkit import SIGNAL_PHRASES, TEXT_MATCHER, fuzzy_match, fuzzy_signal_match
+from tests.mockapi import synthetic_search_items
+
+
+@pytest.fixture(scope='module')
+def texts():
+    texts = []
+    for item in synthetic_search_items(300, seed=3, signal_rate=0.5):
+        details = item['MatchedObjectDescriptor']['UserArea']['Details']
+        texts.append((details['JobSummary'] + ' ' + ' '.join(details['MajorDuties'])).lower())
+    # Verbatim hits on late phrases whose text can fuzzily match an earlier phrase
+    texts += [
+        'we manage vendor management and data contracts for the office',
+        'buy data from the commercial data market',
+        'data assets and data commercialization',
+        'External Data purchasing',
+        '',
+    ]
+    return texts
+
+
+@pytest.mark.parametrize('threshold', [60, 80, 90, 100])
+def test_matches_fuzzy_match(texts, threshold):
+    expected = [fuzzy_match(text, SIGNAL_PHRASES, threshold) for text in texts]
+    assert list(fuzzy_signal_match(texts, threshold=threshold)) == expected
+
+
+@pytest.mark.parametrize('threshold', [60, 80, 90, 100])
+def test_exact_hits_do_not_change_the_result(texts, threshold):
+    expected = [fuzzy_match(text, SIGNAL_PHRASES, threshold) for text in texts]
+    exact_hits = TEXT_MATCHER.match_frame(texts)['IsDataBuyer'].to_numpy() == 1
+    assert exact_hits.any()
+    assert list(fuzzy_signal_match(texts, threshold=threshold, exact_hits=exact_hits)) == expected
+    every_row = np.ones(len(texts), dtype=bool)
+    assert list(fuzzy_signal_match(texts, threshold=threshold, exact_hits=every_row)) == expected
+
+
+def test_custom_phrases_and_empty_input():
+    phrases = ['Data Broker', 'survey data']
+    texts = ['we use a data broker', 'Survey Data collection', 'nothing relevant']
+    assert list(fuzzy_signal_match(texts, phrases=phrases, threshold=85)) == [
+        fuzzy_match(text, phrases, 85) for text in texts
+    ]
+    assert len(fuzzy_signal_match([])) == 0
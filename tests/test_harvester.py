@@ -0,0 +1,104 @@
+import math
+import time
+
+import pytest
+
+from data_demand_mapper.usajobs import HarvestIncomplete, TokenBucket, USAJobsClient, USAJobsHarvester, _page_count
+from tests.mockapi import MockSearchServer, synthetic_search_items
+
+KEYWORDS = ['data', 'contract', 'analyst', 'data']
+PER_PAGE = 40
+
+
+@pytest.fixture
+def server():
+    with MockSearchServer(synthetic_search_items(300, seed=5), keyword_share=0.4) as server:
+        yield server
+
+
+def _harvester(server, **kwargs):
+    kwargs.setdefault('requests_per_second', None)
+    return USAJobsHarvester(client=USAJobsClient('key', 'me@example.com', base_url=server.url),
+                            results_per_page=PER_PAGE, **kwargs)
+
+
+def _serial_crawl(server, keywords):
+    """Page through every keyword one request at a time until an empty page."""
+    client = USAJobsClient('key', 'me@example.com', base_url=server.url)
+    pairs = []
+    for keyword in keywords:
+        page = 1
+        while True:
+            params = {'Keyword': keyword, 'ResultsPerPage': PER_PAGE, 'Page': page}
+            items = client.search(params).json()['SearchResult']['SearchResultItems']
+            if not items:
+                break
+            pairs += [(keyword, item) for item in items]
+            page += 1
+    return pairs
+
+
+def test_harvest_equals_serial_crawl_without_empty_pages(server):
+    expected = _serial_crawl(server, dict.fromkeys(KEYWORDS))
+    server.hits = 0
+    harvester = _harvester(server, max_workers=4)
+    assert harvester.harvest(KEYWORDS) == expected
+    per_keyword = math.ceil(len(server.items_for('data')) / PER_PAGE)
+    assert server.hits == len(set(KEYWORDS)) * per_keyword
+    assert harvester.failed_pages == []
+    assert list(harvester.iter_items(KEYWORDS)) == expected
+
+
+def test_unreported_page_count_pages_until_empty(server, monkeypatch):
+    expected = _serial_crawl(server, dict.fromkeys(KEYWORDS))
+    monkeypatch.setattr('data_demand_mapper.usajobs._page_count', lambda data, results_per_page: None)
+    harvester = _harvester(server)
+    assert harvester.harvest(KEYWORDS) == expected
+    assert list(harvester.iter_items(KEYWORDS)) == expected
+
+
+def _failing_harvester(failures):
+    server = MockSearchServer(synthetic_search_items(100, seed=5), failures=failures).start()
+    client = USAJobsClient('key', 'me@example.com', base_url=server.url, max_retries=0)
+    return server, USAJobsHarvester(client=client, results_per_page=PER_PAGE, requests_per_second=None,
+                                    max_workers=1)
+
+
+def test_failed_pages_are_logged(caplog):
+    server, harvester = _failing_harvester([503])
+    try:
+        with caplog.at_level('WARNING', logger='data_demand_mapper'):
+            harvester.harvest(['data'])
+    finally:
+        server.stop()
+    assert harvester.failed_pages == [('data', 1, 503)]
+    assert "1 result page failed after retries ('data' page 1)" in caplog.text
+    assert 'partial' in caplog.text
+
+
+@pytest.mark.parametrize('method', ['harvest', 'iter_items'])
+def test_strict_raises_on_failed_pages(method):
+    server, harvester = _failing_harvester([503])
+    try:
+        with pytest.raises(HarvestIncomplete, match="'data' page 1") as info:
+            list(getattr(harvester, method)(['data'], strict=True))
+        assert info.value.failed_pages == [('data', 1, 503)]
+        assert list(getattr(harvester, method)(['data'], strict=True))
+    finally:
+        server.stop()
+
+
+def test_page_count_falls_back_to_result_count():
+    assert _page_count({'SearchResult': {'UserArea': {'NumberOfPages': '3'}}}, 500) == 3
+    assert _page_count({'SearchResult': {'UserArea': {}, 'SearchResultCountAll': 1001}}, 500) == 3
+    assert _page_count({'SearchResult': {'UserArea': {'NumberOfPages': ''}}}, 500) is None
+
+
+def test_token_bucket_limits_request_starts():
+    bucket = TokenBucket(20, capacity=1)
+    started = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    assert time.monotonic() - started >= 5 / 20 * 0.9
+    with pytest.raises(ValueError):
+        TokenBucket(0)
@@ -0,0 +1,58 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cold import budgets: seconds, and heavy dependencies the import must not pull in
+IMPORT_BUDGETS = {
+    'data_demand_mapper': (0.05, ['pandas', 'sklearn', 'scipy', 'rapidfuzz', 'joblib', 'requests']),
+    'data_demand_mapper.compiled': (0.3, ['pandas', 'sklearn', 'scipy', 'rapidfuzz', 'joblib', 'requests']),
+    'data_demand_mapper.toolkit': (1.0, ['sklearn', 'scipy', 'rapidfuzz', 'joblib']),
+}
+
+
+def _run(*args):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [ROOT, env.get('PYTHONPATH')]))
+    return subprocess.run([sys.executable, *args], env=env, capture_output=True, text=True, check=True)
+
+
+def _importtime(code):
+    """Top-level modules and their cumulative microseconds from ``python -X importtime -c code``."""
+    modules = {}
+    for line in _run('-X', 'importtime', '-c', code).stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        modules[name.strip()] = (int(cumulative), name.startswith('  '))
+    return modules
+
+
+def import_time(module):
+    """Cold import seconds of ``module`` in a fresh interpreter, excluding interpreter startup."""
+    startup = _importtime('pass')
+    loaded = {name: timing for name, timing in _importtime(f'import {module}').items() if name not in startup}
+    return sum(microseconds for microseconds, nested in loaded.values() if not nested) / 1e6
+
+
+def _loaded_after_import(module):
+    output = _run('-c', f'import json, sys; import {module}; print(json.dumps(sorted(sys.modules)))').stdout
+    return {name.split('.')[0] for name in json.loads(output)}
+
+
+def test_package_import_is_lightweight():
+    loaded = _loaded_after_import('data_demand_mapper')
+    assert not {'pandas', 'sklearn', 'rapidfuzz'} & loaded
+
+
+@pytest.mark.parametrize('module', sorted(IMPORT_BUDGETS))
+def test_import_budget(module):
+    budget, forbidden = IMPORT_BUDGETS[module]
+    assert not set(forbidden) & _loaded_after_import(module)
+    # Best of three cold imports, so a briefly busy machine does not fail the budget
+    seconds = min(import_time(module) for _ in range(3))
+    assert seconds <= budget, f'import {module} took {seconds:.3f}s (budget {budget}s)'
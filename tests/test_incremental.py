@@ -0,0 +1,95 @@
+import pandas as pd
+import pytest
+
+from data_demand_mapper.incremental import PostingStore
+from data_demand_mapper.toolkit import preprocess_job_batch, score_frame
+from tests.mockapi import synthetic_search_items
+
+
+def _postings(n=60, seed=2):
+    rows = []
+    for item in synthetic_search_items(n, seed=seed, signal_rate=0.4):
+        descriptor = item['MatchedObjectDescriptor']
+        details = descriptor['UserArea']['Details']
+        rows.append({
+            'JobID': item['MatchedObjectId'],
+            'JobTitle': descriptor['PositionTitle'],
+            'Agency': descriptor['OrganizationName'],
+            'JobDescription': details['JobSummary'],
+            'KeyDuties': details['MajorDuties'],
+            'ApplicationCloseDate': descriptor['ApplicationCloseDate'],
+        })
+    return pd.DataFrame(rows)
+
+
+def _plain(postings, pipeline):
+    processed = preprocess_job_batch(postings)
+    processed['data_buyer_score'] = score_frame(processed, pipeline)
+    return processed
+
+
+def _assert_same(result, expected):
+    pd.testing.assert_frame_equal(result, expected[result.columns], check_dtype=False)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PostingStore(str(tmp_path / 'postings.sqlite'))
+    yield store
+    store.close()
+
+
+def test_reused_results_match_plain_scoring(store, model):
+    postings = _postings()
+    expected = _plain(postings, model)
+
+    _assert_same(store.score(postings), expected)
+    assert store.last_run == {'postings': 60, 'new_or_changed': 60, 'rescored': 0, 'reused': 0}
+
+    shuffled = postings.sample(frac=1, random_state=0).reset_index(drop=True)
+    _assert_same(store.score(shuffled), _plain(shuffled, model))
+    assert store.last_run['reused'] == 60
+    assert len(store) == 60
+
+
+def test_changed_and_new_postings_are_reprocessed(store, model):
+    postings = _postings()
+    store.score(postings)
+
+    changed = postings.copy()
+    changed.at[3, 'JobTitle'] = 'Chief Data Officer'
+    changed.at[7, 'KeyDuties'] = ['Procure commercial data sets for fraud detection.']
+    changed = pd.concat([changed, _postings(5, seed=9).assign(JobID=lambda df: 'NEW-' + df['JobID'])],
+                        ignore_index=True)
+    _assert_same(store.score(changed), _plain(changed, model))
+    assert store.last_run == {'postings': 65, 'new_or_changed': 7, 'rescored': 0, 'reused': 58}
+
+
+def test_other_model_rescores_from_stored_features(store, model, monkeypatch):
+    postings = _postings()
+    store.score(postings)
+
+    def fail(*args, **kwargs):
+        raise AssertionError('stored features should be reused')
+
+    monkeypatch.setattr('data_demand_mapper.incremental.preprocess_job_batch', fail)
+    _assert_same(store.score(postings, pipeline=model, model_fingerprint='other'), _plain(postings, model))
+    assert store.last_run['rescored'] == 60
+    store.score(postings, pipeline=model, model_fingerprint='other')
+    assert store.last_run['reused'] == 60
+
+
+def test_postings_without_job_id_are_not_stored(store, model):
+    postings = _postings(10).assign(JobID=None)
+    _assert_same(store.score(postings), _plain(postings, model))
+    store.score(postings)
+    assert store.last_run['new_or_changed'] == 10
+    assert len(store) == 0
+
+
+def test_expire_closed_postings(store, model):
+    postings = _postings(20)
+    store.score(postings)
+    cutoff = sorted(postings['ApplicationCloseDate'])[10]
+    assert store.expire(closed_before=cutoff) == (postings['ApplicationCloseDate'] < cutoff).sum()
+    assert store.expire(unseen_for=3600) == 0
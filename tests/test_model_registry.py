@@ -0,0 +1,28 @@
+import os
+import threading
+
+import pytest
+
+from data_demand_mapper.toolkit import MODEL_REGISTRY, ModelRegistry, load_pipeline, reload_pipeline
+
+
+def test_missing_artifact_points_to_model_path_and_training(tmp_path):
+    registry = ModelRegistry()
+    if os.path.exists(registry.resolved_path):
+        pytest.skip('a packaged model is installed')
+    with pytest.raises(FileNotFoundError, match=r'load_pipeline\(model_path=\.\.\.\).*data-demand-mapper train'):
+        registry.get()
+    with pytest.raises(FileNotFoundError, match=str(tmp_path)):
+        ModelRegistry(str(tmp_path / 'missing.joblib')).get()
+
+
+def test_pipeline_is_loaded_once_and_shared(model, model_path):
+    pipelines = []
+    threads = [threading.Thread(target=lambda: pipelines.append(load_pipeline())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(pipeline is model for pipeline in pipelines)
+    assert load_pipeline(model_path) is model
+    assert reload_pipeline() is not model and load_pipeline() is MODEL_REGISTRY.get()
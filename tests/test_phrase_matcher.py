@@ -0,0 +1,64 @@
+import random
+import re
+
+import numpy as np
+import pytest
+
+from data_demand_mapper.toolkit import (INDUSTRY_KEYWORDS, RELATED_PHRASES, TEXT_MATCHER, USE_CASE_KEYWORDS,
+                                        PhraseMatcher)
+from tests.mockapi import synthetic_search_items
+
+# Overlapping and prefix-sharing phrases across groups
+GROUPS = {
+    'short': ['data', 'vendor'],
+    'long': ['data acquisition', 'external data acquisition', 'data vendor'],
+    'other': ['acquisition', 'c++', 'a.b'],
+}
+
+
+def _contains(texts, phrases):
+    pattern = re.compile('|'.join(map(re.escape, phrases)), re.IGNORECASE)
+    return np.array([isinstance(text, str) and pattern.search(text) is not None for text in texts], dtype=np.uint8)
+
+
+@pytest.fixture(scope='module')
+def texts():
+    rng = random.Random(1)
+    words = ['the', 'Data', 'external', 'acquisition', 'vendor', 'c++', 'axb', 'a.b', 'DATA ACQUISITION', 'datavendor']
+    texts = [' '.join(rng.choice(words) for _ in range(rng.randint(0, 8))) for _ in range(500)]
+    for item in synthetic_search_items(200, seed=2, signal_rate=0.5):
+        texts.append(item['MatchedObjectDescriptor']['UserArea']['Details']['JobSummary'].lower())
+    return texts + [None, '', 'data acquisitio', 'EXTERNAL DATA ACQUISITION']
+
+
+def test_match_matrix_equals_one_search_per_group(texts):
+    matcher = PhraseMatcher(GROUPS)
+    expected = np.column_stack([_contains(texts, phrases) for phrases in GROUPS.values()])
+    np.testing.assert_array_equal(matcher.match_matrix(texts), expected)
+
+
+def test_text_matcher_equals_keyword_searches(texts):
+    frame = TEXT_MATCHER.match_frame(texts)
+    np.testing.assert_array_equal(frame['IsDataBuyer'], _contains(texts, RELATED_PHRASES))
+    for use_case, keywords in USE_CASE_KEYWORDS.items():
+        np.testing.assert_array_equal(frame[f'UseCase_{use_case}'], _contains(texts, keywords))
+
+
+def test_first_group_follows_registration_order(texts):
+    matcher = PhraseMatcher(INDUSTRY_KEYWORDS)
+    expected = [
+        next((name for name, words in INDUSTRY_KEYWORDS.items() if any(word in text.lower() for word in words)), 'Other')
+        if isinstance(text, str) else 'Other'
+        for text in texts
+    ]
+    assert list(matcher.first_group(texts, default='Other')) == expected
+
+
+def test_register_replaces_a_group():
+    matcher = PhraseMatcher({'a': ['data vendor']})
+    assert matcher.find_groups('a data vendor') == ['a']
+    matcher.register('a', ['fraud'])
+    matcher.register('b', ['data'])
+    assert matcher.find_groups('a data vendor') == ['b']
+    assert matcher.find_groups('Fraud and DATA') == ['a', 'b']
+    assert list(PhraseMatcher().first_group(['x'], default='none')) == ['none']
@@ -0,0 +1,93 @@
+import random
+
+import pandas as pd
+import pytest
+
+from data_demand_mapper.postings import CompactPostings, compact_frame, expand_frame
+from data_demand_mapper.toolkit import preprocess_job_batch
+from tests.mockapi import synthetic_search_items
+
+
+def _harvest(keywords, n=120, seed=0):
+    """``(keyword, job)`` pairs where most postings are found by several keywords."""
+    rng = random.Random(seed)
+    items = synthetic_search_items(n, seed=seed)
+    items[3]['MatchedObjectDescriptor']['UserArea']['Details'].pop('MajorDuties')
+    items[4]['MatchedObjectDescriptor'].pop('DepartmentName')
+    items[5]['MatchedObjectDescriptor'] = {}
+    items.append({'MatchedObjectDescriptor': {'PositionTitle': 'No ID'}})
+    pairs = []
+    for keyword in keywords:
+        pairs += [(keyword, item) for item in rng.sample(items, len(items) // 3)]
+    return pairs
+
+
+def _plain(pairs, missing_duties=''):
+    """The per-posting dicts and keyword sets CompactPostings replaced."""
+    rows, found_by = {}, {}
+    for keyword, job in pairs:
+        job_id = job.get('MatchedObjectId')
+        if not job_id:
+            continue
+        if job_id not in rows:
+            descriptor = job.get('MatchedObjectDescriptor', {})
+            details = descriptor.get('UserArea', {}).get('Details', {})
+            duties = details.get('MajorDuties', missing_duties)
+            rows[job_id] = {
+                'JobID': job_id,
+                'JobTitle': descriptor.get('PositionTitle'),
+                'JobDescription': details.get('JobSummary'),
+                'KeyDuties': ' '.join(duties) if isinstance(duties, list) else duties,
+                'Agency': descriptor.get('OrganizationName'),
+                'Department': descriptor.get('DepartmentName'),
+                'ApplicationCloseDate': descriptor.get('ApplicationCloseDate'),
+            }
+            found_by[job_id] = []
+        if keyword not in found_by[job_id]:
+            found_by[job_id].append(keyword)
+    return pd.DataFrame(list(rows.values())), found_by
+
+
+def _objects(frame):
+    """Object columns with None for missing values, so str and categorical dtypes compare by value."""
+    return frame.astype(object).where(frame.notna(), None)
+
+
+@pytest.mark.parametrize('n_keywords', [5, 64, 70])
+def test_matches_per_posting_dicts(n_keywords):
+    keywords = [f'keyword {i}' for i in range(n_keywords)]
+    pairs = _harvest(keywords)
+    expected, found_by = _plain(pairs, missing_duties='N/A')
+
+    postings = CompactPostings(keywords[:3], missing_duties='N/A').extend(pairs)
+    assert len(postings) == len(expected) and postings.keywords == keywords
+    pd.testing.assert_frame_equal(_objects(postings.to_frame()), _objects(expected))
+
+    matrix = postings.keyword_matrix()
+    assert matrix.shape == (len(expected), n_keywords)
+    for row, job_id in enumerate(expected['JobID']):
+        by_order = sorted(found_by[job_id], key=keywords.index)
+        assert postings.search_keywords(row) == by_order
+        assert [keywords[i] for i in matrix[row].nonzero()[0]] == by_order
+    assert postings.to_frame(keywords=True)['SearchKeywords'].tolist() == [
+        sorted(found_by[job_id], key=keywords.index) for job_id in expected['JobID']]
+
+
+def test_categorical_frame_and_membership():
+    pairs = _harvest(['data', 'analyst'])
+    postings = CompactPostings().extend(pairs)
+    plain, categorical = postings.to_frame(), postings.to_frame(categorical=True)
+    assert isinstance(categorical['Agency'].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(_objects(categorical), _objects(plain))
+    assert plain['JobID'][0] in postings and 'missing' not in postings
+    assert postings.add(pairs[0][1]) is False
+
+
+def test_compact_frame_round_trip():
+    items = synthetic_search_items(60, seed=1, signal_rate=0.5)
+    processed = preprocess_job_batch([item['MatchedObjectDescriptor'] for item in items])
+    compacted = compact_frame(processed)
+    assert isinstance(compacted['Industry'].dtype, pd.CategoricalDtype)
+    assert compacted['UseCase_Fraud'].dtype == 'uint8'
+    assert compacted.memory_usage(deep=True).sum() < processed.memory_usage(deep=True).sum()
+    pd.testing.assert_frame_equal(expand_frame(compacted), processed, check_dtype=False)
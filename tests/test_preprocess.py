@@ -0,0 +1,115 @@
+import re
+
+import pandas as pd
+import pytest
+from rapidfuzz import fuzz, process
+
+from data_demand_mapper.toolkit import (COLUMNS_FOR_MODEL, GENERALIST_TITLES, INDUSTRY_KEYWORDS, LARGE_AGENCIES,
+                                        MEDIUM_AGENCIES, RELATED_PHRASES, SIGNAL_PHRASES, USE_CASE_KEYWORDS,
+                                        preprocess_job_api_response, preprocess_job_batch)
+from tests.mockapi import synthetic_search_items
+
+
+def _reference_row(job_json):
+    """The original one-DataFrame-per-posting preprocessing, kept as the parity oracle."""
+    details = job_json.get('UserArea', {}).get('Details', {})
+    desc, duties = details.get('JobSummary', ''), details.get('MajorDuties', '')
+    df = pd.DataFrame([{
+        'JobTitle': job_json.get('PositionTitle', ''),
+        'Agency': job_json.get('OrganizationName', ''),
+        'JobDescription': ' '.join(desc) if isinstance(desc, list) else desc,
+        'KeyDuties': ' '.join(duties) if isinstance(duties, list) else duties,
+    }])
+    df['CombinedText'] = (df['JobDescription'].fillna('') + ' ' + df['KeyDuties'].fillna('')).str.lower()
+    df['IsDataBuyer'] = df['CombinedText'].str.contains(
+        '|'.join(map(re.escape, RELATED_PHRASES)), case=False, na=False).astype(int)
+
+    def fuzzy_match(text):
+        for phrase in SIGNAL_PHRASES:
+            if fuzz.partial_ratio(phrase.lower(), text.lower()) >= 80:
+                return phrase
+        return None
+
+    df['IsFuzzyMatch'] = df['CombinedText'].apply(fuzzy_match).notnull().astype(int)
+    df['IsLikelyDataBuyer'] = ((df['IsDataBuyer'] == 1) | (df['IsFuzzyMatch'] == 1)).astype(int)
+    df['AgencySize'] = df['Agency'].apply(
+        lambda agency: 'Large' if agency in LARGE_AGENCIES else 'Medium' if agency in MEDIUM_AGENCIES else 'Small')
+
+    def classify_industry(row):
+        text = f"{row['JobTitle']} {row['Agency']}".lower()
+        for industry, words in INDUSTRY_KEYWORDS.items():
+            if any(word in text for word in words):
+                return industry
+        return 'Other'
+
+    df['Industry'] = df.apply(classify_industry, axis=1)
+    title = df['JobTitle'].str.lower()
+    df['IsSeniorRole'] = title.str.contains(
+        r'\bsenior\b|\blead\b|\bchief\b|\bprincipal\b|\bdirector\b|\bhead\b', na=False).astype(bool)
+    df['IsExplicitDataJob'] = title.str.contains(
+        'data|analyst|scientist|analytics|statistician|intelligence|information|it', na=False).astype(int)
+    for use_case, keywords in USE_CASE_KEYWORDS.items():
+        df[f'UseCase_{use_case}'] = df['CombinedText'].str.contains(
+            '|'.join(map(re.escape, keywords)), case=False, na=False).astype(int)
+    df['IsGeneralistRole'] = df['JobTitle'].apply(
+        lambda x: bool(x) and process.extractOne(x, GENERALIST_TITLES, scorer=fuzz.partial_ratio)[1] >= 65)
+    return df[COLUMNS_FOR_MODEL]
+
+
+def _assert_same_features(left, right):
+    """Equal values and dtypes in every model column; pandas' string inference may differ between the paths."""
+    def plain(frame):
+        frame = frame.copy()
+        for col in frame.select_dtypes(include=['object', 'string']).columns:
+            values = frame[col].astype(object)
+            frame[col] = values.where(values.notna(), None)
+        return frame
+
+    pd.testing.assert_frame_equal(plain(left), plain(right))
+
+
+def _descriptor(title='Data Scientist', agency='Department of Defense', summary='', duties=''):
+    return {'PositionTitle': title, 'OrganizationName': agency,
+            'UserArea': {'Details': {'JobSummary': summary, 'MajorDuties': duties}}}
+
+
+EDGE_CASES = [
+    {},
+    {'PositionTitle': 'Program Manager'},
+    _descriptor(summary=None, duties=None),
+    _descriptor(title='', agency='', summary='', duties=''),
+    _descriptor(title=None, agency=None, summary='Buy data for audits.', duties=['Data vendor', 'fraud review']),
+    _descriptor(title='Senior Budget Officer', duties=['Manage data contracts.', 'Patient matching', '']),
+    _descriptor(title='Chief Nurse', agency='Department of Health and Human Services', summary=['Clinical ', 'ops']),
+    _descriptor(title='Public Affairs Specialist', summary='Media monitoring and ad performance', duties=[]),
+    {'PositionTitle': 'IT Specialist', 'UserArea': {}},
+]
+
+
+@pytest.fixture(scope='module')
+def jobs():
+    return [item['MatchedObjectDescriptor'] for item in synthetic_search_items(300, seed=9, signal_rate=0.4)] + EDGE_CASES
+
+
+def test_batch_matches_row_by_row_reference(jobs):
+    expected = pd.concat([_reference_row(job) for job in jobs], ignore_index=True)
+    _assert_same_features(preprocess_job_batch(jobs), expected)
+
+
+@pytest.mark.parametrize('job', EDGE_CASES)
+def test_single_posting_matches_reference(job):
+    _assert_same_features(preprocess_job_api_response(job), _reference_row(job))
+
+
+def test_raw_frame_input_matches_descriptors(jobs):
+    frame = pd.DataFrame([{
+        'JobTitle': job.get('PositionTitle', ''),
+        'Agency': job.get('OrganizationName', ''),
+        'JobDescription': job.get('UserArea', {}).get('Details', {}).get('JobSummary', ''),
+        'KeyDuties': job.get('UserArea', {}).get('Details', {}).get('MajorDuties', ''),
+    } for job in jobs])
+    _assert_same_features(preprocess_job_batch(frame), preprocess_job_batch(jobs))
+
+
+def test_empty_batch_has_model_columns():
+    assert list(preprocess_job_batch([]).columns) == COLUMNS_FOR_MODEL
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_demand_mapper.toolkit import detect_use_case, top_n_positions, top_n_rows
+
+
+def _scores(n, seed=0):
+    rng = np.random.default_rng(seed)
+    scores = rng.integers(0, 50, n) / 50
+    scores[rng.random(n) < 0.05] = np.nan
+    return scores
+
+
+def _assign_detected_usecase(df_processed, default='General'):
+    """The row-by-row assignment detect_use_case replaced."""
+    usecase_columns = [col for col in df_processed.columns if col.startswith('UseCase_')]
+
+    def assign(row):
+        for col in usecase_columns:
+            if row[col] == 1:
+                return col.replace('UseCase_', '')
+        return default
+
+    return df_processed.apply(assign, axis=1)
+
+
+@pytest.mark.parametrize('top_n', [0, 1, 7, 100, 999, 1000, 5000])
+def test_top_n_rows_matches_sort_head(top_n):
+    df = pd.DataFrame({'data_buyer_score': _scores(1000), 'JobTitle': [f'job {i}' for i in range(1000)]},
+                      index=np.arange(1000)[::-1] * 3)
+    expected = df.sort_values('data_buyer_score', ascending=False, kind='stable').head(top_n)
+    pd.testing.assert_frame_equal(top_n_rows(df, top_n), expected)
+
+
+def test_top_n_positions_ties_and_nan():
+    scores = [0.5, np.nan, 0.9, 0.5, 0.9, 0.1, 0.5]
+    assert top_n_positions(scores, 4).tolist() == [2, 4, 0, 3]
+    assert top_n_positions(scores, 10).tolist() == [2, 4, 0, 3, 6, 5, 1]
+    assert top_n_positions([], 3).tolist() == []
+    assert top_n_rows(pd.DataFrame({'score': [1.0, 3.0, 2.0]}), 2, column='score')['score'].tolist() == [3.0, 2.0]
+
+
+def test_detect_use_case_matches_row_apply():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame(
+        (rng.random((500, 4)) < 0.2).astype(int),
+        columns=['UseCase_Fraud', 'UseCase_Sentiment', 'UseCase_PatientMatching', 'UseCase_AdTargeting'],
+        index=rng.permutation(500),
+    )
+    df.insert(0, 'JobTitle', 'Analyst')
+    expected = _assign_detected_usecase(df)
+    assert detect_use_case(df).tolist() == expected.tolist()
+    assert set(expected) == {'Fraud', 'Sentiment', 'PatientMatching', 'AdTargeting', 'General'}
+    assert detect_use_case(df, default='Other').tolist() == _assign_detected_usecase(df, 'Other').tolist()
+
+
+def test_detect_use_case_without_flags():
+    assert detect_use_case(pd.DataFrame({'JobTitle': ['a', 'b']})).tolist() == ['General', 'General']
+    assert detect_use_case(pd.DataFrame(columns=['UseCase_Fraud'])).tolist() == []
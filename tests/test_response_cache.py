@@ -0,0 +1,104 @@
+import zlib
+
+import pytest
+
+from data_demand_mapper.usajobs import OfflineCacheMiss, ResponseCache, USAJobsClient, USAJobsHarvester
+from tests.mockapi import MockSearchServer, synthetic_search_items
+
+URL = 'https://example.test/api/Search'
+KEYWORDS = ['data', 'contract', 'analyst']
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr('data_demand_mapper.usajobs.time.time', clock)
+    return clock
+
+
+@pytest.fixture
+def server():
+    with MockSearchServer(synthetic_search_items(200, seed=8), keyword_share=0.4) as server:
+        yield server
+
+
+def _harvest(server, **client_kwargs):
+    client = USAJobsClient('key', 'me@example.com', base_url=server.url, **client_kwargs)
+    harvester = USAJobsHarvester(client=client, results_per_page=30, requests_per_second=None)
+    with client:
+        return harvester.harvest(KEYWORDS), harvester.failed_pages, client.metrics.summary()
+
+
+def test_cached_and_offline_harvests_match_live(server, tmp_path):
+    live, _, _ = _harvest(server)
+    live_hits = server.hits
+
+    recorded, _, first = _harvest(server, cache=ResponseCache(str(tmp_path / 'cache.sqlite')))
+    assert recorded == live
+    assert first['cache_hits'] == 0 and server.hits == 2 * live_hits
+
+    replayed, failed, second = _harvest(server, cache=str(tmp_path / 'cache.sqlite'), offline=True)
+    assert replayed == live and failed == []
+    assert second['requests'] == 0 and second['cache_hits'] == live_hits
+    assert server.hits == 2 * live_hits
+
+
+def test_offline_miss_raises(server, tmp_path):
+    with pytest.raises(ValueError):
+        USAJobsClient('key', 'me@example.com', offline=True)
+    with USAJobsClient('key', 'me@example.com', base_url=server.url,
+                       cache=str(tmp_path / 'cache.sqlite'), offline=True) as client:
+        with pytest.raises(OfflineCacheMiss):
+            client.search({'Keyword': 'data', 'ResultsPerPage': 30, 'Page': 1})
+    assert server.hits == 0
+
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'), ttl=60)
+    cache.set(URL, {'Page': 1}, b'first')
+    clock.now += 30
+    cache.set(URL, {'Page': 2}, b'second')
+    assert cache.get(URL, {'Page': 1}) == b'first'
+
+    clock.now += 31
+    assert cache.get(URL, {'Page': 1}) is None
+    assert len(cache) == 1
+    assert cache.get(URL, {'Page': 2}) == b'second'
+
+    clock.now += 30
+    assert cache.purge_expired() == 1
+    assert len(cache) == 0
+
+
+def test_keys_ignore_parameter_order(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'), ttl=None)
+    cache.set(URL, {'Keyword': 'data', 'Page': 1}, b'body')
+    assert cache.get(URL, {'Page': '1', 'Keyword': 'data'}) == b'body'
+    assert cache.get(URL, {'Keyword': 'data', 'Page': 2}) is None
+    assert cache.get(URL + '/other', {'Keyword': 'data', 'Page': 1}) is None
+
+
+def test_evicts_least_recently_used(tmp_path, clock):
+    body = bytes(range(256)) * 4
+    size = len(zlib.compress(body))
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'), ttl=None, max_bytes=3 * size)
+    for page in (1, 2, 3):
+        clock.now += 1
+        cache.set(URL, {'Page': page}, body)
+    clock.now += 1
+    assert cache.get(URL, {'Page': 1}) == body
+
+    clock.now += 1
+    cache.set(URL, {'Page': 4}, body)
+    stats = cache.stats()
+    assert stats['entries'] == 3 and stats['bytes'] <= stats['max_bytes']
+    assert cache.get(URL, {'Page': 2}) is None
+    assert all(cache.get(URL, {'Page': page}) == body for page in (1, 3, 4))
@@ -0,0 +1,92 @@
+import pandas as pd
+import pytest
+
+from data_demand_mapper.streaming import iter_postings
+from data_demand_mapper.toolkit import (
+    detect_use_case,
+    fetch_and_score_top_by_industry_auto,
+    fetch_and_score_top_by_use_case_auto,
+    harvest_and_score,
+    preprocess_job_batch,
+    score_frame,
+)
+from data_demand_mapper.usajobs import USAJobsClient, USAJobsHarvester
+from tests.mockapi import MockSearchServer, synthetic_search_items
+
+
+@pytest.fixture(scope='module')
+def server():
+    with MockSearchServer(synthetic_search_items(300, seed=12, signal_rate=0.4), keyword_share=0.5) as server:
+        yield server
+
+
+def _harvester(server):
+    client = USAJobsClient('key', 'me@example.com', base_url=server.url)
+    return USAJobsHarvester(client=client, results_per_page=50, requests_per_second=None)
+
+
+@pytest.fixture
+def plain(server, model):
+    """Every posting scored the way each ranking function used to: one harvest, filter, sort."""
+    frame = pd.DataFrame(iter_postings(harvester=_harvester(server)))
+    processed = preprocess_job_batch(frame)
+    processed['data_buyer_score'] = score_frame(processed, model)
+    processed['DetectedUseCase'] = detect_use_case(processed)
+    return processed
+
+
+@pytest.fixture
+def corpus(server, model):
+    return harvest_and_score('key', 'me@example.com', harvester=_harvester(server))
+
+
+def _ranked(frame, top_n, columns):
+    return frame.sort_values('data_buyer_score', ascending=False, kind='stable').head(top_n)[columns]
+
+
+def _assert_same(result, expected):
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_categorical=False)
+
+
+def test_rankings_match_filter_and_sort(plain, corpus):
+    assert len(corpus) == len(plain)
+    for use_case in corpus.use_cases:
+        column = f'UseCase_{use_case}'
+        expected = _ranked(plain[plain[column] == 1], 15, ['JobTitle', 'Agency', 'data_buyer_score', column])
+        _assert_same(corpus.top_by_use_case(use_case, 15), expected)
+    for industry in corpus.industries:
+        matches = plain[plain['Industry'].str.lower() == industry.lower()]
+        expected = _ranked(matches, 15, ['JobTitle', 'Agency', 'data_buyer_score', 'DetectedUseCase'])
+        _assert_same(corpus.top_by_industry(industry.upper(), 15), expected)
+    with pytest.raises(ValueError):
+        corpus.top_by_use_case('Astrology')
+    assert corpus.top_by_industry('Astrology').empty
+
+
+def test_combined_filters_and_segments(plain, corpus):
+    columns = ['JobTitle', 'Agency', 'Industry', 'data_buyer_score', 'DetectedUseCase']
+    threshold = plain['data_buyer_score'].median()
+    _assert_same(corpus.top(top_n=1000, min_score=threshold),
+                 _ranked(plain[plain['data_buyer_score'] >= threshold], 1000, columns))
+
+    segments = corpus.segments(top_n=4)
+    expected = {}
+    for use_case in corpus.use_cases:
+        for industry in corpus.industries:
+            matches = plain[(plain[f'UseCase_{use_case}'] == 1) & (plain['Industry'] == industry)]
+            if len(matches):
+                expected[(use_case, industry)] = _ranked(matches, 4, columns)
+    assert segments.keys() == expected.keys()
+    for key, ranked in expected.items():
+        _assert_same(segments[key], ranked)
+
+
+def test_auto_functions_rank_from_one_corpus(server, plain, model):
+    by_use_case = fetch_and_score_top_by_use_case_auto('key', 'me@example.com', 'Fraud', top_n=10,
+                                                       harvester=_harvester(server))
+    by_industry = fetch_and_score_top_by_industry_auto('key', 'me@example.com', 'Finance', top_n=10,
+                                                       harvester=_harvester(server))
+    _assert_same(by_use_case, _ranked(plain[plain['UseCase_Fraud'] == 1], 10,
+                                      ['JobTitle', 'Agency', 'data_buyer_score', 'UseCase_Fraud']))
+    _assert_same(by_industry, _ranked(plain[plain['Industry'].str.lower() == 'finance'], 10,
+                                      ['JobTitle', 'Agency', 'data_buyer_score', 'DetectedUseCase']))
@@ -0,0 +1,41 @@
+from data_demand_mapper.service import MicroBatcher
+
+
+def _batcher(max_batch_size):
+    batches = []
+
+    def score(jobs):
+        batches.append(len(jobs))
+        return [float(job) for job in jobs]
+
+    return MicroBatcher(score, max_batch_size=max_batch_size, max_wait_ms=50), batches
+
+
+def _run(batcher, *requests):
+    # Queue everything before the worker starts, so every request is waiting when it collects a batch
+    futures = [batcher.submit(range(size)) for size in requests]
+    batcher.start()
+    try:
+        return [future.result(timeout=5) for future in futures]
+    finally:
+        batcher.stop()
+
+
+def test_batch_never_exceeds_max_batch_size():
+    batcher, batches = _batcher(max_batch_size=64)
+    results = _run(batcher, 60, 30)
+    assert batches == [60, 30]
+    assert [len(scores) for scores in results] == [60, 30]
+
+
+def test_small_requests_share_a_batch():
+    batcher, batches = _batcher(max_batch_size=64)
+    _run(batcher, 20, 30, 14, 5)
+    assert batches == [64, 5]
+
+
+def test_oversize_request_runs_alone():
+    batcher, batches = _batcher(max_batch_size=64)
+    results = _run(batcher, 10, 100, 10)
+    assert batches == [10, 100, 10]
+    assert results[1] == [float(i) for i in range(100)]
@@ -0,0 +1,91 @@
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from data_demand_mapper.sharding import (_ShardLock, merge_shards, plan_shards, run_shards, run_shards_parallel,
+                                         shard_status)
+from data_demand_mapper.toolkit import fetch_top_data_buyers_by_industry_custom
+from data_demand_mapper.usajobs import USAJobsClient, USAJobsHarvester
+from tests.mockapi import MockSearchServer, synthetic_search_items
+
+
+def _age(path, seconds):
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def test_lock_is_exclusive_until_stale(tmp_path):
+    path = str(tmp_path / 'shard.lock')
+    first, second = _ShardLock(path, stale_after=60), _ShardLock(path, stale_after=60)
+    assert first.acquire()
+    assert not second.acquire()
+    _age(path, 120)
+    assert second.acquire()
+    assert second.owned() and not first.owned()
+    assert os.listdir(tmp_path) == ['shard.lock']
+
+
+def test_broken_holder_does_not_remove_successors_lock(tmp_path):
+    path = str(tmp_path / 'shard.lock')
+    first, second = _ShardLock(path, stale_after=60), _ShardLock(path, stale_after=60)
+    assert first.acquire()
+    _age(path, 120)
+    assert second.acquire()
+    first.touch()
+    first.release()
+    assert second.owned()
+    second.release()
+    second.release()
+    assert not os.path.exists(path)
+
+
+def test_touch_keeps_a_long_shard_from_going_stale(tmp_path):
+    path = str(tmp_path / 'shard.lock')
+    holder, other = _ShardLock(path, stale_after=60), _ShardLock(path, stale_after=60)
+    assert holder.acquire()
+    _age(path, 120)
+    holder.touch()
+    assert not other.acquire()
+    assert holder.owned()
+
+
+def _harvester(url, results_per_page=500):
+    return USAJobsHarvester(client=USAJobsClient('key', 'me@example.com', base_url=url),
+                            requests_per_second=None, results_per_page=results_per_page)
+
+
+def test_parallel_resumed_run_matches_monolithic_ranking(model, tmp_path):
+    keywords = ['data', 'contract', 'analyst']
+    directory = str(tmp_path / 'run')
+    with MockSearchServer(synthetic_search_items(400, seed=8, signal_rate=0.4), keyword_share=0.5) as server:
+        manifest = plan_shards(directory, search_keywords=keywords, pages_per_shard=1,
+                               harvester=_harvester(server.url, 50))
+        assert len(manifest['shards']) == 12
+
+        # A worker finishes two shards, then dies holding the lock of a third
+        assert len(run_shards(directory, harvester=_harvester(server.url, 50), max_shards=2)) == 2
+        crashed = shard_status(directory)['pending_ids'][0]
+        lock = os.path.join(directory, 'shards', f'{crashed}.lock')
+        with open(lock, 'w') as handle:
+            handle.write('{}')
+        _age(lock, 120)
+        with pytest.raises(ValueError, match='not finished'):
+            merge_shards(directory)
+
+        finished = run_shards_parallel(directory, 'key', 'me@example.com', processes=2, requests_per_second=None,
+                                       stale_after=60, base_url=server.url)
+        assert crashed in finished and len(finished) == 10
+        status = shard_status(directory)
+        assert (status['finished'], status['running'], status['pending']) == (12, 0, 0)
+
+        corpus = merge_shards(directory)
+        for industry in ['Medical', 'Finance', 'Security/Tech', 'Other']:
+            expected = fetch_top_data_buyers_by_industry_custom(
+                'key', 'me@example.com', industry_name=industry, top_n=40, search_keywords=keywords,
+                harvester=_harvester(server.url)
+            )
+            assert len(expected)
+            pd.testing.assert_frame_equal(corpus.top_by_industry(industry, 40).reset_index(drop=True),
+                                          expected.reset_index(drop=True), check_dtype=False)
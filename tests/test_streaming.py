@@ -0,0 +1,67 @@
+import pandas as pd
+import pytest
+
+from data_demand_mapper.streaming import RunningTopN, iter_features, iter_postings, score_stream, stream_top_buyers
+from data_demand_mapper.toolkit import preprocess_job_batch, score_frame
+from data_demand_mapper.usajobs import USAJobsClient, USAJobsHarvester
+from tests.mockapi import MockSearchServer, synthetic_search_items
+
+KEYWORDS = ['data', 'analyst', 'contract']
+TOP_N = 7
+
+
+@pytest.fixture
+def server():
+    with MockSearchServer(synthetic_search_items(400, seed=6, signal_rate=0.4), keyword_share=0.5) as server:
+        yield server
+
+
+def _harvester(server):
+    client = USAJobsClient('key', 'me@example.com', base_url=server.url)
+    return USAJobsHarvester(client=client, results_per_page=50, requests_per_second=None)
+
+
+def _plain_scores(records, pipeline):
+    frame = pd.DataFrame(records)
+    processed = preprocess_job_batch(frame)
+    processed.insert(0, 'JobID', frame['JobID'].to_numpy())
+    processed['data_buyer_score'] = score_frame(processed, pipeline)
+    return processed
+
+
+def _top(frame):
+    return frame.sort_values('data_buyer_score', ascending=False, kind='stable').head(TOP_N)['JobID'].tolist()
+
+
+def test_streamed_chunks_match_one_batch(server, model):
+    records = list(iter_postings(harvester=_harvester(server), search_keywords=KEYWORDS))
+    assert len(records) == len({record['JobID'] for record in records})
+
+    streamed = pd.concat(score_stream(iter_features(iter(records), chunk_size=37), model), ignore_index=True)
+    pd.testing.assert_frame_equal(streamed, _plain_scores(records, model), check_dtype=False)
+
+
+@pytest.mark.parametrize('chunk_size', [9, 23, 10_000])
+def test_running_top_n_matches_full_sort(server, model, chunk_size):
+    records = list(iter_postings(harvester=_harvester(server), search_keywords=KEYWORDS))
+    scored = _plain_scores(records, model)
+
+    tracker = stream_top_buyers('key', 'me@example.com', top_n=TOP_N, search_keywords=KEYWORDS,
+                                chunk_size=chunk_size, harvester=_harvester(server))
+    assert tracker.rows_seen == len(records)
+
+    use_case_columns = [col for col in scored.columns if col.startswith('UseCase_')]
+    for col in use_case_columns:
+        name = col.replace('UseCase_', '')
+        assert tracker.use_cases[name]['JobID'].tolist() == _top(scored[scored[col] == 1])
+    industries = scored.groupby(scored['Industry'].str.lower())
+    assert set(tracker.industries) == set(industries.groups)
+    for industry, group in industries:
+        assert tracker.industries[industry]['JobID'].tolist() == _top(group)
+
+
+def test_running_top_n_queries():
+    tracker = RunningTopN(top_n=2)
+    with pytest.raises(ValueError):
+        tracker.top_by_use_case('Fraud')
+    assert tracker.top_by_industry('Medical').empty
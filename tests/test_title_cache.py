@@ -0,0 +1,38 @@
+import pandas as pd
+import pytest
+
+from data_demand_mapper.toolkit import (TITLE_CACHE_SIZE, clear_title_cache, is_generalist, preprocess_job_batch,
+                                        set_title_cache_size, title_cache_info)
+from tests.mockapi import synthetic_search_items
+
+TITLE_COLUMNS = ['Industry', 'IsSeniorRole', 'IsExplicitDataJob', 'IsGeneralistRole']
+
+
+@pytest.fixture
+def jobs():
+    yield [item['MatchedObjectDescriptor'] for item in synthetic_search_items(400, seed=6)]
+    set_title_cache_size(TITLE_CACHE_SIZE)
+
+
+def test_cached_features_equal_uncached(jobs):
+    set_title_cache_size(0)
+    uncached = preprocess_job_batch(jobs)[TITLE_COLUMNS]
+    for maxsize in (None, 3):
+        set_title_cache_size(maxsize)
+        pd.testing.assert_frame_equal(preprocess_job_batch(jobs)[TITLE_COLUMNS], uncached)
+        pd.testing.assert_frame_equal(preprocess_job_batch(jobs)[TITLE_COLUMNS], uncached)
+    assert list(uncached['IsGeneralistRole']) == [is_generalist(job['PositionTitle']) for job in jobs]
+
+
+def test_each_distinct_title_is_computed_once(jobs):
+    clear_title_cache()
+    preprocess_job_batch(jobs)
+    titles = {job['PositionTitle'] for job in jobs}
+    pairs = {(job['PositionTitle'], job['OrganizationName']) for job in jobs}
+    info = title_cache_info()
+    assert (info['flags']['misses'], info['flags']['hits']) == (len(titles), len(jobs) - len(titles))
+    assert (info['industry']['misses'], info['industry']['hits']) == (len(pairs), len(jobs) - len(pairs))
+
+    preprocess_job_batch(jobs)
+    assert title_cache_info()['flags']['misses'] == len(titles)
+    assert title_cache_info()['flags']['hit_rate'] > 0.9
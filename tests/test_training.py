@@ -0,0 +1,78 @@
+import json
+import os
+
+import joblib
+import numpy as np
+import pytest
+
+from data_demand_mapper.toolkit import ModelRegistry, preprocess_job_batch
+from data_demand_mapper.training import CV_METRICS, FEATURE_COLUMNS, LABEL_COLUMN, build_pipeline, train_pipeline
+from tests.mockapi import synthetic_search_items
+
+GRID = {'classifier__C': [0.1, 1.0]}
+
+
+@pytest.fixture(scope='module')
+def processed():
+    items = synthetic_search_items(240, seed=21, signal_rate=0.3)
+    return preprocess_job_batch([item['MatchedObjectDescriptor'] for item in items])
+
+
+def _plain_cv(X, y, C, cv):
+    """Cross-validate one candidate with named scorers and no fitted-step cache."""
+    from sklearn.model_selection import StratifiedKFold, cross_validate
+
+    folds = StratifiedKFold(n_splits=cv, shuffle=True, random_state=8)
+    pipeline = build_pipeline(smote=False).set_params(classifier__C=C)
+    return cross_validate(pipeline, X, y, cv=folds, scoring=CV_METRICS)
+
+
+def test_search_matches_plain_cross_validation(processed, tmp_path):
+    pipeline, report = train_pipeline(processed, str(tmp_path), param_grid=GRID, cv=3, n_jobs=1, smote=False,
+                                      version='test')
+    X, y = processed[FEATURE_COLUMNS], processed[LABEL_COLUMN].to_numpy()
+
+    for candidate in report['candidates']:
+        plain = _plain_cv(X, y, candidate['params']['classifier__C'], cv=3)
+        for name in CV_METRICS:
+            assert candidate[f'mean_{name}'] == pytest.approx(plain[f'test_{name}'].mean())
+
+    best = max(report['candidates'], key=lambda candidate: candidate['mean_roc_auc'])
+    assert report['best_params'] == best['params']
+    refit = build_pipeline(smote=False).set_params(**best['params']).fit(X, y)
+    np.testing.assert_allclose(pipeline.predict_proba(X), refit.predict_proba(X))
+
+    artifact = tmp_path / 'data_buyer_model-test.joblib'
+    assert report['artifact'] == str(artifact) and report['fingerprint'] == ModelRegistry(str(artifact)).fingerprint
+    np.testing.assert_allclose(joblib.load(artifact).predict_proba(X), refit.predict_proba(X))
+    with open(tmp_path / 'data_buyer_model-test.metrics.json') as handle:
+        assert json.load(handle)['best_params'] == best['params']
+
+
+def test_cache_dir_is_reused(processed, tmp_path):
+    cache = tmp_path / 'cache'
+    _, first = train_pipeline(processed, str(tmp_path / 'a'), param_grid=GRID, cv=3, n_jobs=1, smote=False,
+                              cache_dir=str(cache))
+    assert os.listdir(cache)
+    _, second = train_pipeline(processed, str(tmp_path / 'b'), param_grid=GRID, cv=3, n_jobs=1, smote=False,
+                               cache_dir=str(cache))
+    assert second['cv_metrics'] == first['cv_metrics']
+
+
+def test_smote_artifact_drops_resampling(processed, tmp_path):
+    pytest.importorskip('imblearn')
+    pipeline, report = train_pipeline(processed, str(tmp_path), param_grid={'classifier__C': [1.0]}, cv=3,
+                                      n_jobs=1)
+    assert report['smote'] and list(pipeline.named_steps) == ['preprocessor', 'classifier']
+    assert pipeline.predict_proba(processed[FEATURE_COLUMNS]).shape == (len(processed), 2)
+
+
+def test_rejects_unusable_labels(processed, tmp_path):
+    with pytest.raises(ValueError, match='both positive and negative'):
+        train_pipeline(processed, str(tmp_path), labels=np.zeros(len(processed)), smote=False)
+    with pytest.raises(ValueError, match='labels for'):
+        train_pipeline(processed, str(tmp_path), labels=[0, 1], smote=False)
+    labels = np.zeros(len(processed))
+    labels[:4] = 1
+    with pytest.raises(ValueError, match='SMOTE'):
+        train_pipeline(processed, str(tmp_path), labels=labels, cv=3)
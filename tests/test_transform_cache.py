@@ -0,0 +1,94 @@
+import copy
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_demand_mapper import transform_cache
+from data_demand_mapper.toolkit import preprocess_job_batch, score_frame
+from data_demand_mapper.transform_cache import TransformCache, enable_transform_cache
+from tests.mockapi import synthetic_search_items
+
+
+@pytest.fixture(scope='module')
+def processed():
+    items = synthetic_search_items(150, seed=11, signal_rate=0.4)
+    return preprocess_job_batch([item['MatchedObjectDescriptor'] for item in items])
+
+
+@pytest.fixture
+def shared_cache():
+    cache = enable_transform_cache()
+    yield cache
+    transform_cache.disable_transform_cache()
+
+
+def _uncached(frame, model):
+    return model.predict_proba(frame)[:, 1]
+
+
+def test_scores_match_uncached_scoring(processed, model, shared_cache):
+    expected = _uncached(processed, model)
+    np.testing.assert_allclose(score_frame(processed), expected)
+    misses = shared_cache.misses
+    assert shared_cache.hits == 0 and len(shared_cache) == misses
+
+    repeated = pd.concat([processed.iloc[::-1], processed.iloc[:20]], ignore_index=True)
+    np.testing.assert_allclose(score_frame(repeated), _uncached(repeated, model))
+    assert shared_cache.misses == misses
+    assert shared_cache.info()['hit_rate'] > 0
+
+
+def test_private_cache_and_other_pipelines(processed, model, shared_cache):
+    cache = TransformCache()
+    np.testing.assert_allclose(score_frame(processed, transform_cache=cache), _uncached(processed, model))
+    assert cache.misses > 0 and shared_cache.misses == 0
+
+    np.testing.assert_allclose(score_frame(processed, pipeline=copy.deepcopy(model)), _uncached(processed, model))
+    assert shared_cache.hits + shared_cache.misses == 0
+
+
+def test_transform_matches_preprocessor_and_invalidates(processed, model):
+    preprocessor = model.named_steps['preprocessor']
+    expected = preprocessor.transform(processed).toarray()
+    cache = TransformCache()
+
+    assert np.array_equal(cache.transform(preprocessor, processed, 'model-a').toarray(), expected)
+    assert np.array_equal(cache.transform(preprocessor, processed, 'model-a').toarray(), expected)
+    assert cache.misses == len(cache)
+
+    cache.transform(preprocessor, processed.iloc[:10], 'model-b')
+    assert len(cache) <= 10 and cache.model == 'model-b'
+    assert cache.transform(preprocessor, processed.iloc[:0], 'model-b').shape[0] == 0
+
+
+def test_evicts_past_max_bytes(processed, model):
+    preprocessor = model.named_steps['preprocessor']
+    cache = TransformCache(max_bytes=20_000)
+    result = cache.transform(preprocessor, processed, 'model')
+    assert np.array_equal(result.toarray(), preprocessor.transform(processed).toarray())
+    assert 0 < len(cache) < len(processed) and cache.info()['bytes'] <= 20_000
+
+
+def test_concurrent_model_switches(processed, model):
+    preprocessor = model.named_steps['preprocessor']
+    expected = preprocessor.transform(processed).toarray()
+    cache = TransformCache()
+    errors = []
+
+    def work(fingerprint):
+        try:
+            for start in range(0, len(processed), 25):
+                chunk = processed.iloc[start:start + 50]
+                result = cache.transform(preprocessor, chunk, fingerprint).toarray()
+                assert np.array_equal(result, expected[start:start + 50])
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=work, args=(f'model-{i % 2}',)) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
@@ -0,0 +1,113 @@
+import pytest
+
+from data_demand_mapper import toolkit
+from data_demand_mapper.streaming import iter_postings
+from data_demand_mapper.usajobs import USAJobsClient, USAJobsHarvester
+from tests.mockapi import MockSearchServer, synthetic_search_items
+
+PARAMS = {'Keyword': 'data', 'ResultsPerPage': 25, 'Page': 1}
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr('data_demand_mapper.usajobs.time.sleep', delays.append)
+    return delays
+
+
+def _get(failures, **client_kwargs):
+    with MockSearchServer(synthetic_search_items(50), failures=failures) as server:
+        with USAJobsClient('key', 'me@example.com', base_url=server.url, **client_kwargs) as client:
+            response = client.get(PARAMS)
+        return response, client.metrics, server.hits
+
+
+def test_backs_off_on_429_and_5xx(sleeps):
+    response, metrics, hits = _get([429, 500, 502, 503, 504], max_retries=5, backoff_factor=0.5)
+    assert response.status_code == 200
+    assert response.json()['SearchResult']['SearchResultCount'] == 15
+    assert hits == 6
+    assert len(sleeps) == 5
+    assert all(0 <= delay <= 0.5 * 2 ** n for n, delay in enumerate(sleeps))
+
+
+def test_honors_retry_after(sleeps):
+    response, _, _ = _get([(429, '7'), (503, '1.5'), (503, '120')], max_backoff=60)
+    assert response.status_code == 200
+    assert sleeps == [7.0, 1.5, 60.0]
+
+
+def test_gives_up_after_max_retries(sleeps):
+    response, metrics, hits = _get([503, 503, 503], max_retries=2)
+    assert response.status_code == 503
+    assert hits == 3 and len(sleeps) == 2
+    summary = metrics.summary()
+    assert (summary['requests'], summary['retries'], summary['failures']) == (1, 2, 1)
+    assert summary['status_codes'] == {503: 1}
+
+
+def test_does_not_retry_other_statuses(sleeps):
+    response, metrics, hits = _get([404])
+    assert response.status_code == 404
+    assert hits == 1 and sleeps == []
+    assert metrics.summary()['failures'] == 1
+
+
+def test_records_each_request(sleeps):
+    with MockSearchServer(synthetic_search_items(50), failures=[429, (503, '0')]) as server:
+        with USAJobsClient('key', 'me@example.com', base_url=server.url) as client:
+            client.get(PARAMS)
+            client.get(dict(PARAMS, Page=2))
+    summary = client.metrics.summary()
+    assert (summary['requests'], summary['retries'], summary['failures']) == (2, 2, 0)
+    assert summary['status_codes'] == {200: 2}
+    first, second = client.metrics.history
+    assert (first['attempts'], first['status'], first['params']['Page']) == (3, 200, 1)
+    assert (second['attempts'], second['status'], second['params']['Page']) == (1, 200, 2)
+    assert first['bytes'] > 0 and first['latency'] > 0
+
+
+@pytest.fixture
+def opened_clients(monkeypatch):
+    """Route clients built from credentials to a mock server and track whether each is closed."""
+    server = MockSearchServer(synthetic_search_items(60, seed=1)).start()
+    clients = {}
+    init, get, close = USAJobsClient.__init__, USAJobsClient.get, USAJobsClient.close
+
+    def tracked_init(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        clients[id(self)] = False
+
+    def tracked_close(self):
+        close(self)
+        clients[id(self)] = True
+
+    monkeypatch.setattr(USAJobsClient, '__init__', tracked_init)
+    monkeypatch.setattr(USAJobsClient, 'get', lambda self, params=None, url=None: get(self, params, server.url))
+    monkeypatch.setattr(USAJobsClient, 'close', tracked_close)
+    yield clients
+    server.stop()
+
+
+@pytest.mark.parametrize('call', [
+    lambda: toolkit.fetch_and_score_job('700001', 'key', 'me@example.com'),
+    lambda: toolkit.search_job_ids_by_title('Economist', 'key', 'me@example.com'),
+    lambda: toolkit.batch_fetch_and_score_jobs(['Economist', 'Nurse'], 'key', 'me@example.com'),
+    lambda: toolkit.harvest_and_score('key', 'me@example.com', search_keywords=['data']),
+    lambda: toolkit.fetch_and_score_top_by_use_case_custom('key', 'me@example.com', search_keywords=['data']),
+    lambda: toolkit.fetch_top_data_buyers_by_industry_custom('key', 'me@example.com', 'Finance',
+                                                             search_keywords=['data']),
+    lambda: list(iter_postings('key', 'me@example.com', search_keywords=['data'])),
+], ids=['fetch_and_score_job', 'search_job_ids_by_title', 'batch_fetch_and_score_jobs', 'harvest_and_score',
+        'use_case_custom', 'industry_custom', 'iter_postings'])
+def test_functions_close_the_clients_they_create(opened_clients, model, call):
+    call()
+    assert list(opened_clients.values()) == [True]
+
+
+def test_shared_clients_stay_open(opened_clients, model):
+    client = USAJobsClient('key', 'me@example.com')
+    toolkit.search_job_ids_by_title('Economist', 'key', 'me@example.com', client=client)
+    with USAJobsHarvester(client=client) as harvester:
+        toolkit.harvest_and_score('key', 'me@example.com', search_keywords=['data'], harvester=harvester)
+    assert opened_clients == {id(client): False}